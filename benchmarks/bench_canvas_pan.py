@@ -0,0 +1,69 @@
+"""
+benchmarks/bench_canvas_pan.py
+
+Mide el tiempo por fotograma al desplazar (panning) un lienzo con muchas cajas,
+a zoom normal y con poco zoom (texto como barras grises), con y sin la caché de
+texto de TextItem.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_canvas_pan [n_cajas]
+
+Sin pantalla: QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_canvas_pan
+"""
+
+import os
+import sys
+import time
+
+from PyQt6.QtWidgets import QApplication, QGraphicsItem
+
+FRAMES = 60
+STEP_PX = 12
+
+
+def _pan(window, frames=FRAMES):
+    """
+    Desplaza la vista `frames` veces y devuelve el tiempo medio por fotograma (ms).
+    """
+    view, app = window.view, QApplication.instance()
+    bar = view.horizontalScrollBar()
+    # Primer fotograma fuera de la medida (rasterizado inicial)
+    view.viewport().repaint()
+    start = time.perf_counter()
+    for i in range(frames):
+        bar.setValue(bar.value() + (STEP_PX if i % 40 < 20 else -STEP_PX))
+        view.viewport().repaint()
+        app.processEvents()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main(n=2000):
+    app = QApplication(sys.argv[:1])
+    from ui.main_window import MainWindow
+
+    window = MainWindow()
+    window.resize(1600, 1000)
+    window.show()
+    cols = 40
+    boxes = [{"name": f"Box{i}", "x": 20 + (i % cols) * 160, "y": 20 + (i // cols) * 100,
+              "w": 150, "h": 90} for i in range(n)]
+    created, _ = window.populate_elements(boxes, [])
+    app.processEvents()
+
+    print(f"{n} cajas — ms por fotograma al desplazar ({FRAMES} fotogramas):")
+    for label, scale in (("zoom 100%", 1.0), ("zoom 20% (barras)", 0.2)):
+        window.view.resetTransform()
+        window.view.scale(scale, scale)
+        for cache in (QGraphicsItem.CacheMode.NoCache, QGraphicsItem.CacheMode.DeviceCoordinateCache):
+            for box in created:
+                box.text_item.setCacheMode(cache)
+            name = "con caché" if cache != QGraphicsItem.CacheMode.NoCache else "sin caché"
+            print(f"  {label:<18} {name:<10} {_pan(window):8.2f} ms")
+
+    # Evitar el diálogo de confirmación de MainWindow.closeEvent
+    sys.stdout.flush()
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
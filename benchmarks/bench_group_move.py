@@ -0,0 +1,108 @@
+"""
+benchmarks/bench_group_move.py
+
+Mide el coste por evento de ratón al arrastrar N cajas seleccionadas en un lienzo
+con muchas cajas:
+
+- "por elemento": cada caja se mueve con su propio setPos y actualiza sus
+  índices y su aviso una a una (comportamiento anterior a GroupTransform).
+- "en grupo": arrastre real con el ratón sobre la selección; un solo cálculo
+  de snapping sobre el contorno del grupo y las posiciones aplicadas en bloque.
+
+En ambos casos se entrega el aviso del ChangeBus en cada paso, para incluir el
+coste del panel de elementos y de la barra de estado.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_group_move [n_seleccionadas] [n_total]
+
+Sin pantalla: QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_group_move
+"""
+
+import os
+import sys
+import time
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import Qt, QPoint, QPointF
+from PyQt6.QtGui import QMouseEvent
+
+STEPS = 40
+STEP_PX = 7
+
+
+def _mouse(view, kind, point, buttons):
+    button = Qt.MouseButton.LeftButton if kind != QMouseEvent.Type.MouseMove else Qt.MouseButton.NoButton
+    event = QMouseEvent(kind, QPointF(point), QPointF(view.viewport().mapToGlobal(point)),
+                        button, buttons, Qt.KeyboardModifier.NoModifier)
+    QApplication.sendEvent(view.viewport(), event)
+
+
+def _per_item(window, boxes):
+    """
+    Mueve cada caja por separado (un setPos y un aviso por caja) y devuelve ms por paso.
+    """
+    view = window.view
+    start = [box.pos() for box in boxes]
+    t0 = time.perf_counter()
+    for step in range(1, STEPS + 1):
+        d = step * STEP_PX
+        for box, p in zip(boxes, start):
+            box.setPos(p.x() + d, p.y() + d)
+            view.alignment_manager.update_guides(box.sceneBoundingRect().topLeft(), box)
+        view.change_bus.flush()
+    elapsed = (time.perf_counter() - t0) / STEPS * 1000
+    for box, p in zip(boxes, start):
+        box.setPos(p)
+    view.alignment_manager.clear_guides()
+    view.change_bus.flush()
+    return elapsed
+
+
+def _group(window, boxes):
+    """
+    Arrastra la selección con eventos de ratón reales y devuelve ms por paso.
+    """
+    view = window.view
+    for box in boxes:
+        box.setSelected(True)
+    grab = view.mapFromScene(boxes[0].sceneBoundingRect().center())
+    _mouse(view, QMouseEvent.Type.MouseButtonPress, grab, Qt.MouseButton.LeftButton)
+    t0 = time.perf_counter()
+    for step in range(1, STEPS + 1):
+        d = step * STEP_PX
+        _mouse(view, QMouseEvent.Type.MouseMove, grab + QPoint(d, d), Qt.MouseButton.LeftButton)
+        view.change_bus.flush()
+    elapsed = (time.perf_counter() - t0) / STEPS * 1000
+    _mouse(view, QMouseEvent.Type.MouseButtonRelease, grab + QPoint(STEPS * STEP_PX, STEPS * STEP_PX),
+           Qt.MouseButton.NoButton)
+    view.change_bus.flush()
+    return elapsed
+
+
+def main(selected=200, total=5000):
+    app = QApplication(sys.argv[:1])
+    from ui.main_window import MainWindow
+
+    window = MainWindow()
+    window.resize(1600, 1000)
+    window.show()
+    cols = 60
+    boxes = [{"name": f"Box{i}", "x": 20 + (i % cols) * 160, "y": 20 + (i // cols) * 100,
+              "w": 150, "h": 90} for i in range(total)]
+    created, _ = window.populate_elements(boxes, [], record=False)
+    app.processEvents()
+    # La selección: un bloque compacto de cajas de la esquina superior izquierda
+    group = sorted(created, key=lambda b: (b.rect().y(), b.rect().x()))[:selected]
+    window.view.centerOn(group[0])
+
+    print(f"Arrastrar {len(group)} cajas seleccionadas de {total} — ms por evento de ratón ({STEPS} pasos):")
+    print(f"  por elemento  {_per_item(window, group):8.2f} ms")
+    print(f"  en grupo      {_group(window, group):8.2f} ms")
+
+    # Evitar el diálogo de confirmación de MainWindow.closeEvent
+    sys.stdout.flush()
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,99 @@
+"""
+benchmarks/bench_snapping.py
+
+Compara las consultas de snapping del SnapIndex de core/ (arrays de NumPy con
+`searchsorted`/`argmin`) con un recorrido lineal sobre todas las anclas, con
+bordes, centros y líneas base de muchos elementos.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_snapping [n_elementos]
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from core.snap_index import SnapIndex
+
+THRESHOLD = 6
+EDGE, CENTRE, POINT, BASELINE = 0, 1, 2, 3
+
+
+def _anchors(rng, i):
+    x = rng.randrange(0, 4000)
+    y = rng.randrange(0, 6000)
+    if i % 4 == 0:
+        # Etiqueta: punto y línea base
+        return ((x, POINT),), ((y, POINT), (y + 11.5, BASELINE))
+    w = rng.randrange(10, 200)
+    h = rng.randrange(10, 80)
+    return (((x, EDGE), (x + w, EDGE), (x + w / 2, CENTRE)),
+            ((y, EDGE), (y + h, EDGE), (y + h / 2, CENTRE)))
+
+
+def _linear(entries, probes, exclude, kinds):
+    """
+    Ancla X más cercana a alguna de `probes` recorriendo todas las anclas.
+    """
+    best_dist = None
+    for key, xs, _ in entries:
+        if key in exclude:
+            continue
+        for value, kind in xs:
+            if not kinds[kind]:
+                continue
+            for probe in probes:
+                dist = abs(value - probe)
+                if dist <= THRESHOLD and (best_dist is None or dist < best_dist):
+                    best_dist = dist
+    return best_dist
+
+
+def _timed(label, fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<34} {elapsed * 1000:9.3f} ms")
+    return result
+
+
+def main(n=20000):
+    rng = random.Random(42)
+    entries = [(i, *_anchors(rng, i)) for i in range(n)]
+    kinds = np.ones(4, dtype=bool)
+    group = set(range(0, 800, 4))  # 200 elementos que se arrastran juntos
+    probes = (1203.0, 1391.0, 1297.0)  # dos bordes y el centro de un rectángulo
+
+    start = time.perf_counter()
+    index = SnapIndex()
+    index.load(entries)
+    print(f"{n} elementos — construcción del índice: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print("Bordes y centro de un rectángulo, excluyendo un grupo de 200:")
+    linear = _timed("recorrido lineal", lambda: _linear(entries, probes, group, kinds), 5)
+    indexed = _timed("SnapIndex.nearest_x", lambda: index.nearest_x(probes, THRESHOLD, group, kinds)[1], 200)
+    assert linear == indexed
+
+    print("Solo bordes de cajas:")
+    edges = np.array([True, False, False, False])
+    linear = _timed("recorrido lineal", lambda: _linear(entries, probes[:1], (), edges), 5)
+    indexed = _timed("SnapIndex.nearest_x", lambda: index.nearest_x(probes[:1], THRESHOLD, None, edges)[1], 200)
+    assert linear == indexed
+
+    print("Arrastre de un elemento (1000 actualizaciones + consulta):")
+    key, xs, ys = entries[n // 2]
+
+    def drag():
+        for step in range(1000):
+            moved = tuple((value + step, kind) for value, kind in xs)
+            index.update(key, moved, ys)
+            index.nearest_x([value for value, _ in moved], THRESHOLD, key, kinds)
+
+    _timed("update + nearest_x", drag, 1)
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
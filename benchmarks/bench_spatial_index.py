@@ -0,0 +1,83 @@
+"""
+benchmarks/bench_spatial_index.py
+
+Compara el índice espacial de core/ con un recorrido lineal para las consultas
+de solapamiento, selección por rectángulo y elementos fuera de la plantilla.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_spatial_index [n_elementos]
+"""
+
+import random
+import sys
+import time
+
+from core.spatial_index import SpatialIndex, rects_overlap, rect_contains
+
+TEMPLATE = (0, 0, 4000, 6000)
+
+
+def _random_rects(n, seed=42):
+    rng = random.Random(seed)
+    rects = {}
+    for i in range(n):
+        x = rng.randrange(-100, TEMPLATE[2])
+        y = rng.randrange(-100, TEMPLATE[3])
+        w = rng.randrange(10, 200)
+        h = rng.randrange(10, 80)
+        rects[f"Box{i}"] = (x, y, x + w, y + h)
+    return rects
+
+
+def _timed(label, fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<28} {elapsed * 1000:9.3f} ms")
+    return result
+
+
+def main(n=10000):
+    rects = _random_rects(n)
+    keys = list(rects)
+    probe = keys[n // 2]
+    area = (1000, 1000, 1800, 1600)
+
+    start = time.perf_counter()
+    index = SpatialIndex()
+    for key, rect in rects.items():
+        index.insert(key, rect)
+    print(f"{n} elementos — construcción del índice: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print("Solapamientos de un elemento:")
+    linear = _timed("recorrido lineal", lambda: sorted(
+        k for k, r in rects.items() if k != probe and rects_overlap(r, rects[probe])), 20)
+    indexed = _timed("SpatialIndex.overlapping", lambda: sorted(index.overlapping(probe)), 20)
+    assert linear == indexed
+
+    print("Selección por rectángulo:")
+    linear = _timed("recorrido lineal", lambda: sorted(
+        k for k, r in rects.items() if rect_contains(area, r)), 20)
+    indexed = _timed("SpatialIndex.query_inside", lambda: sorted(index.query_inside(area)), 20)
+    assert linear == indexed
+
+    print("Fuera de la plantilla:")
+    linear = _timed("recorrido lineal", lambda: sorted(
+        k for k, r in rects.items() if not rect_contains(TEMPLATE, r)), 5)
+    indexed = _timed("SpatialIndex.outside", lambda: sorted(index.outside(TEMPLATE)), 5)
+    assert linear == indexed
+
+    print("Arrastre (1000 actualizaciones incrementales):")
+    x1, y1, x2, y2 = rects[probe]
+
+    def drag():
+        for step in range(1000):
+            index.update(probe, (x1 + step, y1, x2 + step, y2))
+            index.overlapping(probe)
+
+    _timed("update + overlapping", drag, 1)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
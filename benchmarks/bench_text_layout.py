@@ -0,0 +1,80 @@
+"""
+benchmarks/bench_text_layout.py
+
+Mide el efecto de la memorización de anchos de core/text_layout en un lote que
+repite el mismo vocabulario, comparando las mediciones de PIL con las de un
+ajuste ingenuo que vuelve a medir la línea completa en cada palabra.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_text_layout [n_filas]
+"""
+
+import random
+import sys
+import time
+
+from core.font_cache import get_font_cache, list_font_files
+from core.text_layout import TextMeasurer, layout_justified
+
+VOCABULARY = ("asesor cliente cuenta crédito consumo pymes oferta tasa plazo cuota "
+              "recomendación beneficio campaña seguro ahorro tarjeta préstamo").split()
+
+
+class _CountingFont:
+    """Envoltorio que cuenta las llamadas a getlength de una fuente PIL."""
+
+    def __init__(self, font):
+        self._font = font
+        self.path = getattr(font, "path", None)
+        self.size = getattr(font, "size", None)
+        self.calls = 0
+
+    def getlength(self, text):
+        self.calls += 1
+        return self._font.getlength(text)
+
+    def getmetrics(self):
+        return self._font.getmetrics()
+
+
+def _naive_wrap(text, font, width):
+    lines, current = [], ""
+    for word in text.split():
+        candidate = f"{current} {word}" if current else word
+        if current and font.getlength(candidate) > width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    lines.append(current)
+    return lines
+
+
+def main(rows=300):
+    fonts = list_font_files()
+    base = get_font_cache().get(fonts[0] if fonts else "Arial", 17)
+    rng = random.Random(7)
+    texts = [" ".join(rng.choice(VOCABULARY) for _ in range(60)) for _ in range(rows)]
+    box = (0, 0, 420, 400)
+
+    naive_font = _CountingFont(base)
+    start = time.perf_counter()
+    for text in texts:
+        _naive_wrap(text, naive_font, box[2])
+    naive_t = time.perf_counter() - start
+
+    memo_font = _CountingFont(base)
+    measurer = TextMeasurer()
+    start = time.perf_counter()
+    for text in texts:
+        layout_justified(text, memo_font, box, measurer=measurer)
+    memo_t = time.perf_counter() - start
+
+    print(f"{rows} textos de 60 palabras")
+    print(f"  ajuste ingenuo        {naive_font.calls:8d} mediciones  {naive_t * 1000:8.1f} ms")
+    print(f"  core.text_layout      {memo_font.calls:8d} mediciones  {memo_t * 1000:8.1f} ms")
+    print(f"  reducción de mediciones: x{naive_font.calls / max(1, memo_font.calls):.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
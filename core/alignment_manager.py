@@ -4,135 +4,338 @@ core/alignment_manager.py
 Gestiona las guías de alineación y el snapping (ajuste) magnético entre elementos.
 """
 
-from PyQt6.QtWidgets import QGraphicsLineItem
-from PyQt6.QtGui import QPen, QColor
-from PyQt6.QtCore import Qt, QPointF
+from PyQt6.QtGui import QPen, QColor, QFontMetricsF
+from PyQt6.QtCore import Qt, QPointF, QLineF, QRect
 from ui.items.label_item import LabelItem
 from ui.items.box_item import BoxItem
 
+GUIDE_PEN = QPen(QColor(0, 0, 0), 1, Qt.PenStyle.DashLine)
+GUIDE_PEN.setCosmetic(True)
+GUIDE_STRIP_MARGIN = 2  # px de pantalla a cada lado de la guía al invalidar
+
+# Conjuntos de anclas configurables
+ANCHOR_EDGES = "edges"          # Bordes de las cajas y punto de las etiquetas
+ANCHOR_CENTRES = "centres"      # Ejes centrales de las cajas
+ANCHOR_BASELINES = "baselines"  # Línea base de la primera línea de texto de las etiquetas
+DEFAULT_ANCHORS = (ANCHOR_EDGES, ANCHOR_CENTRES, ANCHOR_BASELINES)
+
+# Tipos de ancla guardados en el índice
+KIND_BOX_EDGE = 0
+KIND_BOX_CENTRE = 1
+KIND_LABEL_POINT = 2
+KIND_LABEL_BASELINE = 3
+KIND_COUNT = 4
+
+# Tipos de ancla que aporta cada conjunto, por tipo de elemento
+ANCHOR_KINDS = {
+    ANCHOR_EDGES: {BoxItem: (KIND_BOX_EDGE,), LabelItem: (KIND_LABEL_POINT,)},
+    ANCHOR_CENTRES: {BoxItem: (KIND_BOX_CENTRE,)},
+    ANCHOR_BASELINES: {LabelItem: (KIND_LABEL_BASELINE,)},
+}
+
 class AlignmentManager:
     """
     Controlador encargado de calcular y dibujar líneas de guía para alinear elementos.
     
     Permite que los objetos 'salten' a posiciones alineadas con otros objetos 
-    cuando están dentro de un umbral de proximidad.
+    cuando están dentro de un umbral de proximidad. Las anclas candidatas
+    (bordes, centros y líneas base, ver ANCHOR_KINDS) se guardan en un índice
+    persistente de NumPy (SnapIndex) que los items actualizan al cambiar de
+    geometría; qué conjuntos cuentan y si se alinean tipos distintos entre sí
+    se decide en cada consulta con una máscara, sin reindexar. El índice (y con
+    él NumPy) se crea con el primer elemento, no al arrancar.
+
+    Las guías no son items de la escena: la vista las pinta en su capa de primer
+    plano (drawForeground) y solo se invalidan las franjas de la guía anterior
+    y de la nueva.
     """
     
-    def __init__(self, scene, threshold=6):
+    def __init__(self, scene, threshold=6, anchors=DEFAULT_ANCHORS, cross_type=False):
         """
         Inicializa el gestor de alineación.
         
         Args:
-            scene (QGraphicsScene): La escena donde se añadirán las guías.
+            scene (QGraphicsScene): La escena cuyas vistas muestran las guías.
             threshold (int): Distancia en píxeles para activar el snapping.
+            anchors (iterable): Conjuntos de anclas activos (ver DEFAULT_ANCHORS).
+            cross_type (bool): Si es True, las cajas se alinean también con las
+                etiquetas y viceversa; por defecto cada tipo solo con el suyo.
         """
         self.scene = scene
         self.threshold = threshold
-        self.guide_items = []
+        self._index = None
+        self.anchors = frozenset()
+        self.cross_type = cross_type
+        self._kind_masks = {}
+        self.set_anchors(anchors, cross_type)
         self._last_snapped_x = None
         self._last_snapped_y = None
 
+    @property
+    def index(self):
+        """
+        SnapIndex: Índice de anclas, creado en el primer uso.
+        """
+        if self._index is None:
+            from core.snap_index import SnapIndex
+            self._index = SnapIndex()
+        return self._index
+
+    def set_anchors(self, anchors=None, cross_type=None):
+        """
+        Cambia los conjuntos de anclas activos y la alineación entre tipos.
+
+        El índice guarda siempre todas las anclas, así que el cambio no obliga a reindexar.
+
+        Args:
+            anchors (iterable, optional): Conjuntos de ANCHOR_KINDS (None conserva los actuales).
+            cross_type (bool, optional): Alinear cajas con etiquetas (None conserva el valor).
+
+        Raises:
+            ValueError: Si algún conjunto no existe.
+        """
+        if anchors is not None:
+            anchors = frozenset(anchors)
+            unknown = anchors - set(ANCHOR_KINDS)
+            if unknown:
+                raise ValueError(f"Conjunto de anclas desconocido: {', '.join(sorted(unknown))}")
+            self.anchors = anchors
+        if cross_type is not None:
+            self.cross_type = cross_type
+        self._kind_masks.clear()
+
+    def _kinds_for(self, target_type):
+        """
+        Devuelve la máscara de tipos de ancla con los que puede alinearse `target_type`.
+        """
+        key = None if self.cross_type else target_type
+        mask = self._kind_masks.get(key)
+        if mask is None:
+            import numpy as np
+            mask = np.zeros(KIND_COUNT, dtype=bool)
+            for name in self.anchors:
+                for item_type, kinds in ANCHOR_KINDS[name].items():
+                    if key is None or item_type is key:
+                        mask[list(kinds)] = True
+            self._kind_masks[key] = mask
+        return mask
+
     def clear_guides(self):
         """
-        Elimina todas las líneas de guía actuales de la escena.
+        Oculta las líneas de guía actuales.
         """
-        for item in self.guide_items:
-            if item.scene():
-                self.scene.removeItem(item)
-        self.guide_items.clear()
-        self._last_snapped_x = None
-        self._last_snapped_y = None
+        self._set_guides(None, None)
 
-    def get_alignment_points(self, items, active_item=None, target_type=None):
+    def _set_guides(self, x, y):
         """
-        Recopila los puntos de alineación (bordes y centros) de todos los items visibles.
-        
+        Actualiza las guías activas e invalida solo las franjas que han cambiado.
+
         Args:
-            items (list): Lista de items en la escena.
-            active_item (QGraphicsItem, optional): El item que se está moviendo (se ignora).
-            target_type (type, optional): Filtro por tipo de objeto.
-            
+            x (float | None): Coordenada de la guía vertical.
+            y (float | None): Coordenada de la guía horizontal.
+        """
+        if x != self._last_snapped_x:
+            self._invalidate_strip(self._last_snapped_x, None)
+            self._invalidate_strip(x, None)
+        if y != self._last_snapped_y:
+            self._invalidate_strip(None, self._last_snapped_y)
+            self._invalidate_strip(None, y)
+        self._last_snapped_x = x
+        self._last_snapped_y = y
+
+    def _invalidate_strip(self, x, y):
+        """
+        Solicita el repintado de la franja de pantalla ocupada por una guía.
+
+        Args:
+            x (float | None): Coordenada de una guía vertical.
+            y (float | None): Coordenada de una guía horizontal.
+        """
+        if x is None and y is None:
+            return
+        m = GUIDE_STRIP_MARGIN
+        for view in self.scene.views():
+            viewport = view.viewport()
+            if x is not None:
+                px = view.mapFromScene(QPointF(x, 0)).x()
+                viewport.update(QRect(px - m, 0, 2 * m + 1, viewport.height()))
+            else:
+                py = view.mapFromScene(QPointF(0, y)).y()
+                viewport.update(QRect(0, py - m, viewport.width(), 2 * m + 1))
+
+    def paint_guides(self, painter, rect):
+        """
+        Dibuja las guías activas dentro del área expuesta.
+
+        Pensado para llamarse desde QGraphicsView.drawForeground.
+
+        Args:
+            painter (QPainter): Pintor en coordenadas de escena.
+            rect (QRectF): Área de la escena que se está repintando.
+        """
+        x, y = self._last_snapped_x, self._last_snapped_y
+        if x is None and y is None:
+            return
+        painter.save()
+        painter.setPen(GUIDE_PEN)
+        if x is not None and rect.left() - 1 <= x <= rect.right() + 1:
+            painter.drawLine(QLineF(x, rect.top(), x, rect.bottom()))
+        if y is not None and rect.top() - 1 <= y <= rect.bottom() + 1:
+            painter.drawLine(QLineF(rect.left(), y, rect.right(), y))
+        painter.restore()
+
+    @staticmethod
+    def _points_of(item):
+        """
+        Calcula las anclas (coordenada, tipo) que aporta un item.
+
+        Las cajas aportan sus bordes y su centro; las etiquetas, su punto y la
+        línea base de su texto.
+
         Returns:
-            tuple: (x_points, y_points) Listas ordenadas de coordenadas candidatas.
+            tuple: (xs, ys) pares en coordenadas de la escena, o None si no es Box/Label.
+        """
+        if isinstance(item, LabelItem):
+            x, y = item.get_center()
+            text = item.text_item
+            baseline = y + text.pos().y() + QFontMetricsF(text.font()).ascent()
+            return ((x, KIND_LABEL_POINT),), ((y, KIND_LABEL_POINT), (baseline, KIND_LABEL_BASELINE))
+        if isinstance(item, BoxItem):
+            rect = item.mapToScene(item.rect()).boundingRect()
+            left, top, right, bottom = rect.left(), rect.top(), rect.right(), rect.bottom()
+            return (((left, KIND_BOX_EDGE), (right, KIND_BOX_EDGE), ((left + right) / 2, KIND_BOX_CENTRE)),
+                    ((top, KIND_BOX_EDGE), (bottom, KIND_BOX_EDGE), ((top + bottom) / 2, KIND_BOX_CENTRE)))
+        return None
+
+    def update_item(self, item):
         """
-        x_points = set()
-        y_points = set()
+        Registra o actualiza las anclas de un item en el índice.
 
+        Debe llamarse cada vez que el item cambia de geometría (o de fuente, en las
+        etiquetas) o se añade a la escena.
+
+        Args:
+            item (BoxItem | LabelItem): Item cuya geometría ha cambiado.
+        """
+        if not item.isVisible():
+            self.index.remove(item)
+            return
+        points = self._points_of(item)
+        if points is not None:
+            self.index.update(item, *points)
+
+    def remove_item(self, item):
+        """
+        Elimina un item del índice de alineación.
+
+        Args:
+            item (BoxItem | LabelItem): Item retirado de la escena.
+        """
+        if self._index is not None:
+            self._index.remove(item)
+
+    def rebuild_index(self, items):
+        """
+        Reconstruye por completo el índice a partir de una colección de items.
+
+        Args:
+            items (iterable): Items de la escena (se ignoran los que no son Box/Label).
+        """
+        entries = []
         for item in items:
-            if item == active_item or not item.isVisible():
-                continue
+            if item.isVisible():
+                points = self._points_of(item)
+                if points is not None:
+                    entries.append((item,) + points)
+        self.index.load(entries)
+
+    def get_alignment_points(self, target_type=None):
+        """
+        Devuelve las coordenadas de las anclas activas registradas en el índice.
+
+        Args:
+            target_type (type, optional): Tipo de objeto que se quiere alinear.
+
+        Returns:
+            tuple: (x_points, y_points) Listas ordenadas de coordenadas candidatas.
+        """
+        kinds = self._kinds_for(target_type)
+        return self.index.x_values(kinds), self.index.y_values(kinds)
 
-            if isinstance(item, LabelItem):
-                x, y = item.get_center()
-                x_points.add(x)
-                y_points.add(y)
-            elif isinstance(item, BoxItem):
-                rect = item.mapToScene(item.rect()).boundingRect()
-                x_points.add(rect.left())
-                x_points.add(rect.right())
-                y_points.add(rect.top())
-                y_points.add(rect.bottom())
+    def _nearest(self, axis, values, exclude, target_type):
+        """
+        Busca el ancla más cercana a alguna de `values` dentro del umbral.
 
-        return sorted(list(x_points)), sorted(list(y_points))
+        Returns:
+            tuple: (ancla, índice en `values`) o (None, None).
+        """
+        kinds = self._kinds_for(target_type)
+        if axis == "x":
+            candidate, _, probe = self.index.nearest_x(values, self.threshold, exclude, kinds)
+        else:
+            candidate, _, probe = self.index.nearest_y(values, self.threshold, exclude, kinds)
+        return candidate, probe
 
-    def update_guides(self, pos, items, active_item=None, target_type=None):
+    def update_guides(self, pos, active_item=None, target_type=None):
         """
         Calcula y dibuja las guías si la posición actual está cerca de un punto de alineación.
         
         Args:
             pos (QPointF): Posición actual del ratón o del objeto.
-            items (list): Items candidatos para alinear.
-            active_item (QGraphicsItem, optional): Item en movimiento.
+            active_item (QGraphicsItem | set, optional): Item (o grupo de items) en movimiento,
+                que se excluye de la búsqueda.
             target_type (type, optional): Tipo de objeto con el que alinear.
             
         Returns:
             tuple: (snapped_x, snapped_y) Coordenadas ajustadas o None si no hay ajuste.
         """
-        self.clear_guides()
-        
         # Determine target_type for filtering
-        if target_type is None and active_item is not None:
+        if target_type is None and active_item is not None and not isinstance(active_item, (set, frozenset)):
             target_type = type(active_item)
-            
-        x_points, y_points = self.get_alignment_points(items, active_item, target_type)
-        
-        snapped_x = None
-        snapped_y = None
-
-        # Find nearest X
-        for px in x_points:
-            if abs(pos.x() - px) <= self.threshold:
-                snapped_x = px
-                break
-
-        # Find nearest Y
-        for py in y_points:
-            if abs(pos.y() - py) <= self.threshold:
-                snapped_y = py
-                break
-
-        pen = QPen(QColor(0, 0, 0), 0.5, Qt.PenStyle.DashLine)
-        
-        scene_rect = self.scene.sceneRect()
-
-        if snapped_x is not None:
-            line = QGraphicsLineItem(snapped_x, scene_rect.top(), snapped_x, scene_rect.bottom())
-            line.setPen(pen)
-            line.setZValue(100)
-            self.scene.addItem(line)
-            self.guide_items.append(line)
-            self._last_snapped_x = snapped_x
-
-        if snapped_y is not None:
-            line = QGraphicsLineItem(scene_rect.left(), snapped_y, scene_rect.right(), snapped_y)
-            line.setPen(pen)
-            line.setZValue(100)
-            self.scene.addItem(line)
-            self.guide_items.append(line)
-            self._last_snapped_y = snapped_y
+
+        snapped_x, _ = self._nearest("x", pos.x(), active_item, target_type)
+        snapped_y, _ = self._nearest("y", pos.y(), active_item, target_type)
+
+        self._set_guides(snapped_x, snapped_y)
 
         return snapped_x, snapped_y
 
+    def snap_rect(self, rect, exclude=None, target_type=None):
+        """
+        Ajusta un rectángulo completo (p. ej. el contorno de un grupo) a las guías.
+
+        Se prueban a la vez los dos bordes de cada eje (y su centro, si el conjunto
+        de centros está activo) y se aplica el ajuste más corto, de modo que un
+        grupo entero cuesta una sola consulta por eje en lugar de una por
+        elemento. Actualiza las guías visibles.
+
+        Args:
+            rect (tuple): (x1, y1, x2, y2) en coordenadas de escena.
+            exclude (set, optional): Items del grupo (sus anclas no cuentan).
+            target_type (type, optional): Tipo de objeto con el que alinear.
+
+        Returns:
+            tuple: (dx, dy) desplazamiento a sumar al rectángulo (0 si no hay ajuste).
+        """
+        x1, y1, x2, y2 = rect
+        centres = ANCHOR_CENTRES in self.anchors
+        probes_x, probes_y = self._probes(x1, x2, centres), self._probes(y1, y2, centres)
+        guide_x, probe_x = self._nearest("x", probes_x, exclude, target_type)
+        guide_y, probe_y = self._nearest("y", probes_y, exclude, target_type)
+        dx = guide_x - probes_x[probe_x] if guide_x is not None else 0.0
+        dy = guide_y - probes_y[probe_y] if guide_y is not None else 0.0
+        self._set_guides(guide_x, guide_y)
+        return dx, dy
+
+    @staticmethod
+    def _probes(low, high, centres):
+        """
+        Coordenadas de un eje del rectángulo que se comparan con las anclas.
+        """
+        if low == high:
+            return (low,)
+        return (low, high, (low + high) / 2) if centres else (low, high)
+
     def get_snapped_pos(self, pos):
         """
         Retorna una posición QPointF ajustada a las últimas coordenadas de ajuste detectadas.
@@ -2,9 +2,12 @@
 core/box_manager.py
 
 Gestiona la colección de objetos BoxItem, su creación, eliminación y recuperación de datos.
+
+Las cajas de la escena son vistas de los registros de LayoutModel: el gestor
+lleva al modelo cada alta, baja, renombrado y cambio de los items.
 """
 
-from core.utils import snap_to_5
+from core.layout_model import KIND_BOX, LayoutModel
 
 class BoxManager:
     """
@@ -14,12 +17,16 @@ class BoxManager:
     gestionar sus nombres únicos y facilitar la exportación de sus datos geométricos.
     """
     
-    def __init__(self):
+    def __init__(self, model=None):
         """
         Inicializa el gestor de cajas con un diccionario vacío y un contador interno.
+
+        Args:
+            model (LayoutModel, optional): Modelo compartido con el gestor de etiquetas.
         """
         self.boxes = {}
         self.counter = 0
+        self.model = model if model is not None else LayoutModel()
 
     def add_box(self, box_item, name=None):
         """
@@ -53,6 +60,7 @@ class BoxManager:
 
         box_item.name = name
         self.boxes[name] = box_item
+        self.model.add_box(name, *box_item.model_geometry(), *box_item.model_content())
         return name
 
     def remove_box(self, name):
@@ -64,6 +72,7 @@ class BoxManager:
         """
         if name in self.boxes:
             del self.boxes[name]
+            self.model.remove(KIND_BOX, name)
 
     def rename_box(self, old_name, new_name):
         """
@@ -85,6 +94,7 @@ class BoxManager:
                 else:
                     new_dict[key] = value
             self.boxes = new_dict
+            self.model.rename(KIND_BOX, old_name, new_name)
             return True
         return False
 
@@ -94,6 +104,33 @@ class BoxManager:
         """
         self.boxes.clear()
         self.counter = 0
+        self.model.clear(KIND_BOX)
+
+    def sync_geometry(self, box_item):
+        """
+        Lleva al modelo la posición y el tamaño actuales de una caja registrada.
+
+        Args:
+            box_item (BoxItem): Caja movida o redimensionada.
+
+        Returns:
+            BoxRecord: Registro actualizado, o None si no está registrada.
+        """
+        if self.boxes.get(box_item.name) is box_item:
+            return self.model.set_geometry(KIND_BOX, box_item.name, *box_item.model_geometry())
+        return None
+
+    def sync_content(self, box_item):
+        """
+        Lleva al modelo la fuente, el tamaño y el texto actuales de una caja registrada.
+
+        Args:
+            box_item (BoxItem): Caja modificada.
+        """
+        if self.boxes.get(box_item.name) is box_item:
+            font_name, font_size, text = box_item.model_content()
+            self.model.set_font(KIND_BOX, box_item.name, font_name, font_size)
+            self.model.set_text(KIND_BOX, box_item.name, text)
 
     def get_boxes_data(self):
         """
@@ -105,23 +142,4 @@ class BoxManager:
         Returns:
             dict: Diccionario con los datos de todas las cajas (coordenadas, fuente, texto).
         """
-        data = {}
-        for name, box in self.boxes.items():
-            rect = box.sceneBoundingRect()
-
-            x1 = snap_to_5(rect.left())
-            y1 = snap_to_5(rect.top())
-            x2 = snap_to_5(rect.right())
-            y2 = snap_to_5(rect.bottom())
-
-            data[name] = {
-                "x1": x1,
-                "y1": y1,
-                "x2": x2,
-                "y2": y2,
-                "font_size": box.text_item.font().pointSize(),
-                "font_name": box.font_name,
-                "text": box.get_text()
-            }
-
-        return data
+        return self.model.boxes_data()
@@ -0,0 +1,125 @@
+"""
+core/change_bus.py
+
+Bus de notificación de cambios entre los items del lienzo y sus observadores
+(panel de elementos, barra de estado, autoguardado...).
+
+Los items publican el nombre del elemento modificado y el bus agrupa todas las
+notificaciones de un mismo fotograma en un único aviso a cada suscriptor.
+"""
+
+from PyQt6.QtCore import QTimer
+
+FRAME_INTERVAL_MS = 16
+
+
+class ChangeBus:
+    """
+    Acumula nombres de elementos modificados y los entrega en lote una vez por fotograma.
+
+    Los suscriptores reciben `callback(names, structural)`:
+    - names (frozenset): Nombres de los elementos cuya geometría, fuente o texto cambió.
+    - structural (bool): True si hubo altas, bajas o renombrados desde el último aviso.
+    """
+
+    def __init__(self, interval=FRAME_INTERVAL_MS):
+        """
+        Inicializa el bus.
+
+        Args:
+            interval (int): Milisegundos de espera para agrupar cambios (0 = siguiente vuelta del bucle).
+        """
+        self._dirty = set()
+        self._structural = False
+        self._subscribers = []
+        self._suspended = 0
+
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.flush)
+
+    def subscribe(self, callback):
+        """
+        Registra un observador.
+
+        Args:
+            callback (callable): Función `callback(names, structural)`.
+        """
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """
+        Elimina un observador registrado.
+        """
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def notify(self, name):
+        """
+        Marca un elemento como modificado.
+
+        Args:
+            name (str): Nombre del elemento.
+        """
+        self._dirty.add(name)
+        self._schedule()
+
+    def notify_many(self, names):
+        """
+        Marca varios elementos como modificados de una vez (p. ej. un grupo movido).
+
+        Args:
+            names (iterable): Nombres de los elementos.
+        """
+        self._dirty.update(names)
+        if self._dirty:
+            self._schedule()
+
+    def notify_structure(self):
+        """
+        Indica que la colección de elementos cambió (alta, baja o renombrado).
+        """
+        self._structural = True
+        self._schedule()
+
+    def _schedule(self):
+        if not self._suspended and not self._timer.isActive():
+            self._timer.start()
+
+    def suspend(self):
+        """
+        Retiene las entregas (p. ej. durante una carga masiva). Admite anidamiento.
+        """
+        self._suspended += 1
+        self._timer.stop()
+
+    def resume(self):
+        """
+        Reanuda las entregas y programa los cambios acumulados mientras estaba suspendido.
+        """
+        if self._suspended:
+            self._suspended -= 1
+        if not self._suspended and self.has_pending():
+            self._schedule()
+
+    def has_pending(self):
+        """
+        Indica si hay cambios pendientes de entregar.
+        """
+        return bool(self._dirty) or self._structural
+
+    def flush(self):
+        """
+        Entrega inmediatamente los cambios acumulados a todos los suscriptores.
+        """
+        self._timer.stop()
+        if self._suspended or not self.has_pending():
+            return
+        names = frozenset(self._dirty)
+        structural = self._structural
+        self._dirty.clear()
+        self._structural = False
+        for callback in list(self._subscribers):
+            callback(names, structural)
@@ -0,0 +1,295 @@
+"""
+core/data_cache.py
+
+Caché persistente de las fuentes de datos Excel.
+
+Leer un .xlsx con openpyxl obliga a analizar el libro completo incluso para
+obtener solo las cabeceras. Esta caché guarda, por archivo de origen, las
+cabeceras normalizadas y los datos por columnas en archivos pickle dentro de
+`.cache/data/`, de modo que volver a abrir el mismo Excel no vuelve a leerlo.
+
+Cada entrada se identifica por (ruta absoluta, mtime, tamaño): si el archivo
+cambia, la entrada anterior deja de ser válida y se sustituye. Las entradas
+menos usadas se eliminan cuando se supera el número o el tamaño máximo (LRU).
+
+Cada entrada consta de dos archivos:
+    <ruta>-<firma>.meta  Cabeceras y número de filas (pequeño, se lee al instante).
+    <ruta>-<firma>.cols  Columnas de datos (solo cuando se han pedido las filas).
+"""
+
+import hashlib
+import os
+import pickle
+from core.fileio import atomic_write
+from core.utils import normalize_header
+
+CACHE_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", ".cache", "data"))
+CACHE_FORMAT_VERSION = 1
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+META_EXT = ".meta"
+COLUMNS_EXT = ".cols"
+
+
+class DataTable:
+    """
+    Datos de una hoja en formato columnar (todas las celdas como texto).
+
+    Attributes:
+        headers (list): Cabeceras normalizadas, en el orden del Excel.
+        columns (list): Una lista de valores (str) por cabecera.
+    """
+
+    def __init__(self, headers, columns):
+        """
+        Args:
+            headers (list): Cabeceras normalizadas.
+            columns (list): Listas de valores, una por cabecera.
+        """
+        self.headers = headers
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def column(self, header):
+        """
+        Devuelve los valores de una columna por su cabecera normalizada.
+        """
+        return self.columns[self.headers.index(header)]
+
+    def records(self):
+        """
+        Devuelve las filas como diccionarios {cabecera_normalizada: texto}.
+        """
+        headers = self.headers
+        return [dict(zip(headers, values)) for values in zip(*self.columns)]
+
+
+def _read_headers(path):
+    import pandas as pd
+
+    df = pd.read_excel(path, nrows=0)
+    return [normalize_header(h) for h in df.columns]
+
+
+def _read_table(path):
+    import pandas as pd
+
+    df = pd.read_excel(path, dtype=str).fillna("")
+    headers = [normalize_header(h) for h in df.columns]
+    columns = [df.iloc[:, i].tolist() for i in range(df.shape[1])]
+    return DataTable(headers, columns)
+
+
+class DataSourceCache:
+    """
+    Caché en disco de cabeceras y filas de archivos Excel con expulsión LRU.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Inicializa la caché.
+
+        Args:
+            cache_dir (str): Carpeta donde se guardan las entradas.
+            max_entries (int): Número máximo de archivos de origen en caché.
+            max_bytes (int): Tamaño máximo total en disco.
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    # ── Identificación de entradas ─────────────────────────────────────────
+    @staticmethod
+    def signature(path):
+        """
+        Devuelve la firma (ruta absoluta, mtime en ns, tamaño) de un archivo de origen.
+        """
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        return path, st.st_mtime_ns, st.st_size
+
+    def _base(self, signature):
+        path_hash = hashlib.sha1(signature[0].encode("utf-8")).hexdigest()[:16]
+        sig_hash = hashlib.sha1(repr(signature).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{path_hash}-{sig_hash}")
+
+    def _load(self, file_path, signature):
+        try:
+            with open(file_path, "rb") as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+        if data.get("version") != CACHE_FORMAT_VERSION or data.get("signature") != signature:
+            return None
+        return data
+
+    def _store(self, file_path, data):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        atomic_write(file_path, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def _touch(self, meta_path):
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+
+    # ── Consultas ──────────────────────────────────────────────────────────
+    def headers(self, path):
+        """
+        Devuelve las cabeceras normalizadas de un Excel.
+
+        Si no están en caché, se leen solo las cabeceras del libro (sin las filas).
+
+        Args:
+            path (str): Ruta al archivo .xlsx/.xls.
+
+        Returns:
+            list: Cabeceras normalizadas.
+        """
+        signature = self.signature(path)
+        meta_path = self._base(signature) + META_EXT
+        meta = self._load(meta_path, signature)
+        if meta is not None:
+            self.hits += 1
+            self._touch(meta_path)
+            return list(meta["headers"])
+
+        self.misses += 1
+        headers = _read_headers(signature[0])
+        self._write_entry(signature, headers, None)
+        return headers
+
+    def table(self, path):
+        """
+        Devuelve todos los datos de un Excel en formato columnar.
+
+        Args:
+            path (str): Ruta al archivo .xlsx/.xls.
+
+        Returns:
+            DataTable: Cabeceras y columnas (texto, celdas vacías como "").
+        """
+        signature = self.signature(path)
+        base = self._base(signature)
+        meta = self._load(base + META_EXT, signature)
+        if meta is not None and meta.get("has_columns"):
+            data = self._load(base + COLUMNS_EXT, signature)
+            if data is not None:
+                self.hits += 1
+                self._touch(base + META_EXT)
+                return DataTable(list(meta["headers"]), data["columns"])
+
+        self.misses += 1
+        table = _read_table(signature[0])
+        self._write_entry(signature, table.headers, table.columns)
+        return table
+
+    def rows(self, path):
+        """
+        Devuelve las filas de un Excel como diccionarios {cabecera_normalizada: texto}.
+        """
+        return self.table(path).records()
+
+    # ── Mantenimiento ──────────────────────────────────────────────────────
+    def _write_entry(self, signature, headers, columns):
+        """
+        Guarda una entrada, retira las versiones anteriores del mismo archivo y aplica el límite LRU.
+        """
+        base = self._base(signature)
+        try:
+            if columns is not None:
+                self._store(base + COLUMNS_EXT, {
+                    "version": CACHE_FORMAT_VERSION, "signature": signature, "columns": columns,
+                })
+            self._store(base + META_EXT, {
+                "version": CACHE_FORMAT_VERSION, "signature": signature, "headers": headers,
+                "rows": len(columns[0]) if columns else None, "has_columns": columns is not None,
+            })
+        except OSError:
+            # Sin permisos o sin espacio: la caché es opcional
+            return
+
+        prefix = os.path.basename(base).split("-")[0] + "-"
+        current = os.path.basename(base)
+        for name in os.listdir(self.cache_dir):
+            if name.startswith(prefix) and not name.startswith(current):
+                self._remove_file(os.path.join(self.cache_dir, name))
+        self.evict()
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _entries(self):
+        """
+        Devuelve las entradas como (último uso, bytes, base), de la más antigua a la más reciente.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+        sizes, used = {}, {}
+        for name in os.listdir(self.cache_dir):
+            base, ext = os.path.splitext(name)
+            if ext not in (META_EXT, COLUMNS_EXT):
+                continue
+            try:
+                st = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            sizes[base] = sizes.get(base, 0) + st.st_size
+            if ext == META_EXT:
+                used[base] = st.st_mtime
+        return sorted((used.get(base, 0), size, base) for base, size in sizes.items())
+
+    def evict(self):
+        """
+        Elimina las entradas menos usadas hasta respetar los límites de número y tamaño.
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+            _, size, base = entries.pop(0)
+            total -= size
+            for ext in (META_EXT, COLUMNS_EXT):
+                self._remove_file(os.path.join(self.cache_dir, base + ext))
+
+    def clear(self):
+        """
+        Elimina todas las entradas de la caché.
+        """
+        for _, _, base in self._entries():
+            for ext in (META_EXT, COLUMNS_EXT):
+                self._remove_file(os.path.join(self.cache_dir, base + ext))
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Devuelve los contadores y la ocupación de la caché.
+
+        Returns:
+            dict: {'entries', 'bytes', 'hits', 'misses'}.
+        """
+        entries = self._entries()
+        return {"entries": len(entries), "bytes": sum(size for _, size, _ in entries),
+                "hits": self.hits, "misses": self.misses}
+
+
+_default_cache = None
+
+
+def get_data_cache():
+    """
+    Devuelve la caché de fuentes de datos compartida del proceso actual.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = DataSourceCache()
+    return _default_cache
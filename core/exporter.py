@@ -1,33 +1,286 @@
 """
 core/exporter.py
 
-Módulo encargado de generar archivos de salida (.py y .txt) basándose en el layout actual.
+Módulo encargado de generar archivos de salida (.py, .txt, .json y .csv) basándose en el layout actual.
+
+La exportación se hace en una sola pasada: primero se construye una tabla de
+elementos (con las variables de fuente ya resueltas), cada escritor genera su
+archivo completo en memoria y, solo cuando todos han terminado, se publican con
+escritura a un temporal + renombrado atómico. Un fallo a mitad nunca deja
+archivos a medio escribir.
 """
 
+import csv
+import io
+import json
 import os
+from collections import namedtuple
 from datetime import datetime
+from operator import attrgetter
+from core.fileio import atomic_write
+from core.font_cache import font_var_name, path_var_name
+
+# Fila de la tabla de elementos. Las cajas usan x1..y2 y las etiquetas x, y, fill.
+ExportElement = namedtuple(
+    "ExportElement",
+    ["kind", "name", "x1", "y1", "x2", "y2", "x", "y", "font_name", "font_size", "font_var", "fill", "text"],
+)
+
+DEFAULT_FORMATS = ("py", "txt")
+EXPORT_FORMATS = ("py", "txt", "json", "csv")
+CSV_COLUMNS = ("kind", "name", "x1", "y1", "x2", "y2", "x", "y", "font_name", "font_size", "font_var", "text")
+
+
+class ExportTable:
+    """
+    Tabla precalculada con todo lo que necesitan los escritores.
+
+    Attributes:
+        title (str): Nombre base de los archivos exportados.
+        boxes (list): ExportElement de las cajas, en orden de creación.
+        labels (list): ExportElement de las etiquetas, en orden de creación.
+        fonts (list): Pares (font_name, font_size) únicos y ordenados.
+        font_files (list): Archivos de fuente únicos y ordenados.
+    """
+
+    def __init__(self, boxes_data, labels_data, title=""):
+        """
+        Construye la tabla a partir de los datos del modelo.
+
+        Args:
+            boxes_data (dict): Resultado de LayoutModel.boxes_data().
+            labels_data (dict): Resultado de LayoutModel.labels_data().
+            title (str): Nombre base de los archivos exportados.
+        """
+        self.title = title
+        pairs = set()
+
+        self.boxes = []
+        for name, data in boxes_data.items():
+            pair = (data["font_name"], data["font_size"])
+            pairs.add(pair)
+            self.boxes.append(ExportElement(
+                "box", name, data["x1"], data["y1"], data["x2"], data["y2"], None, None,
+                pair[0], pair[1], font_var_name(*pair), None, data.get("text", ""),
+            ))
+
+        self.labels = []
+        for name, data in labels_data.items():
+            pair = (data["font_name"], data["font_size"])
+            pairs.add(pair)
+            self.labels.append(ExportElement(
+                "label", name, None, None, None, None, data["x"], data["y"],
+                pair[0], pair[1], font_var_name(*pair), tuple(data.get("fill", (0, 0, 0))),
+                data.get("text", ""),
+            ))
+
+        self.fonts = sorted(pairs)
+        self.font_files = sorted({fname for fname, _ in pairs})
+
+    def __len__(self):
+        return len(self.boxes) + len(self.labels)
+
+
+def _font_setup_lines(table):
+    """
+    Bloque de importación y carga de fuentes compartido por los archivos .py y .txt.
+    """
+    lines = ["from PIL import ImageFont", "", "# Configuración de fuentes", ""]
+    lines.extend(f"{path_var_name(fname)} = r'fonts\\{fname}'" for fname in table.font_files)
+    lines.append("")
+    lines.append("# Carga de fuentes")
+    lines.extend(
+        f"{font_var_name(fname, fsize)} = ImageFont.truetype({path_var_name(fname)}, {fsize})"
+        for fname, fsize in table.fonts
+    )
+    return lines
+
+
+def write_py(table):
+    """
+    Genera el módulo Python con `LAYOUT_CONFIG`.
+
+    Args:
+        table (ExportTable): Tabla de elementos.
+
+    Returns:
+        str: Contenido del archivo .py.
+    """
+    out = _font_setup_lines(table)
+    out.append("")
+    out.append("LAYOUT_CONFIG = {")
+    out.append("    'boxes': {")
+    out.extend(
+        f"        {e.name!r}: {{\n"
+        f"            'x1': {e.x1},\n"
+        f"            'y1': {e.y1},\n"
+        f"            'x2': {e.x2},\n"
+        f"            'y2': {e.y2},\n"
+        f"            'font': {e.font_var}\n"
+        f"        }},"
+        for e in table.boxes
+    )
+    out.append("    },")
+    out.append("    'labels': {")
+    out.extend(
+        f"        {e.name!r}: {{\n"
+        f"            'x': {e.x},\n"
+        f"            'y': {e.y},\n"
+        f"            'font': {e.font_var},\n"
+        f"            'fill': {e.fill}\n"
+        f"        }},"
+        for e in table.labels
+    )
+    out.append("    }")
+    out.append("}")
+    out.append("")
+    return "\n".join(out)
+
+
+def write_txt(table):
+    """
+    Genera los fragmentos de código comentados para pegar en un script de dibujo.
+
+    Args:
+        table (ExportTable): Tabla de elementos.
+
+    Returns:
+        str: Contenido del archivo .txt.
+    """
+    out = [f"# --- {table.title} ---", ""]
+    for line in _font_setup_lines(table):
+        if line.strip() == "":
+            out.append("#")
+        elif line.startswith("#"):
+            out.append(line)
+        else:
+            out.append(f"# {line}")
+
+    out.append("")
+    out.append("# LABELS")
+    for e in table.labels:
+        out.append(f"# draw.text(({e.x}, {e.y}), {e.name}, font={e.font_var}, fill=(0,0,0))")
+
+    out.append("")
+    out.append("# BOXES")
+    for e in table.boxes:
+        out.append(f"# draw.rectangle([({e.x1}, {e.y1}), ({e.x2}, {e.y2})], fill=None, outline=None)")
+        out.append(f"# text_box = ({e.x1}, {e.y1}, {e.x2}, {e.y2})")
+        out.append(f"# draw_wrapped_text_justified(draw, {e.name}, {e.font_var}, text_box, 17, (0, 0, 0))")
+        out.append("")
+    out.append("")
+    return "\n".join(out)
+
+
+def _font_details(font_files):
+    """
+    Familia, estilo, peso e itálica de cada archivo de fuente usado (según el registro de fuentes).
+    """
+    from core.font_registry import get_font_registry
+
+    registry = get_font_registry()
+    details = {}
+    for font_file in font_files:
+        info = registry.info(font_file)
+        if info:
+            details[font_file] = {"family": info.family, "style": info.style,
+                                  "weight": info.weight, "italic": info.italic}
+    return details
+
 
-def export_layout(box_manager, label_manager, template_path=None, export_dir=None):
+def write_json(table):
     """
-    Genera y guarda la configuración del layout en formatos Python (.py) y texto (.txt).
-    
+    Genera el layout en JSON con el mismo formato de datos que usan los gestores,
+    más la familia, el estilo y el peso reales de cada fuente usada.
+
+    Args:
+        table (ExportTable): Tabla de elementos.
+
+    Returns:
+        str: Contenido del archivo .json.
+    """
+    data = {
+        "name": table.title,
+        "boxes": {
+            e.name: {"x1": e.x1, "y1": e.y1, "x2": e.x2, "y2": e.y2,
+                     "font_name": e.font_name, "font_size": e.font_size, "text": e.text}
+            for e in table.boxes
+        },
+        "labels": {
+            e.name: {"x": e.x, "y": e.y, "font_name": e.font_name, "font_size": e.font_size,
+                     "fill": e.fill, "text": e.text}
+            for e in table.labels
+        },
+        "fonts": _font_details(table.font_files),
+    }
+    # Sin sangría para que json use su codificador en C
+    return json.dumps(data, ensure_ascii=False) + "\n"
+
+
+def write_csv(table):
+    """
+    Genera una fila CSV por elemento (cajas y después etiquetas).
+
+    Args:
+        table (ExportTable): Tabla de elementos.
+
+    Returns:
+        str: Contenido del archivo .csv.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    row = attrgetter(*CSV_COLUMNS)
+    writer.writerows(row(e) for e in table.boxes)
+    writer.writerows(row(e) for e in table.labels)
+    return buffer.getvalue()
+
+
+# Escritores registrados por extensión: función(table) -> str
+WRITERS = {
+    "py": write_py,
+    "txt": write_txt,
+    "json": write_json,
+    "csv": write_csv,
+}
+
+
+def register_writer(extension, writer):
+    """
+    Registra (o sustituye) el escritor de un formato de exportación.
+
+    Args:
+        extension (str): Extensión del archivo sin punto (p. ej. 'yaml').
+        writer (callable): Función `writer(table)` que devuelve el contenido como str.
+    """
+    WRITERS[extension.lower().lstrip(".")] = writer
+
+
+def export_layout(model, template_path=None, export_dir=None, formats=DEFAULT_FORMATS):
+    """
+    Genera y guarda la configuración del layout en los formatos indicados.
+
     Este proceso incluye la recopilación de todas las fuentes utilizadas y la creación
     de un diccionario `LAYOUT_CONFIG` que puede ser utilizado por otros scripts.
-    
+    Todos los archivos se generan en memoria antes de publicar ninguno.
+
     Args:
-        box_manager (BoxManager): Gestor de cajas de donde extraer datos.
-        label_manager (LabelManager): Gestor de etiquetas de donde extraer datos.
+        model (LayoutModel): Modelo del layout de donde extraer datos.
         template_path (str, optional): Ruta al archivo original para generar el nombre de salida.
         export_dir (str, optional): Directorio de destino. Si es None, usa la carpeta 'export/'.
-        
+        formats (tuple): Extensiones a generar (ver WRITERS). Por defecto ('py', 'txt').
+
     Returns:
-        tuple: (py_path, txt_path) Las rutas absolutas a los archivos generados.
+        tuple: Rutas absolutas a los archivos generados, en el orden de `formats`.
     """
-    if export_dir:
-        os.makedirs(export_dir, exist_ok=True)
-    else:
+    unknown = [fmt for fmt in formats if fmt not in WRITERS]
+    if unknown:
+        raise ValueError(f"Formato de exportación no soportado: {', '.join(unknown)}")
+
+    if not export_dir:
         export_dir = os.path.join(os.path.dirname(__file__), "..", "export")
-        os.makedirs(export_dir, exist_ok=True)
+    export_dir = os.path.abspath(export_dir)
+    os.makedirs(export_dir, exist_ok=True)
 
     if template_path:
         base_name = os.path.splitext(os.path.basename(template_path))[0]
@@ -37,125 +290,12 @@ def export_layout(box_manager, label_manager, template_path=None, export_dir=Non
         filename = f"layout_config---{timestamp}"
 
     base_path = os.path.join(export_dir, filename)
-    py_path = f"{base_path}.py"
-    txt_path = f"{base_path}.txt"
-
-    boxes_data = box_manager.get_boxes_data()
-    labels_data = label_manager.get_labels_data()
-
-    # Recolectar combinaciones únicas de fuentes
-    unique_fonts = {}
-    all_pairs = set()
-
-    for data in boxes_data.values():
-        all_pairs.add((data["font_name"], data["font_size"]))
-
-    for data in labels_data.values():
-        all_pairs.add((data["font_name"], data["font_size"]))
+    table = ExportTable(model.boxes_data(), model.labels_data(), filename)
 
-    def build_font_var(name, size):
-        clean = name.split('.')[0].replace('-', '_').replace(' ', '_').lower()
-        return f"font_{clean}_{size}"
+    # Generar todo en memoria; si un escritor falla no se toca ningún archivo
+    outputs = [(f"{base_path}.{fmt}", WRITERS[fmt](table)) for fmt in formats]
 
-    for fname, fsize in all_pairs:
-        unique_fonts[(fname, fsize)] = build_font_var(fname, fsize)
+    for path, content in outputs:
+        atomic_write(path, content)
 
-    # Preparar bloque de fuentes
-    font_setup_lines = []
-    font_setup_lines.append("from PIL import ImageFont")
-    font_setup_lines.append("")
-    font_setup_lines.append("# Configuración de fuentes")
-    font_setup_lines.append("")
-
-    unique_font_names = sorted({fname for fname, _ in all_pairs})
-
-    for fname in unique_font_names:
-        clean = fname.split('.')[0].replace('-', '_').replace(' ', '_').lower()
-        path_var = f"path_{clean}"
-        font_setup_lines.append(f"{path_var} = r'fonts\\{fname}'")
-
-    font_setup_lines.append("")
-    font_setup_lines.append("# Carga de fuentes")
-
-    for fname, fsize in sorted(all_pairs):
-        clean = fname.split('.')[0].replace('-', '_').replace(' ', '_').lower()
-        path_var = f"path_{clean}"
-        var_name = unique_fonts[(fname, fsize)]
-        font_setup_lines.append(f"{var_name} = ImageFont.truetype({path_var}, {fsize})")
-
-    # Exportar .py
-    with open(py_path, "w", encoding="utf-8") as py_file:
-        for line in font_setup_lines:
-            py_file.write(line)
-
-        py_file.write("\nLAYOUT_CONFIG = {\n")
-
-        py_file.write("    'boxes': {\n")
-        for name, data in boxes_data.items():
-            font_var = unique_fonts.get(
-                (data["font_name"], data["font_size"]),
-                "custom_font"
-            )
-
-            py_file.write(f"        '{name}': {{\n")
-            py_file.write(f"            'x1': {data['x1']},\n")
-            py_file.write(f"            'y1': {data['y1']},\n")
-            py_file.write(f"            'x2': {data['x2']},\n")
-            py_file.write(f"            'y2': {data['y2']},\n")
-            py_file.write(f"            'font': {font_var}\n")
-            py_file.write("        },\n")
-        py_file.write("    },\n")
-
-        py_file.write("    'labels': {\n")
-        for name, data in labels_data.items():
-            font_var = unique_fonts.get(
-                (data["font_name"], data["font_size"]),
-                "custom_font"
-            )
-
-            py_file.write(f"        '{name}': {{\n")
-            py_file.write(f"            'x': {data['x']},\n")
-            py_file.write(f"            'y': {data['y']},\n")
-            py_file.write(f"            'font': {font_var},\n")
-            py_file.write(f"            'fill': {data.get('fill', (0,0,0))}\n")
-            py_file.write("        },\n")
-        py_file.write("    }\n")
-
-        py_file.write("}\n")
-
-    # Exportar .txt
-    with open(txt_path, "w", encoding="utf-8") as txt_file:
-        txt_file.write(f"# --- {filename} ---\n\n")
-
-        for line in font_setup_lines:
-            if line.strip() == "":
-                txt_file.write("#\n")
-            elif line.startswith("#"):
-                txt_file.write(f"{line}\n")
-            else:
-                txt_file.write(f"# {line}\n")
-
-        txt_file.write("\n# LABELS\n")
-        for name, data in labels_data.items():
-            f_var = unique_fonts.get(
-                (data["font_name"], data["font_size"]),
-                "custom_font"
-            )
-            txt_file.write(
-                f"# draw.text(({data['x']}, {data['y']}), {name}, font={f_var}, fill=(0,0,0))\n"
-            )
-
-        txt_file.write("\n# BOXES\n")
-        for name, data in boxes_data.items():
-            x1, y1, x2, y2 = data['x1'], data['y1'], data['x2'], data['y2']
-            f_var = unique_fonts.get(
-                (data["font_name"], data["font_size"]),
-                "semi_bold_font"
-            )
-            txt_file.write(f"# draw.rectangle([({x1}, {y1}), ({x2}, {y2})], fill=None, outline=None)\n")
-            txt_file.write(f"# text_box = ({x1}, {y1}, {x2}, {y2})\n")
-            txt_file.write(
-                f"# draw_wrapped_text_justified(draw, {name}, {f_var}, text_box, 17, (0, 0, 0))\n\n"
-            )
-
-    return py_path, txt_path
+    return tuple(path for path, _ in outputs)
@@ -0,0 +1,64 @@
+"""
+core/fileio.py
+
+Escritura segura de archivos compartida por la exportación, los proyectos y las
+cachés en disco (datos, fuentes y teselas).
+
+Se puede importar al arrancar: no arrastra los módulos de exportación, y
+tempfile se carga con la primera escritura.
+"""
+
+import os
+import stat
+
+# La umask solo puede leerse cambiándola, y es del proceso entero: se lee una vez
+# al importar (en el hilo principal) y no en cada escritura, que puede hacerse
+# desde hilos de fondo (índice de fuentes, pirámide de teselas)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _file_mode(path):
+    """
+    Permisos para publicar `path`: los del archivo existente o 0o666 menos la umask.
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def atomic_write(path, content, encoding="utf-8"):
+    """
+    Escribe un archivo de forma atómica: temporal en la misma carpeta + os.replace.
+
+    Los lectores ven el archivo anterior completo o el nuevo completo, nunca uno a medias.
+    El archivo conserva los permisos del anterior o, si es nuevo, los de un `open()`
+    normal (0o666 menos la umask); mkstemp lo crearía con 0o600.
+
+    Args:
+        path (str): Ruta de destino.
+        content (str | bytes): Contenido completo del archivo (bytes para archivos binarios).
+        encoding (str): Codificación del texto.
+    """
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        if isinstance(content, bytes):
+            f = os.fdopen(fd, "wb")
+        else:
+            f = os.fdopen(fd, "w", encoding=encoding, newline="")
+        with f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, _file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,163 @@
+"""
+core/font_cache.py
+
+Caché LRU de fuentes de PIL compartida por el renderizador y el exportador.
+
+Las fuentes se identifican por (archivo de fuente, tamaño), igual que en los datos
+de los gestores (`font_name`, `font_size`), y se buscan en la carpeta `fonts/`.
+"""
+
+import os
+from collections import OrderedDict
+from functools import lru_cache
+
+FONTS_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "fonts"))
+FONT_EXTENSIONS = (".ttf", ".otf")
+DEFAULT_MAX_FONTS = 128
+
+
+def list_font_files(fonts_dir=FONTS_DIR):
+    """
+    Lista los archivos TTF/OTF disponibles en la carpeta de fuentes.
+
+    Args:
+        fonts_dir (str): Carpeta donde buscar.
+
+    Returns:
+        list: Nombres de archivo ordenados alfabéticamente.
+    """
+    if not os.path.isdir(fonts_dir):
+        return []
+    return sorted(f for f in os.listdir(fonts_dir) if f.lower().endswith(FONT_EXTENSIONS))
+
+
+@lru_cache(maxsize=None)
+def font_stem(font_name):
+    """
+    Convierte un nombre de archivo de fuente en un identificador Python.
+
+    Ejemplo:
+        >>> font_stem("Tw-Cen MT.ttf")
+        'tw_cen_mt'
+    """
+    return font_name.split('.')[0].replace('-', '_').replace(' ', '_').lower()
+
+
+@lru_cache(maxsize=None)
+def font_var_name(font_name, size):
+    """
+    Nombre de la variable de fuente usada en los archivos exportados (font_<stem>_<size>).
+    """
+    return f"font_{font_stem(font_name)}_{size}"
+
+
+@lru_cache(maxsize=None)
+def path_var_name(font_name):
+    """
+    Nombre de la variable de ruta usada en los archivos exportados (path_<stem>).
+    """
+    return f"path_{font_stem(font_name)}"
+
+
+class FontCache:
+    """
+    Caché de objetos `ImageFont.FreeTypeFont` con expulsión LRU.
+
+    Cada proceso mantiene su propia instancia (ver `get_font_cache`), de modo que
+    un worker del renderizador carga cada (fuente, tamaño) una sola vez.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAX_FONTS, fonts_dir=FONTS_DIR):
+        """
+        Inicializa la caché vacía.
+
+        Args:
+            maxsize (int): Número máximo de fuentes cargadas simultáneamente.
+            fonts_dir (str): Carpeta donde se buscan los archivos de fuente.
+        """
+        self.maxsize = maxsize
+        self.fonts_dir = fonts_dir
+        self.hits = 0
+        self.misses = 0
+        self._fonts = OrderedDict()
+
+    def __len__(self):
+        return len(self._fonts)
+
+    def _load(self, font_name, size):
+        from PIL import ImageFont
+        from core.font_registry import get_font_registry
+
+        path = get_font_registry(self.fonts_dir).path(font_name)
+        if path:
+            return ImageFont.truetype(path, size)
+        try:
+            return ImageFont.truetype("arial.ttf", size)
+        except OSError:
+            return ImageFont.load_default(size)
+
+    def get(self, font_name, size):
+        """
+        Devuelve la fuente (cargándola si no está en caché).
+
+        Args:
+            font_name (str): Archivo de fuente dentro de `fonts/` (o 'Arial').
+            size (int): Tamaño en píxeles.
+
+        Returns:
+            ImageFont.FreeTypeFont: Fuente lista para dibujar.
+        """
+        key = (font_name, int(size))
+        font = self._fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            self._fonts.move_to_end(key)
+            return font
+
+        self.misses += 1
+        font = self._load(*key)
+        self._fonts[key] = font
+        if len(self._fonts) > self.maxsize:
+            self._fonts.popitem(last=False)
+        return font
+
+    def warm(self, pairs):
+        """
+        Precarga un conjunto de pares (fuente, tamaño).
+
+        Args:
+            pairs (iterable): Pares (font_name, font_size).
+        """
+        for font_name, size in pairs:
+            self.get(font_name, size)
+
+    def clear(self):
+        """
+        Vacía la caché y reinicia los contadores.
+        """
+        self._fonts.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Devuelve los contadores de la caché.
+
+        Returns:
+            dict: {'size', 'maxsize', 'hits', 'misses'}.
+        """
+        return {"size": len(self._fonts), "maxsize": self.maxsize,
+                "hits": self.hits, "misses": self.misses}
+
+
+_default_cache = None
+
+
+def get_font_cache():
+    """
+    Devuelve la caché de fuentes compartida del proceso actual.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = FontCache()
+    return _default_cache
@@ -0,0 +1,358 @@
+"""
+core/font_registry.py
+
+Registro único de las fuentes de `fonts/`, compartido por la interfaz, el
+exportador y el renderizador.
+
+- La carpeta se lista una sola vez por proceso.
+- Los metadatos reales de cada archivo (familia, estilo, peso e itálica) se leen
+  de las tablas `name`, `OS/2` y `head` del propio TTF/OTF/TTC, sin PIL ni Qt.
+- El índice completo se construye en un hilo en segundo plano y se guarda en
+  `.cache/fonts.json`; en los siguientes arranques solo se vuelven a leer los
+  archivos cuyo mtime o tamaño ha cambiado.
+- Las fuentes se registran en Qt (`QFontDatabase.addApplicationFont`) solo
+  cuando algún item las usa por primera vez.
+"""
+
+import os
+import re
+import struct
+import threading
+from collections import namedtuple
+from core.fileio import atomic_write
+from core.font_cache import FONTS_DIR, list_font_files
+
+CACHE_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", ".cache", "fonts.json"))
+REGISTRY_FORMAT_VERSION = 1
+
+WEIGHT_NORMAL = 400
+WEIGHT_BOLD = 700
+
+# Metadatos de un archivo de fuente
+FontInfo = namedtuple("FontInfo", ["file", "family", "style", "weight", "italic"])
+
+# Identificadores de la tabla 'name'
+_NAME_FAMILY, _NAME_STYLE, _NAME_TYPO_FAMILY, _NAME_TYPO_STYLE = 1, 2, 16, 17
+
+
+def _guess_info(file_name):
+    """
+    Metadatos deducidos del nombre de archivo, para fuentes que no se pueden leer.
+    """
+    stem = os.path.splitext(file_name)[0]
+    lower = stem.lower()
+    bold = "bold" in lower
+    italic = "italic" in lower or "oblique" in lower
+    style = " ".join(s for s, on in (("Bold", bold), ("Italic", italic)) if on) or "Regular"
+    return FontInfo(file_name, re.sub(r"[-_]+", " ", stem), style,
+                    WEIGHT_BOLD if bold else WEIGHT_NORMAL, italic)
+
+
+def _read_tables(f):
+    """
+    Lee el directorio de tablas de un archivo sfnt (de la primera fuente si es una colección).
+
+    Returns:
+        dict: {etiqueta: (offset, longitud)}.
+    """
+    header = f.read(12)
+    if header[:4] == b"ttcf":
+        (offset,) = struct.unpack(">I", f.read(4))
+        f.seek(offset)
+        header = f.read(12)
+    if len(header) < 12 or header[:4] not in (b"\x00\x01\x00\x00", b"OTTO", b"true"):
+        raise ValueError("No es un archivo TrueType/OpenType")
+    (num_tables,) = struct.unpack(">H", header[4:6])
+    tables = {}
+    for _ in range(num_tables):
+        tag, _, offset, length = struct.unpack(">4sIII", f.read(16))
+        tables[tag] = (offset, length)
+    return tables
+
+
+def _read_names(f, offset, length):
+    """
+    Lee las cadenas de la tabla 'name' que interesan, prefiriendo Windows / inglés.
+    """
+    f.seek(offset)
+    data = f.read(length)
+    _, count, string_offset = struct.unpack(">HHH", data[:6])
+    found = {}  # name_id -> (prioridad, texto)
+    for i in range(count):
+        platform, encoding, language, name_id, size, str_offset = struct.unpack(
+            ">HHHHHH", data[6 + i * 12:18 + i * 12])
+        if name_id not in (_NAME_FAMILY, _NAME_STYLE, _NAME_TYPO_FAMILY, _NAME_TYPO_STYLE):
+            continue
+        raw = data[string_offset + str_offset:string_offset + str_offset + size]
+        if platform in (0, 3):
+            text = raw.decode("utf-16-be", "replace")
+            priority = 0 if (platform == 3 and language == 0x409) else 1
+        elif platform == 1 and encoding == 0:
+            text = raw.decode("mac_roman", "replace")
+            priority = 2
+        else:
+            continue
+        if name_id not in found or priority < found[name_id][0]:
+            found[name_id] = (priority, text.strip("\x00 "))
+    return {name_id: text for name_id, (_, text) in found.items()}
+
+
+def parse_font_file(path):
+    """
+    Lee familia, estilo, peso e itálica de un archivo TTF/OTF/TTC.
+
+    Args:
+        path (str): Ruta del archivo de fuente.
+
+    Returns:
+        FontInfo: Metadatos del archivo.
+
+    Raises:
+        ValueError: Si el archivo no es una fuente sfnt válida.
+        OSError: Si no se puede leer.
+    """
+    file_name = os.path.basename(path)
+    guess = _guess_info(file_name)
+    with open(path, "rb") as f:
+        try:
+            tables = _read_tables(f)
+            names = _read_names(f, *tables[b"name"]) if b"name" in tables else {}
+
+            weight, italic = guess.weight, guess.italic
+            if b"OS/2" in tables:
+                offset, length = tables[b"OS/2"]
+                f.seek(offset)
+                os2 = f.read(min(length, 64))
+                (weight,) = struct.unpack(">H", os2[4:6])
+                (fs_selection,) = struct.unpack(">H", os2[62:64])
+                italic = bool(fs_selection & 0x01)
+            elif b"head" in tables:
+                f.seek(tables[b"head"][0] + 44)
+                (mac_style,) = struct.unpack(">H", f.read(2))
+                weight = WEIGHT_BOLD if mac_style & 0x01 else WEIGHT_NORMAL
+                italic = bool(mac_style & 0x02)
+        except struct.error as e:
+            raise ValueError(f"Tablas de fuente truncadas: {e}") from e
+
+    family = names.get(_NAME_TYPO_FAMILY) or names.get(_NAME_FAMILY) or guess.family
+    style = names.get(_NAME_TYPO_STYLE) or names.get(_NAME_STYLE) or guess.style
+    return FontInfo(file_name, family, style, weight or WEIGHT_NORMAL, italic)
+
+
+class FontRegistry:
+    """
+    Índice de las fuentes de una carpeta con sus metadatos.
+
+    Los métodos de consulta no esperan al índice en segundo plano: si un archivo
+    aún no se ha indexado, se lee en el momento solo ese archivo.
+    """
+
+    def __init__(self, fonts_dir=FONTS_DIR, cache_path=CACHE_PATH):
+        """
+        Args:
+            fonts_dir (str): Carpeta de fuentes.
+            cache_path (str): Archivo JSON donde se guarda el índice.
+        """
+        self.fonts_dir = fonts_dir
+        self.cache_path = cache_path
+        self._files = None
+        self._file_set = None
+        self._info = {}          # archivo -> FontInfo
+        self._qt_families = {}   # archivo -> familia registrada en Qt (o None si falló)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._ready = threading.Event()
+        self._listeners = []
+
+    # ── Listado ────────────────────────────────────────────────────────────
+    def files(self):
+        """
+        Devuelve los archivos de fuente de la carpeta, ordenados.
+        """
+        if self._files is None:
+            self._files = list_font_files(self.fonts_dir)
+            self._file_set = frozenset(self._files)
+        return list(self._files)
+
+    def path(self, font_name):
+        """
+        Devuelve la ruta absoluta de un archivo de fuente, o None si no está en la carpeta.
+        """
+        if not font_name or font_name.lower() == "arial":
+            return None
+        if self._files is None:
+            self.files()
+        if font_name not in self._file_set:
+            return None
+        return os.path.join(self.fonts_dir, font_name)
+
+    # ── Metadatos ──────────────────────────────────────────────────────────
+    def info(self, font_name):
+        """
+        Devuelve los metadatos de un archivo de fuente.
+
+        Args:
+            font_name (str): Archivo dentro de la carpeta de fuentes.
+
+        Returns:
+            FontInfo: Metadatos, o None si el archivo no existe.
+        """
+        info = self._info.get(font_name)
+        if info is not None:
+            return info
+        path = self.path(font_name)
+        if path is None:
+            return None
+        try:
+            info = parse_font_file(path)
+        except (OSError, ValueError):
+            info = _guess_info(font_name)
+        with self._lock:
+            self._info.setdefault(font_name, info)
+        return info
+
+    @property
+    def ready(self):
+        """True cuando el índice completo está construido."""
+        return self._ready.is_set()
+
+    def add_listener(self, callback):
+        """
+        Registra una función `callback()` que se llama al terminar el índice.
+
+        Se llama desde el hilo del índice (o en el acto si ya estaba listo); la
+        interfaz debe reenviarla a su hilo, por ejemplo con una señal de Qt.
+        """
+        self._listeners.append(callback)
+        if self.ready:
+            callback()
+
+    def start(self):
+        """
+        Construye el índice en un hilo en segundo plano (solo la primera vez).
+
+        Returns:
+            threading.Thread: El hilo del índice.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.scan, name="font-registry", daemon=True)
+                self._thread.start()
+        return self._thread
+
+    def wait(self, timeout=None):
+        """
+        Espera a que el índice esté listo.
+
+        Returns:
+            bool: True si el índice está listo.
+        """
+        return self._ready.wait(timeout)
+
+    def _load_cache(self):
+        # json solo hace falta en el hilo del índice, no al importar el módulo
+        import json
+
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if (data.get("version") != REGISTRY_FORMAT_VERSION
+                or data.get("fonts_dir") != os.path.abspath(self.fonts_dir)):
+            return {}
+        return data.get("fonts", {})
+
+    def scan(self):
+        """
+        Construye el índice completo de forma síncrona.
+
+        Reutiliza las entradas guardadas cuyo mtime y tamaño coinciden y solo lee
+        los archivos nuevos o modificados; si algo cambió, guarda el índice.
+
+        Returns:
+            dict: {archivo: FontInfo}.
+        """
+        cached = self._load_cache()
+        entries, info, changed = {}, {}, False
+        for file_name in self.files():
+            try:
+                st = os.stat(os.path.join(self.fonts_dir, file_name))
+            except OSError:
+                continue
+            entry = cached.get(file_name)
+            if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                font = FontInfo(file_name, entry["family"], entry["style"], entry["weight"], entry["italic"])
+            else:
+                try:
+                    font = parse_font_file(os.path.join(self.fonts_dir, file_name))
+                except (OSError, ValueError):
+                    font = _guess_info(file_name)
+                changed = True
+            info[file_name] = font
+            entries[file_name] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size,
+                                  "family": font.family, "style": font.style,
+                                  "weight": font.weight, "italic": font.italic}
+
+        if changed or set(cached) != set(entries):
+            import json
+
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                atomic_write(self.cache_path, json.dumps({
+                    "version": REGISTRY_FORMAT_VERSION,
+                    "fonts_dir": os.path.abspath(self.fonts_dir),
+                    "fonts": entries,
+                }, ensure_ascii=False) + "\n")
+            except OSError:
+                # El índice en disco es opcional
+                pass
+
+        with self._lock:
+            self._info.update(info)
+        self._ready.set()
+        for callback in list(self._listeners):
+            callback()
+        return info
+
+    # ── Qt ─────────────────────────────────────────────────────────────────
+    def qt_family(self, font_name):
+        """
+        Registra la fuente en Qt la primera vez que se usa y devuelve su familia.
+
+        Debe llamarse desde el hilo de la interfaz.
+
+        Args:
+            font_name (str): Archivo dentro de la carpeta de fuentes.
+
+        Returns:
+            str: Familia registrada, o None si el archivo no existe o Qt no lo admite.
+        """
+        if font_name in self._qt_families:
+            return self._qt_families[font_name]
+        from PyQt6.QtGui import QFontDatabase
+
+        family = None
+        path = self.path(font_name)
+        if path:
+            font_id = QFontDatabase.addApplicationFont(path)
+            if font_id != -1:
+                families = QFontDatabase.applicationFontFamilies(font_id)
+                if families:
+                    family = families[0]
+        # También se recuerdan los fallos para no volver a intentarlo en cada item
+        self._qt_families[font_name] = family
+        return family
+
+
+_registries = {}
+
+
+def get_font_registry(fonts_dir=FONTS_DIR):
+    """
+    Devuelve el registro de fuentes compartido del proceso para una carpeta.
+    """
+    registry = _registries.get(fonts_dir)
+    if registry is None:
+        registry = _registries[fonts_dir] = FontRegistry(fonts_dir)
+    return registry
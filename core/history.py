@@ -0,0 +1,544 @@
+"""
+core/history.py
+
+Historial de deshacer/rehacer basado en comandos con deltas compactos.
+
+En lugar de guardar una copia del diseño en cada paso, cada entrada guarda solo
+lo que cambió:
+
+- GeometryDelta: id de elemento + posición y rectángulo anterior/nuevo, en
+  arrays de C (`array('l')` para los ids y `array('d')` para los valores).
+- TextDelta: diferencia de texto (posición, texto quitado, texto insertado).
+- FontDelta: fuente y tamaño anterior/nuevo.
+- RenameDelta: nombre anterior/nuevo.
+- StructureDelta: registros completos de los elementos creados o eliminados.
+
+Los elementos se identifican por (tipo, nombre) internado como entero. Como
+todos los cambios de nombre quedan registrados, deshacer en orden inverso
+siempre encuentra el elemento con el nombre que tenía en ese momento. Cada id
+cuenta las entradas que lo usan y se libera (para reutilizarse) cuando la
+última se descarta.
+
+El historial tiene un límite de memoria y de entradas: al superarlo se
+descartan las entradas más antiguas. Las entradas consecutivas con la misma
+clave de fusión (por ejemplo, varios clics de tamaño de fuente sobre el mismo
+elemento) se funden en una sola si llegan dentro de `merge_window` segundos.
+
+El historial no conoce Qt: aplica los cambios a través de un objetivo
+(`target`) con estos métodos (ver ui/history_target.py):
+
+    set_geometry(kind, name, values)   values = (px, py, rx, ry, rw, rh)
+    set_text(kind, name, text) / text(kind, name)
+    set_font(kind, name, font_name, font_size)
+    rename(kind, old_name, new_name)
+    create(record) / remove(kind, name)
+    batch(count)                       Context manager que agrupa los cambios de un paso
+                                       (count = número de elementos afectados).
+"""
+
+import sys
+import time
+from array import array
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 1000
+MERGE_WINDOW_S = 1.0
+
+# Valores de geometría por estado: posición (px, py) + rectángulo local (rx, ry, rw, rh)
+GEOMETRY_FIELDS = 6
+
+# Coste fijo aproximado de una entrada (objeto + slots)
+_ENTRY_OVERHEAD = 120
+
+
+def _str_bytes(*values):
+    return sum(sys.getsizeof(v) for v in values if isinstance(v, str))
+
+
+def text_diff(old, new):
+    """
+    Calcula la diferencia mínima entre dos textos como un único reemplazo.
+
+    Args:
+        old (str): Texto anterior.
+        new (str): Texto nuevo.
+
+    Returns:
+        tuple: (inicio, texto quitado, texto insertado).
+    """
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    end_old, end_new = len(old), len(new)
+    while end_old > start and end_new > start and old[end_old - 1] == new[end_new - 1]:
+        end_old -= 1
+        end_new -= 1
+    return start, old[start:end_old], new[start:end_new]
+
+
+class GeometryDelta:
+    """
+    Cambio de geometría de uno o varios elementos (un arrastre, un redimensionado).
+    """
+
+    __slots__ = ("ids", "values", "merge_key", "stamp")
+
+    def __init__(self, ids, values, merge_key=None):
+        """
+        Args:
+            ids (array): Ids de los elementos ('l').
+            values (array): Por cada id, GEOMETRY_FIELDS valores anteriores y otros tantos nuevos ('d').
+            merge_key: Clave para fundir entradas consecutivas (None = no fundir).
+        """
+        self.ids = ids
+        self.values = values
+        self.merge_key = merge_key
+        self.stamp = time.monotonic()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def element_ids(self):
+        return self.ids
+
+    @property
+    def nbytes(self):
+        return _ENTRY_OVERHEAD + sys.getsizeof(self.ids) + sys.getsizeof(self.values)
+
+    def _apply(self, target, keys, offset):
+        row = 2 * GEOMETRY_FIELDS
+        values = self.values
+        for i, element_id in enumerate(self.ids):
+            kind, name = keys[element_id]
+            start = i * row + offset
+            target.set_geometry(kind, name, tuple(values[start:start + GEOMETRY_FIELDS]))
+
+    def undo(self, target, keys):
+        self._apply(target, keys, 0)
+
+    def redo(self, target, keys):
+        self._apply(target, keys, GEOMETRY_FIELDS)
+
+    def absorb(self, other):
+        """
+        Funde un cambio posterior sobre los mismos elementos: se conserva el estado
+        anterior de esta entrada y se toma el nuevo de `other`.
+        """
+        if self.ids != other.ids:
+            return False
+        row = 2 * GEOMETRY_FIELDS
+        for i in range(len(self.ids)):
+            start = i * row + GEOMETRY_FIELDS
+            self.values[start:start + GEOMETRY_FIELDS] = other.values[start:start + GEOMETRY_FIELDS]
+        self.stamp = other.stamp
+        return True
+
+
+class TextDelta:
+    """
+    Edición del texto de un elemento, guardada como un único reemplazo.
+    """
+
+    __slots__ = ("element_id", "start", "removed", "inserted", "merge_key", "stamp")
+
+    def __init__(self, element_id, start, removed, inserted, merge_key=None):
+        self.element_id = element_id
+        self.start = start
+        self.removed = removed
+        self.inserted = inserted
+        self.merge_key = merge_key
+        self.stamp = time.monotonic()
+
+    def __len__(self):
+        return 1
+
+    def element_ids(self):
+        return (self.element_id,)
+
+    @property
+    def nbytes(self):
+        return _ENTRY_OVERHEAD + _str_bytes(self.removed, self.inserted)
+
+    def _replace(self, target, keys, old, new):
+        kind, name = keys[self.element_id]
+        text = target.text(kind, name)
+        target.set_text(kind, name, text[:self.start] + new + text[self.start + len(old):])
+
+    def undo(self, target, keys):
+        self._replace(target, keys, self.inserted, self.removed)
+
+    def redo(self, target, keys):
+        self._replace(target, keys, self.removed, self.inserted)
+
+    def absorb(self, other):
+        return False
+
+
+class FontDelta:
+    """
+    Cambio de fuente y/o tamaño de uno o varios elementos.
+    """
+
+    __slots__ = ("rows", "merge_key", "stamp")
+
+    def __init__(self, rows, merge_key=None):
+        """
+        Args:
+            rows (tuple): Tuplas (id, fuente anterior, tamaño anterior, fuente nueva, tamaño nuevo).
+            merge_key: Clave para fundir entradas consecutivas.
+        """
+        self.rows = rows
+        self.merge_key = merge_key
+        self.stamp = time.monotonic()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def element_ids(self):
+        return tuple(row[0] for row in self.rows)
+
+    @property
+    def nbytes(self):
+        return _ENTRY_OVERHEAD + sys.getsizeof(self.rows) + 72 * len(self.rows)
+
+    def undo(self, target, keys):
+        for element_id, old_name, old_size, _, _ in self.rows:
+            target.set_font(*keys[element_id], old_name, old_size)
+
+    def redo(self, target, keys):
+        for element_id, _, _, new_name, new_size in self.rows:
+            target.set_font(*keys[element_id], new_name, new_size)
+
+    def absorb(self, other):
+        if [r[0] for r in self.rows] != [r[0] for r in other.rows]:
+            return False
+        self.rows = tuple(mine[:3] + theirs[3:] for mine, theirs in zip(self.rows, other.rows))
+        self.stamp = other.stamp
+        return True
+
+
+class RenameDelta:
+    """
+    Cambio de nombre de un elemento.
+    """
+
+    __slots__ = ("kind", "old_name", "new_name", "merge_key", "stamp")
+
+    def __init__(self, kind, old_name, new_name):
+        self.kind = kind
+        self.old_name = old_name
+        self.new_name = new_name
+        self.merge_key = None
+        self.stamp = time.monotonic()
+
+    def __len__(self):
+        return 1
+
+    def element_ids(self):
+        return ()
+
+    @property
+    def nbytes(self):
+        return _ENTRY_OVERHEAD + _str_bytes(self.old_name, self.new_name)
+
+    def undo(self, target, keys):
+        target.rename(self.kind, self.new_name, self.old_name)
+
+    def redo(self, target, keys):
+        target.rename(self.kind, self.old_name, self.new_name)
+
+    def absorb(self, other):
+        return False
+
+
+class StructureDelta:
+    """
+    Alta y/o baja de elementos (crear, eliminar, reemplazar el diseño al importar).
+
+    Los registros son tuplas (kind, name, px, py, rx, ry, rw, rh, font_name, font_size, text).
+    """
+
+    __slots__ = ("removed", "added", "merge_key", "stamp")
+
+    def __init__(self, removed=(), added=()):
+        self.removed = tuple(removed)
+        self.added = tuple(added)
+        self.merge_key = None
+        self.stamp = time.monotonic()
+
+    def __len__(self):
+        return len(self.removed) + len(self.added)
+
+    def element_ids(self):
+        return ()
+
+    @property
+    def nbytes(self):
+        total = _ENTRY_OVERHEAD
+        for record in self.removed + self.added:
+            total += 160 + _str_bytes(record[1], record[8], record[10])
+        return total
+
+    @staticmethod
+    def _swap(target, remove, create):
+        for record in remove:
+            target.remove(record[0], record[1])
+        for record in create:
+            target.create(record)
+
+    def undo(self, target, keys):
+        self._swap(target, self.added, self.removed)
+
+    def redo(self, target, keys):
+        self._swap(target, self.removed, self.added)
+
+    def absorb(self, other):
+        return False
+
+
+class History:
+    """
+    Pilas de deshacer/rehacer con límite de memoria.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_entries=DEFAULT_MAX_ENTRIES,
+                 merge_window=MERGE_WINDOW_S):
+        """
+        Args:
+            max_bytes (int): Memoria máxima aproximada de las entradas.
+            max_entries (int): Número máximo de entradas de deshacer.
+            merge_window (float): Segundos durante los que una entrada puede fundirse con la siguiente.
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.merge_window = merge_window
+        self._undo = []
+        self._redo = []
+        self._bytes = 0
+        self._keys = []       # id -> (kind, name), None si está libre
+        self._key_ids = {}    # (kind, name) -> id
+        self._key_refs = []   # id -> número de entradas guardadas que lo usan
+        self._free_ids = []   # ids liberados, para reutilizar
+        self._applying = False
+
+    def __len__(self):
+        return len(self._undo)
+
+    @property
+    def nbytes(self):
+        """Memoria aproximada ocupada por las entradas (deshacer + rehacer)."""
+        return self._bytes
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def element_id(self, kind, name):
+        """
+        Devuelve el id entero de un elemento (tipo, nombre), asignándolo si es nuevo.
+        """
+        key = (kind, name)
+        element_id = self._key_ids.get(key)
+        if element_id is None:
+            if self._free_ids:
+                element_id = self._free_ids.pop()
+                self._keys[element_id] = key
+            else:
+                element_id = len(self._keys)
+                self._keys.append(key)
+                self._key_refs.append(0)
+            self._key_ids[key] = element_id
+        return element_id
+
+    def _acquire(self, entry):
+        """
+        Cuenta los ids de una entrada que pasa a guardarse.
+        """
+        for element_id in entry.element_ids():
+            self._key_refs[element_id] += 1
+
+    def _release(self, entries):
+        """
+        Descuenta los ids de entradas descartadas y libera los que ya nadie usa.
+        """
+        for entry in entries:
+            for element_id in entry.element_ids():
+                self._key_refs[element_id] -= 1
+                if not self._key_refs[element_id]:
+                    del self._key_ids[self._keys[element_id]]
+                    self._keys[element_id] = None
+                    self._free_ids.append(element_id)
+
+    # ── Registro ───────────────────────────────────────────────────────────
+    def record(self, entry):
+        """
+        Añade una entrada ya aplicada al historial y vacía la pila de rehacer.
+
+        Si la última entrada tiene la misma clave de fusión y es reciente, se
+        funde con ella en lugar de añadir una nueva.
+
+        Args:
+            entry: GeometryDelta, TextDelta, FontDelta, RenameDelta o StructureDelta.
+        """
+        # Los ids de la entrada se cuentan antes de vaciar rehacer, que puede compartirlos
+        self._acquire(entry)
+        if self._applying:
+            self._release((entry,))
+            return
+        for old in self._redo:
+            self._bytes -= old.nbytes
+        self._release(self._redo)
+        self._redo.clear()
+
+        last = self._undo[-1] if self._undo else None
+        if (last is not None and entry.merge_key is not None and last.merge_key == entry.merge_key
+                and entry.stamp - last.stamp <= self.merge_window):
+            before = last.nbytes
+            if last.absorb(entry):
+                self._bytes += last.nbytes - before
+                self._release((entry,))
+                return
+
+        self._undo.append(entry)
+        self._bytes += entry.nbytes
+        self._evict()
+
+    def record_geometry(self, changes, merge_key=None):
+        """
+        Registra cambios de geometría.
+
+        Args:
+            changes (iterable): Tuplas (kind, name, valores anteriores, valores nuevos),
+                con GEOMETRY_FIELDS valores por estado.
+            merge_key: Clave de fusión opcional.
+        """
+        ids, values = array("l"), array("d")
+        for kind, name, old, new in changes:
+            ids.append(self.element_id(kind, name))
+            values.extend(old)
+            values.extend(new)
+        if ids:
+            self.record(GeometryDelta(ids, values, merge_key))
+
+    def record_text(self, kind, name, old_text, new_text):
+        """
+        Registra la edición del texto de un elemento (solo la diferencia).
+        """
+        if old_text == new_text:
+            return
+        start, removed, inserted = text_diff(old_text, new_text)
+        self.record(TextDelta(self.element_id(kind, name), start, removed, inserted))
+
+    def record_fonts(self, changes, merge=False):
+        """
+        Registra cambios de fuente y tamaño.
+
+        Args:
+            changes (iterable): Tuplas (kind, name, fuente anterior, tamaño anterior,
+                fuente nueva, tamaño nuevo).
+            merge (bool): Si es True, los cambios seguidos sobre los mismos elementos
+                se funden (p. ej. varios clics de +/-).
+        """
+        rows = tuple((self.element_id(kind, name), old_font, old_size, new_font, new_size)
+                     for kind, name, old_font, old_size, new_font, new_size in changes
+                     if (old_font, old_size) != (new_font, new_size))
+        if rows:
+            key = ("font",) + tuple(r[0] for r in rows) if merge else None
+            self.record(FontDelta(rows, key))
+
+    def record_rename(self, kind, old_name, new_name):
+        """
+        Registra el cambio de nombre de un elemento.
+        """
+        if old_name != new_name:
+            self.record(RenameDelta(kind, old_name, new_name))
+
+    def record_structure(self, removed=(), added=()):
+        """
+        Registra altas y bajas de elementos.
+
+        Args:
+            removed (iterable): Registros de los elementos eliminados.
+            added (iterable): Registros de los elementos creados.
+        """
+        entry = StructureDelta(removed, added)
+        if entry.removed or entry.added:
+            self.record(entry)
+
+    # ── Deshacer / rehacer ─────────────────────────────────────────────────
+    def _run(self, entry, target, method):
+        self._applying = True
+        try:
+            with target.batch(len(entry)):
+                getattr(entry, method)(target, self._keys)
+        finally:
+            self._applying = False
+
+    def undo(self, target):
+        """
+        Deshace la última entrada.
+
+        Returns:
+            bool: True si había algo que deshacer.
+        """
+        if not self._undo:
+            return False
+        entry = self._undo.pop()
+        self._run(entry, target, "undo")
+        self._redo.append(entry)
+        return True
+
+    def redo(self, target):
+        """
+        Rehace la última entrada deshecha.
+
+        Returns:
+            bool: True si había algo que rehacer.
+        """
+        if not self._redo:
+            return False
+        entry = self._redo.pop()
+        self._run(entry, target, "redo")
+        self._undo.append(entry)
+        return True
+
+    def _evict(self):
+        """
+        Descarta las entradas más antiguas hasta respetar los límites.
+
+        Siempre se conserva la entrada más reciente.
+        """
+        drop = 0
+        while (len(self._undo) - drop > 1
+               and (self._bytes > self.max_bytes or len(self._undo) - drop > self.max_entries)):
+            self._bytes -= self._undo[drop].nbytes
+            drop += 1
+        if drop:
+            self._release(self._undo[:drop])
+            del self._undo[:drop]
+
+    def clear(self):
+        """
+        Vacía el historial.
+        """
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+        self._keys.clear()
+        self._key_ids.clear()
+        self._key_refs.clear()
+        self._free_ids.clear()
+
+    def stats(self):
+        """
+        Devuelve la ocupación del historial.
+
+        Returns:
+            dict: {'undo', 'redo', 'bytes', 'max_bytes', 'keys'}.
+        """
+        return {"undo": len(self._undo), "redo": len(self._redo),
+                "bytes": self._bytes, "max_bytes": self.max_bytes,
+                "keys": len(self._key_ids)}
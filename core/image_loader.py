@@ -0,0 +1,140 @@
+"""
+core/image_loader.py
+
+Decodificación de plantillas con Pillow, compartida por la interfaz y el
+renderizador sin interfaz.
+
+Las imágenes se normalizan a RGB o RGBA. Para la interfaz, `to_qimage` empaqueta
+los píxeles directamente en el formato nativo de Qt (RGBA premultiplicado en
+orden BGRA, o RGBX) y crea un QImage que apunta a ese búfer sin copiarlo, de
+modo que Qt no tiene que convertir la imagen al crear el QPixmap.
+
+PyQt6 solo se importa dentro de `to_qimage`; el resto del módulo no depende de Qt.
+"""
+
+import math
+from contextlib import contextmanager
+
+PREVIEW_MAX_SIDE = 1024
+
+# Modo de Pillow -> (modo "raw" de empaquetado, nombre del formato de QImage)
+_QT_LAYOUTS = {
+    "RGBA": ("BGRa", "Format_ARGB32_Premultiplied"),
+    "RGB": ("RGBX", "Format_RGBX8888"),
+}
+
+
+@contextmanager
+def _unbounded_pixels():
+    """
+    Desactiva temporalmente el límite anti "decompression bomb" de Pillow.
+
+    Las plantillas A0 a 300 DPI superan ese límite; son archivos elegidos por el
+    usuario, no datos de terceros.
+    """
+    from PIL import Image
+
+    max_pixels, Image.MAX_IMAGE_PIXELS = Image.MAX_IMAGE_PIXELS, None
+    try:
+        yield Image
+    finally:
+        Image.MAX_IMAGE_PIXELS = max_pixels
+
+
+def _normalize(image, keep_alpha=True):
+    """
+    Convierte la imagen a RGB o RGBA (las que ya lo son no se tocan).
+    """
+    if image.mode in ("RGB", "RGBA"):
+        return image
+    has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+    return image.convert("RGBA" if keep_alpha and has_alpha else "RGB")
+
+
+def image_size(path):
+    """
+    Devuelve (ancho, alto) de una imagen leyendo solo su cabecera.
+    """
+    with _unbounded_pixels() as Image:
+        with Image.open(path) as image:
+            return image.size
+
+
+def open_image(path, keep_alpha=True):
+    """
+    Decodifica una imagen completa.
+
+    Args:
+        path (str): Ruta de la imagen.
+        keep_alpha (bool): Si es False, las imágenes con transparencia que no
+            sean RGBA se convierten a RGB.
+
+    Returns:
+        PIL.Image.Image: Imagen en modo RGB o RGBA.
+    """
+    with _unbounded_pixels() as Image:
+        image = Image.open(path)
+        image.load()
+    return _normalize(image, keep_alpha)
+
+
+def draft_preview(path, max_side=PREVIEW_MAX_SIDE):
+    """
+    Decodifica una vista previa reducida sin decodificar la imagen completa.
+
+    Solo es posible en formatos que admiten decodificación a escala (JPEG); para
+    el resto devuelve None y la vista previa se obtiene con `make_preview` tras
+    decodificar la imagen.
+
+    Args:
+        path (str): Ruta de la imagen.
+        max_side (int): Lado máximo de la vista previa.
+
+    Returns:
+        PIL.Image.Image: Vista previa en RGB/RGBA, o None.
+    """
+    with _unbounded_pixels() as Image:
+        image = Image.open(path)
+        if image.format != "JPEG":
+            image.close()
+            return None
+        w, h = image.size
+        factor = max(w, h) / max_side
+        if factor > 1:
+            image.draft(None, (math.ceil(w / factor), math.ceil(h / factor)))
+        image.load()
+    return make_preview(_normalize(image), max_side)
+
+
+def make_preview(image, max_side=PREVIEW_MAX_SIDE):
+    """
+    Reduce una imagen ya decodificada por un factor entero hasta caber en `max_side`.
+    """
+    factor = math.ceil(max(image.size) / max_side)
+    return image.reduce(factor) if factor > 1 else image
+
+
+def to_qimage(image):
+    """
+    Crea un QImage que comparte el búfer de píxeles de una imagen de Pillow.
+
+    Pillow empaqueta los píxeles una vez en el formato nativo de Qt y el QImage
+    apunta a ese búfer sin copiarlo. El búfer se guarda como atributo del QImage
+    devuelto: hay que conservar ese objeto (no una copia hecha por Qt) mientras
+    se use, por ejemplo pasándolo por señales de tipo `object`.
+
+    Args:
+        image (PIL.Image.Image): Imagen en modo RGB o RGBA.
+
+    Returns:
+        QImage: Imagen de solo lectura sobre el búfer de Pillow.
+    """
+    from PyQt6.QtGui import QImage
+
+    image = _normalize(image)
+    raw_mode, qt_format = _QT_LAYOUTS[image.mode]
+    buffer = image.tobytes("raw", raw_mode)
+    w, h = image.size
+    qimage = QImage(buffer, w, h, w * 4, getattr(QImage.Format, qt_format))
+    qimage._buffer = buffer
+    return qimage
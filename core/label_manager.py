@@ -2,8 +2,12 @@
 core/label_manager.py
 
 Gestiona la colección de objetos LabelItem, coordinando su registro y exportación.
+
+Como en BoxManager, cada cambio de las etiquetas se lleva a LayoutModel.
 """
 
+from core.layout_model import KIND_LABEL, LayoutModel
+
 class LabelManager:
     """
     Gestor lógico de etiquetas (LabelItem).
@@ -12,12 +16,16 @@ class LabelManager:
     garantizar nombres únicos y proporcionar los datos para la exportación.
     """
     
-    def __init__(self):
+    def __init__(self, model=None):
         """
         Inicializa el gestor de etiquetas con un diccionario vacío y un contador.
+
+        Args:
+            model (LayoutModel, optional): Modelo compartido con el gestor de cajas.
         """
         self.labels = {}
         self.counter = 0
+        self.model = model if model is not None else LayoutModel()
 
     def add_label(self, label_item, name=None):
         """
@@ -48,6 +56,7 @@ class LabelManager:
 
         label_item.name = name
         self.labels[name] = label_item
+        self.model.add_label(name, *label_item.model_geometry(), *label_item.model_content())
         return name
 
     def remove_label(self, name):
@@ -59,6 +68,7 @@ class LabelManager:
         """
         if name in self.labels:
             del self.labels[name]
+            self.model.remove(KIND_LABEL, name)
 
     def rename_label(self, old_name, new_name):
         """
@@ -80,6 +90,7 @@ class LabelManager:
                 else:
                     new_dict[key] = value
             self.labels = new_dict
+            self.model.rename(KIND_LABEL, old_name, new_name)
             return True
         return False
 
@@ -89,6 +100,33 @@ class LabelManager:
         """
         self.labels.clear()
         self.counter = 0
+        self.model.clear(KIND_LABEL)
+
+    def sync_geometry(self, label_item):
+        """
+        Lleva al modelo la posición actual de una etiqueta registrada.
+
+        Args:
+            label_item (LabelItem): Etiqueta movida.
+
+        Returns:
+            LabelRecord: Registro actualizado, o None si no está registrada.
+        """
+        if self.labels.get(label_item.name) is label_item:
+            return self.model.set_geometry(KIND_LABEL, label_item.name, *label_item.model_geometry())
+        return None
+
+    def sync_content(self, label_item):
+        """
+        Lleva al modelo la fuente, el tamaño y el texto actuales de una etiqueta registrada.
+
+        Args:
+            label_item (LabelItem): Etiqueta modificada.
+        """
+        if self.labels.get(label_item.name) is label_item:
+            font_name, font_size, text = label_item.model_content()
+            self.model.set_font(KIND_LABEL, label_item.name, font_name, font_size)
+            self.model.set_text(KIND_LABEL, label_item.name, text)
 
     def get_labels_data(self):
         """
@@ -97,15 +135,4 @@ class LabelManager:
         Returns:
             dict: Diccionario mapeando el nombre de la etiqueta a sus atributos (x, y, fuente, texto).
         """
-        data = {}
-        for name, label in self.labels.items():
-            x, y = label.get_center()
-            data[name] = {
-                "x": int(x), 
-                "y": int(y),
-                "font_size": label.text_item.font().pointSize(),
-                "font_name": label.font_name,
-                "text": label.get_text()
-            }
-            
-        return data
+        return self.model.labels_data()
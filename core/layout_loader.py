@@ -0,0 +1,200 @@
+"""
+core/layout_loader.py
+
+Carga de layouts exportados (`*_Coordenadas.py`) sin ejecutarlos.
+
+El archivo se analiza con `ast` y solo se interpretan literales: el diccionario
+`LAYOUT_CONFIG` y las asignaciones de rutas (`path_<stem> = r'fonts\\...'`) y
+fuentes (`font_<stem>_<size> = ImageFont.truetype(...)`) que genera el exportador.
+Las fuentes se tratan de forma simbólica como (font_name, font_size), así que no
+se importa PIL, no se abre ningún archivo de fuente y no hay efectos secundarios.
+"""
+
+import ast
+import os
+import re
+from collections import namedtuple
+from core.font_cache import font_stem
+from core.font_registry import get_font_registry
+from core.utils import DEFAULT_FONT_NAME, DEFAULT_FONT_SIZE
+
+_FONT_VAR_RE = re.compile(r"^font_(\w+?)_(\d+)$")
+
+
+def _font_file_from_path(path):
+    """
+    Extrae el nombre de archivo de una ruta de fuente exportada (separadores de Windows o POSIX).
+    """
+    return os.path.basename(path.replace("\\", "/")) or DEFAULT_FONT_NAME
+
+
+class _FontResolver:
+    """
+    Tabla de símbolos de fuentes de un archivo exportado.
+
+    Resuelve nombres de variable a (font_name, font_size) usando primero las
+    asignaciones del propio archivo y, si faltan, el patrón `font_<stem>_<size>`.
+    """
+
+    def __init__(self):
+        self.paths = {}   # path_<stem> -> archivo
+        self.fonts = {}   # font_<stem>_<size> -> (archivo, tamaño)
+        self._by_stem = None
+
+    def _file_for_stem(self, stem):
+        if stem == font_stem(DEFAULT_FONT_NAME):
+            return DEFAULT_FONT_NAME
+        if self._by_stem is None:
+            self._by_stem = {font_stem(f): f for f in get_font_registry().files()}
+            self._by_stem.update({font_stem(f): f for f in self.paths.values()})
+        return self._by_stem.get(stem, DEFAULT_FONT_NAME)
+
+    def collect(self, tree):
+        """
+        Registra las asignaciones de rutas y fuentes de nivel de módulo.
+        """
+        for node in tree.body:
+            if not (isinstance(node, ast.Assign) and len(node.targets) == 1
+                    and isinstance(node.targets[0], ast.Name)):
+                continue
+            var, value = node.targets[0].id, node.value
+
+            if isinstance(value, ast.Constant) and isinstance(value.value, str):
+                self.paths[var] = _font_file_from_path(value.value)
+
+            elif isinstance(value, ast.Call) and len(value.args) >= 2:
+                # ImageFont.truetype(path_var | 'ruta', tamaño)
+                path_arg, size_arg = value.args[0], value.args[1]
+                if isinstance(path_arg, ast.Name) and path_arg.id in self.paths:
+                    font_name = self.paths[path_arg.id]
+                elif isinstance(path_arg, ast.Constant) and isinstance(path_arg.value, str):
+                    font_name = _font_file_from_path(path_arg.value)
+                else:
+                    continue
+                if isinstance(size_arg, ast.Constant) and isinstance(size_arg.value, (int, float)):
+                    self.fonts[var] = (font_name, int(size_arg.value))
+
+    def resolve(self, var):
+        """
+        Devuelve (font_name, font_size) para una variable de fuente, o None si no lo es.
+        """
+        if var in self.fonts:
+            return self.fonts[var]
+        match = _FONT_VAR_RE.match(var)
+        if match:
+            return self._file_for_stem(match.group(1)), int(match.group(2))
+        return None
+
+
+# Referencia simbólica a una fuente del archivo exportado
+FontRef = namedtuple("FontRef", ["font_name", "font_size"])
+
+
+def _literal(node, fonts):
+    """
+    Evalúa un nodo literal de `LAYOUT_CONFIG`; los nombres de fuente se devuelven como FontRef.
+    """
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Dict):
+        if any(k is None for k in node.keys):
+            raise ValueError(f"Expresión no soportada en la línea {node.lineno}")
+        return {_literal(k, fonts): _literal(v, fonts) for k, v in zip(node.keys, node.values)}
+    if isinstance(node, (ast.Tuple, ast.List)):
+        values = [_literal(e, fonts) for e in node.elts]
+        return tuple(values) if isinstance(node, ast.Tuple) else values
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = _literal(node.operand, fonts)
+        if isinstance(value, (int, float)):
+            return -value if isinstance(node.op, ast.USub) else value
+    if isinstance(node, ast.Name):
+        ref = fonts.resolve(node.id)
+        if ref is not None:
+            return FontRef(*ref)
+        if node.id in fonts.paths:
+            return FontRef(fonts.paths[node.id], DEFAULT_FONT_SIZE)
+    raise ValueError(f"Expresión no soportada en la línea {getattr(node, 'lineno', '?')}")
+
+
+def parse_layout_config(source, filename="<layout>"):
+    """
+    Extrae `LAYOUT_CONFIG` del código fuente de un archivo exportado.
+
+    Args:
+        source (str): Código fuente del archivo.
+        filename (str): Nombre usado en los mensajes de error.
+
+    Returns:
+        dict: LAYOUT_CONFIG con las fuentes como FontRef.
+
+    Raises:
+        ValueError: Si el archivo no contiene LAYOUT_CONFIG o usa expresiones no literales.
+    """
+    try:
+        tree = ast.parse(source, filename=filename)
+    except SyntaxError as e:
+        raise ValueError(f"El archivo no es Python válido (línea {e.lineno}): {e.msg}") from e
+
+    fonts = _FontResolver()
+    fonts.collect(tree)
+
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+                and node.targets[0].id == "LAYOUT_CONFIG"):
+            config = _literal(node.value, fonts)
+            if not isinstance(config, dict):
+                raise ValueError("LAYOUT_CONFIG no es un diccionario")
+            return config
+    raise ValueError("El archivo no contiene LAYOUT_CONFIG")
+
+
+def _font_fields(font):
+    if isinstance(font, FontRef):
+        return font.font_name, font.font_size
+    return DEFAULT_FONT_NAME, DEFAULT_FONT_SIZE
+
+
+def layout_from_config(config):
+    """
+    Convierte un `LAYOUT_CONFIG` analizado al formato de datos de los gestores.
+
+    Args:
+        config (dict): Diccionario con las claves 'boxes' y 'labels'.
+
+    Returns:
+        dict: {'boxes': {nombre: {...}}, 'labels': {nombre: {...}}}.
+    """
+    layout = {"boxes": {}, "labels": {}}
+    for name, c in config.get("boxes", {}).items():
+        font_name, font_size = _font_fields(c.get("font"))
+        layout["boxes"][name] = {
+            "x1": c["x1"], "y1": c["y1"], "x2": c["x2"], "y2": c["y2"],
+            "font_name": font_name, "font_size": font_size,
+        }
+    for name, c in config.get("labels", {}).items():
+        font_name, font_size = _font_fields(c.get("font"))
+        layout["labels"][name] = {
+            "x": c["x"], "y": c["y"],
+            "font_name": font_name, "font_size": font_size,
+            "fill": tuple(c.get("fill", (0, 0, 0))),
+        }
+    return layout
+
+
+def load_layout_file(py_path):
+    """
+    Carga un archivo `*_Coordenadas.py` exportado sin ejecutarlo.
+
+    Args:
+        py_path (str): Ruta al archivo exportado.
+
+    Returns:
+        dict: Layout en el formato de `layout_from_config`.
+
+    Raises:
+        ValueError: Si el archivo no es un layout exportado válido.
+    """
+    with open(py_path, "r", encoding="utf-8") as f:
+        source = f.read()
+    return layout_from_config(parse_layout_config(source, py_path))
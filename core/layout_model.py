@@ -0,0 +1,443 @@
+"""
+core/layout_model.py
+
+Modelo del layout sin Qt: la fuente de verdad de los elementos.
+
+Cada caja y etiqueta es un registro compacto (`__slots__`) con su geometría en
+coordenadas de escena, el tamaño de fuente y dos índices a tablas internadas:
+el archivo de fuente y el texto. Una misma fuente o un mismo texto usado por
+miles de elementos se guarda una sola vez.
+
+En la interfaz, los gestores (BoxManager, LabelManager) escriben aquí cada
+alta, baja, renombrado y cambio de geometría, fuente o texto de los items de
+Qt; la exportación, los proyectos y la validación leen solo del modelo. Así,
+las herramientas sin interfaz pueden cargar, validar y exportar layouts sin
+importar PyQt6:
+
+    python -m core.layout_model proyecto.lbproj --validate --export salida/ -f json csv
+"""
+
+import argparse
+import os
+import sys
+from array import array
+from collections import namedtuple
+from core.utils import DEFAULT_FONT_NAME, DEFAULT_FONT_SIZE, snap_to_5
+
+KIND_BOX = "box"
+KIND_LABEL = "label"
+
+# Tamaño mínimo de una caja (igual que el redimensionado interactivo)
+MIN_BOX_SIZE = 8
+
+# Problema detectado por LayoutModel.validate
+Issue = namedtuple("Issue", ["kind", "name", "message"])
+
+
+class InternTable:
+    """
+    Tabla de cadenas internadas con recuento de referencias.
+
+    Cada cadena distinta se guarda una vez y se referencia por su índice; cuando
+    ningún registro la usa, su hueco se reutiliza.
+    """
+
+    __slots__ = ("_values", "_ids", "_refs", "_free")
+
+    def __init__(self):
+        self._values = []
+        self._ids = {}
+        self._refs = array("l")
+        self._free = []
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        return self._values[index]
+
+    def acquire(self, value):
+        """
+        Devuelve el índice de una cadena (añadiéndola si es nueva) y suma una referencia.
+        """
+        index = self._ids.get(value)
+        if index is None:
+            if self._free:
+                index = self._free.pop()
+                self._values[index] = value
+            else:
+                index = len(self._values)
+                self._values.append(value)
+                self._refs.append(0)
+            self._ids[value] = index
+        self._refs[index] += 1
+        return index
+
+    def release(self, index):
+        """
+        Resta una referencia; la cadena se libera cuando ya no la usa nadie.
+        """
+        self._refs[index] -= 1
+        if self._refs[index] == 0:
+            del self._ids[self._values[index]]
+            self._values[index] = None
+            self._free.append(index)
+
+    def replace(self, index, value):
+        """
+        Cambia la cadena de una referencia y devuelve el nuevo índice.
+        """
+        if self._values[index] == value:
+            return index
+        new_index = self.acquire(value)
+        self.release(index)
+        return new_index
+
+    def clear(self):
+        self._values.clear()
+        self._ids.clear()
+        self._refs = array("l")
+        self._free.clear()
+
+
+class BoxRecord:
+    """Caja: rectángulo (x, y, w, h) en la escena, fuente, tamaño y texto (índices de tabla)."""
+
+    __slots__ = ("name", "x", "y", "w", "h", "font", "size", "text")
+
+    def __init__(self, name, x, y, w, h, font, size, text):
+        self.name = name
+        self.x, self.y, self.w, self.h = x, y, w, h
+        self.font = font
+        self.size = size
+        self.text = text
+
+    def bounds(self):
+        """Rectángulo (x1, y1, x2, y2) en la escena."""
+        return (self.x, self.y, self.x + self.w, self.y + self.h)
+
+
+class LabelRecord:
+    """Etiqueta: punto (x, y) en la escena, fuente, tamaño y texto (índices de tabla)."""
+
+    __slots__ = ("name", "x", "y", "font", "size", "text")
+
+    def __init__(self, name, x, y, font, size, text):
+        self.name = name
+        self.x, self.y = x, y
+        self.font = font
+        self.size = size
+        self.text = text
+
+    def bounds(self):
+        """Rectángulo de tamaño cero (x, y, x, y) en la escena."""
+        return (self.x, self.y, self.x, self.y)
+
+
+class LayoutModel:
+    """
+    Cajas y etiquetas del layout, en orden de creación y con nombres únicos por tipo.
+    """
+
+    def __init__(self):
+        self.boxes = {}    # nombre -> BoxRecord
+        self.labels = {}   # nombre -> LabelRecord
+        self.fonts = InternTable()
+        self.texts = InternTable()
+
+    def __len__(self):
+        return len(self.boxes) + len(self.labels)
+
+    def records(self, kind):
+        """
+        Devuelve el diccionario de registros de un tipo ("box" o "label").
+        """
+        return self.boxes if kind == KIND_BOX else self.labels
+
+    def font_name(self, record):
+        return self.fonts[record.font]
+
+    def text(self, record):
+        return self.texts[record.text]
+
+    # ── Altas y bajas ──────────────────────────────────────────────────────
+    def add_box(self, name, x, y, w, h, font_name=DEFAULT_FONT_NAME, font_size=DEFAULT_FONT_SIZE, text=""):
+        """
+        Añade (o sustituye) una caja.
+
+        Returns:
+            BoxRecord: Registro creado.
+        """
+        self.remove(KIND_BOX, name)
+        record = self.boxes[name] = BoxRecord(
+            name, x, y, w, h, self.fonts.acquire(font_name or DEFAULT_FONT_NAME),
+            int(font_size or DEFAULT_FONT_SIZE), self.texts.acquire(text or ""))
+        return record
+
+    def add_label(self, name, x, y, font_name=DEFAULT_FONT_NAME, font_size=DEFAULT_FONT_SIZE, text=""):
+        """
+        Añade (o sustituye) una etiqueta.
+
+        Returns:
+            LabelRecord: Registro creado.
+        """
+        self.remove(KIND_LABEL, name)
+        record = self.labels[name] = LabelRecord(
+            name, x, y, self.fonts.acquire(font_name or DEFAULT_FONT_NAME),
+            int(font_size or DEFAULT_FONT_SIZE), self.texts.acquire(text or ""))
+        return record
+
+    def remove(self, kind, name):
+        """
+        Elimina un elemento.
+
+        Returns:
+            bool: True si existía.
+        """
+        record = self.records(kind).pop(name, None)
+        if record is None:
+            return False
+        self.fonts.release(record.font)
+        self.texts.release(record.text)
+        return True
+
+    def rename(self, kind, old_name, new_name):
+        """
+        Renombra un elemento conservando su posición en el orden de creación.
+
+        Returns:
+            bool: True si se renombró (existía y el nombre nuevo estaba libre).
+        """
+        records = self.records(kind)
+        if old_name not in records or new_name in records:
+            return False
+        renamed = {}
+        for name, record in records.items():
+            if name == old_name:
+                record.name = new_name
+                name = new_name
+            renamed[name] = record
+        records.clear()
+        records.update(renamed)
+        return True
+
+    def clear(self, kind=None):
+        """
+        Elimina todos los elementos (o solo los de un tipo).
+        """
+        for k in ((kind,) if kind else (KIND_BOX, KIND_LABEL)):
+            records = self.records(k)
+            for record in records.values():
+                self.fonts.release(record.font)
+                self.texts.release(record.text)
+            records.clear()
+
+    # ── Modificaciones ─────────────────────────────────────────────────────
+    def set_geometry(self, kind, name, x, y, w=0, h=0):
+        """
+        Actualiza la posición (y el tamaño, en las cajas) de un elemento.
+
+        Returns:
+            BoxRecord | LabelRecord: Registro actualizado, o None si no existe.
+        """
+        record = self.records(kind).get(name)
+        if record is None:
+            return None
+        record.x, record.y = x, y
+        if kind == KIND_BOX:
+            record.w, record.h = w, h
+        return record
+
+    def set_font(self, kind, name, font_name, font_size):
+        """
+        Actualiza la fuente y el tamaño de un elemento.
+        """
+        record = self.records(kind).get(name)
+        if record is None:
+            return
+        record.font = self.fonts.replace(record.font, font_name or DEFAULT_FONT_NAME)
+        record.size = int(font_size)
+
+    def set_text(self, kind, name, text):
+        """
+        Actualiza el texto de un elemento.
+        """
+        record = self.records(kind).get(name)
+        if record is not None:
+            record.text = self.texts.replace(record.text, text or "")
+
+    # ── Lectura ────────────────────────────────────────────────────────────
+    def boxes_data(self):
+        """
+        Datos de exportación de las cajas, con las coordenadas ajustadas a 5 px.
+
+        Returns:
+            dict: {nombre: {x1, y1, x2, y2, font_size, font_name, text}}.
+        """
+        fonts, texts = self.fonts, self.texts
+        return {
+            name: {"x1": snap_to_5(r.x), "y1": snap_to_5(r.y),
+                   "x2": snap_to_5(r.x + r.w), "y2": snap_to_5(r.y + r.h),
+                   "font_size": r.size, "font_name": fonts[r.font], "text": texts[r.text]}
+            for name, r in self.boxes.items()
+        }
+
+    def labels_data(self):
+        """
+        Datos de exportación de las etiquetas.
+
+        Returns:
+            dict: {nombre: {x, y, font_size, font_name, text}}.
+        """
+        fonts, texts = self.fonts, self.texts
+        return {
+            name: {"x": int(r.x), "y": int(r.y), "font_size": r.size,
+                   "font_name": fonts[r.font], "text": texts[r.text]}
+            for name, r in self.labels.items()
+        }
+
+    def layout(self):
+        """
+        Layout en el formato de core.layout_loader (el que usa el renderizador).
+        """
+        return {"boxes": self.boxes_data(), "labels": self.labels_data()}
+
+    def box_rows(self):
+        """
+        Filas de proyecto de las cajas, en el orden de core.project.BOX_FIELDS.
+        """
+        fonts, texts = self.fonts, self.texts
+        return [[r.name, r.x, r.y, r.w, r.h, fonts[r.font], r.size, texts[r.text]]
+                for r in self.boxes.values()]
+
+    def label_rows(self):
+        """
+        Filas de proyecto de las etiquetas, en el orden de core.project.LABEL_FIELDS.
+        """
+        fonts, texts = self.fonts, self.texts
+        return [[r.name, r.x, r.y, fonts[r.font], r.size, texts[r.text]]
+                for r in self.labels.values()]
+
+    # ── Construcción ───────────────────────────────────────────────────────
+    @classmethod
+    def from_project(cls, project):
+        """
+        Crea un modelo a partir de un proyecto leído con core.project.load_project.
+        """
+        model = cls()
+        for b in project["boxes"]:
+            model.add_box(b["name"], b["x"], b["y"], b["w"], b["h"],
+                          b.get("font_name"), b.get("font_size"), b.get("text"))
+        for lb in project["labels"]:
+            model.add_label(lb["name"], lb["x"], lb["y"],
+                            lb.get("font_name"), lb.get("font_size"), lb.get("text"))
+        return model
+
+    @classmethod
+    def from_layout(cls, layout):
+        """
+        Crea un modelo a partir de un layout exportado (ver core.layout_loader).
+        """
+        model = cls()
+        for name, c in layout["boxes"].items():
+            model.add_box(name, c["x1"], c["y1"], c["x2"] - c["x1"], c["y2"] - c["y1"],
+                          c.get("font_name"), c.get("font_size"), c.get("text"))
+        for name, c in layout["labels"].items():
+            model.add_label(name, c["x"], c["y"], c.get("font_name"), c.get("font_size"), c.get("text"))
+        return model
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carga un proyecto (.lbproj) o un layout exportado (.py).
+
+        Returns:
+            tuple: (modelo, ruta de la plantilla o None).
+        """
+        from core.project import PROJECT_EXTENSION, load_project
+
+        if path.endswith(PROJECT_EXTENSION):
+            project = load_project(path)
+            return cls.from_project(project), project["template"]
+        from core.layout_loader import load_layout_file
+        return cls.from_layout(load_layout_file(path)), None
+
+    # ── Validación ─────────────────────────────────────────────────────────
+    def validate(self, bounds=None, font_files=None):
+        """
+        Revisa el layout y devuelve los problemas encontrados.
+
+        Args:
+            bounds (tuple, optional): (ancho, alto) de la plantilla; se avisa de
+                los elementos que salen de ella.
+            font_files (iterable, optional): Archivos de fuente disponibles; se avisa
+                de los elementos que usan otra fuente.
+
+        Returns:
+            list: Issue(kind, name, message) en orden de creación.
+        """
+        issues = []
+        known = None if font_files is None else set(font_files) | {DEFAULT_FONT_NAME}
+        fonts = self.fonts
+        for kind, records in ((KIND_BOX, self.boxes), (KIND_LABEL, self.labels)):
+            for name, r in records.items():
+                if kind == KIND_BOX:
+                    if r.w < MIN_BOX_SIZE or r.h < MIN_BOX_SIZE:
+                        issues.append(Issue(kind, name, f"tamaño {r.w}x{r.h} menor que el mínimo ({MIN_BOX_SIZE})"))
+                    x2, y2 = r.x + r.w, r.y + r.h
+                else:
+                    x2, y2 = r.x, r.y
+                    if name in self.boxes:
+                        issues.append(Issue(kind, name, "hay una caja con el mismo nombre"))
+                if bounds and (r.x < 0 or r.y < 0 or x2 > bounds[0] or y2 > bounds[1]):
+                    issues.append(Issue(kind, name, "sale de la plantilla"))
+                if known is not None and fonts[r.font] not in known:
+                    issues.append(Issue(kind, name, f"fuente no encontrada: {fonts[r.font]}"))
+                if r.size < 1:
+                    issues.append(Issue(kind, name, f"tamaño de fuente no válido: {r.size}"))
+        return issues
+
+
+def main(argv=None):
+    """
+    Punto de entrada de línea de comandos: carga, valida y exporta un layout sin interfaz.
+    """
+    from core.exporter import EXPORT_FORMATS, export_layout
+
+    parser = argparse.ArgumentParser(
+        prog="python -m core.layout_model",
+        description="Valida y exporta un proyecto (.lbproj) o layout (.py) sin abrir la interfaz.",
+    )
+    parser.add_argument("source", help="Proyecto .lbproj o layout *_Coordenadas.py")
+    parser.add_argument("--validate", action="store_true", help="Revisar el layout")
+    parser.add_argument("--size", default=None, help="Tamaño de la plantilla (ANCHOxALTO) para --validate")
+    parser.add_argument("--export", metavar="DIR", default=None, help="Carpeta de exportación")
+    parser.add_argument("-f", "--formats", nargs="+", default=list(EXPORT_FORMATS), help="Formatos a exportar")
+    args = parser.parse_args(argv)
+
+    model, template = LayoutModel.load(args.source)
+    print(f"{len(model.boxes)} cajas, {len(model.labels)} etiquetas, "
+          f"{len(model.fonts)} fuentes, {len(model.texts)} textos distintos")
+
+    status = 0
+    if args.validate:
+        bounds = tuple(int(v) for v in args.size.lower().split("x")) if args.size else None
+        if bounds is None and template and os.path.exists(template):
+            from core.image_loader import image_size
+            bounds = image_size(template)
+        from core.font_registry import get_font_registry
+        issues = model.validate(bounds, get_font_registry().files())
+        for issue in issues:
+            print(f"{issue.kind} {issue.name}: {issue.message}", file=sys.stderr)
+        status = 1 if issues else 0
+
+    if args.export:
+        # Sin plantilla, el nombre de salida sale del layout de origen (X_Coordenadas.py -> X)
+        name_source = template or args.source.replace("_Coordenadas", "")
+        for path in export_layout(model, name_source, args.export, tuple(args.formats)):
+            print(path)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
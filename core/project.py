@@ -0,0 +1,117 @@
+"""
+core/project.py
+
+Formato de proyecto nativo (.lbproj): guarda el estado completo de los elementos
+(geometría, texto, fuente y tamaño) y la ruta de la plantilla para volver a abrir
+un diseño tal como se dejó.
+
+El archivo es JSON versionado. Los elementos se guardan como filas (listas) en el
+orden de `BOX_FIELDS` / `LABEL_FIELDS`, lo que mantiene el archivo compacto y
+permite leerlo con el decodificador en C de json.
+"""
+
+import json
+import os
+from core.fileio import atomic_write
+
+PROJECT_FORMAT = "layout-builder-project"
+PROJECT_VERSION = 1
+PROJECT_EXTENSION = ".lbproj"
+
+BOX_FIELDS = ("name", "x", "y", "w", "h", "font_name", "font_size", "text")
+LABEL_FIELDS = ("name", "x", "y", "font_name", "font_size", "text")
+
+
+def build_project(model, template_path=None):
+    """
+    Construye el diccionario de proyecto a partir del modelo del layout.
+
+    A diferencia de la exportación, las coordenadas no se ajustan a 5 px: el
+    proyecto conserva la geometría exacta de la escena.
+
+    Args:
+        model (LayoutModel): Modelo del layout.
+        template_path (str, optional): Ruta de la plantilla activa.
+
+    Returns:
+        dict: Proyecto listo para `save_project`.
+    """
+    return {
+        "format": PROJECT_FORMAT,
+        "version": PROJECT_VERSION,
+        "template": template_path,
+        "box_fields": list(BOX_FIELDS),
+        "label_fields": list(LABEL_FIELDS),
+        "boxes": model.box_rows(),
+        "labels": model.label_rows(),
+    }
+
+
+def save_project(path, project):
+    """
+    Guarda un proyecto de forma atómica.
+
+    La ruta de la plantilla se guarda relativa a la carpeta del proyecto cuando es
+    posible, para que el proyecto y su plantilla puedan moverse juntos.
+
+    Args:
+        path (str): Ruta del archivo .lbproj.
+        project (dict): Proyecto generado por `build_project`.
+    """
+    data = dict(project)
+    template = data.get("template")
+    if template:
+        project_dir = os.path.dirname(os.path.abspath(path))
+        try:
+            data["template"] = os.path.relpath(os.path.abspath(template), project_dir)
+        except ValueError:
+            # Otra unidad en Windows: se conserva la ruta absoluta
+            data["template"] = os.path.abspath(template)
+    atomic_write(path, json.dumps(data, ensure_ascii=False) + "\n")
+
+
+def _upgrade(data):
+    """
+    Valida la cabecera de un proyecto y lo lleva a la versión actual del formato.
+    """
+    if not isinstance(data, dict) or data.get("format") != PROJECT_FORMAT:
+        raise ValueError("El archivo no es un proyecto de Layout Builder")
+    version = data.get("version")
+    if not isinstance(version, int) or version < 1:
+        raise ValueError(f"Versión de proyecto no válida: {version!r}")
+    if version > PROJECT_VERSION:
+        raise ValueError(
+            f"El proyecto usa la versión {version} del formato; "
+            f"esta versión del programa solo admite hasta la {PROJECT_VERSION}"
+        )
+    return data
+
+
+def load_project(path):
+    """
+    Lee un archivo de proyecto.
+
+    Args:
+        path (str): Ruta del archivo .lbproj.
+
+    Returns:
+        dict: {'template': ruta absoluta o None,
+               'boxes': [dict de BOX_FIELDS], 'labels': [dict de LABEL_FIELDS]}.
+
+    Raises:
+        ValueError: Si el archivo no es un proyecto válido o es de una versión más reciente.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = _upgrade(json.load(f))
+
+    template = data.get("template")
+    if template and not os.path.isabs(template):
+        template = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(path)), template))
+
+    box_fields = data.get("box_fields", BOX_FIELDS)
+    label_fields = data.get("label_fields", LABEL_FIELDS)
+    return {
+        "template": template,
+        "boxes": [dict(zip(box_fields, row)) for row in data.get("boxes", [])],
+        "labels": [dict(zip(label_fields, row)) for row in data.get("labels", [])],
+    }
@@ -0,0 +1,238 @@
+"""
+core/renderer.py
+
+Renderizador por lotes sin interfaz (mail-merge): combina la plantilla, el layout
+exportado (`LAYOUT_CONFIG`) y una fila de Excel por imagen de salida.
+
+Las columnas del Excel se normalizan igual que en HeaderSelector y se enlazan por
+nombre con las cajas y etiquetas del layout. El texto de las cajas se maqueta con
+core.text_layout (justificado y centrado verticalmente, como en el lienzo). Las filas se reparten entre varios
+procesos (ProcessPoolExecutor); cada proceso carga la plantilla y las fuentes una
+sola vez.
+
+Uso:
+    python -m core.renderer layout_Coordenadas.py datos.xlsx --template plantilla.png -o salida/
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from core.utils import normalize_header
+from core.data_cache import get_data_cache
+from core.font_cache import get_font_cache
+from core.image_loader import open_image
+from core.layout_loader import load_layout_file
+from core.text_layout import draw_wrapped_text_justified
+
+RowResult = namedtuple("RowResult", ["index", "path", "error"])
+
+# Estado por proceso (se inicializa una vez en cada worker)
+_worker = None
+
+
+def load_layout(py_path):
+    """
+    Carga un archivo `*_Coordenadas.py` exportado y devuelve su layout normalizado.
+
+    El archivo se analiza sin ejecutarse (ver core.layout_loader).
+
+    Args:
+        py_path (str): Ruta al archivo exportado.
+
+    Returns:
+        dict: Layout en el formato de los gestores.
+    """
+    return load_layout_file(py_path)
+
+
+def read_rows(excel_path, use_cache=True):
+    """
+    Lee todas las filas de un Excel con las cabeceras normalizadas.
+
+    Las filas se guardan en la caché de datos (core.data_cache), por lo que las
+    siguientes ejecuciones con el mismo archivo no vuelven a analizar el libro.
+
+    Args:
+        excel_path (str): Ruta al archivo .xlsx/.xls.
+        use_cache (bool): Si es False, se lee siempre el Excel.
+
+    Returns:
+        list: Lista de diccionarios {cabecera_normalizada: texto}.
+    """
+    if use_cache:
+        return get_data_cache().rows(excel_path)
+
+    import pandas as pd
+
+    df = pd.read_excel(excel_path, dtype=str).fillna("")
+    df.columns = [normalize_header(h) for h in df.columns]
+    return df.to_dict(orient="records")
+
+
+def _init_worker(template_path, layout, output_dir, fmt):
+    """
+    Inicializa el estado de un proceso: plantilla decodificada y caché de fuentes precargada.
+    """
+    global _worker
+    template = open_image(template_path, keep_alpha=False)
+
+    fonts = get_font_cache()
+    fonts.warm({
+        (data["font_name"], data["font_size"])
+        for group in ("boxes", "labels") for data in layout[group].values()
+    })
+
+    _worker = {
+        "template": template,
+        "layout": layout,
+        "fonts": fonts,
+        "output_dir": output_dir,
+        "fmt": fmt,
+    }
+
+
+def _render_row(job):
+    """
+    Renderiza una fila en el proceso actual.
+
+    Args:
+        job (tuple): (índice, valores de la fila, nombre de archivo de salida).
+
+    Returns:
+        RowResult: Índice, ruta generada y error (None si todo fue bien).
+    """
+    index, values, out_name = job
+    try:
+        from PIL import ImageDraw
+
+        state = _worker
+        image = state["template"].copy()
+        draw = ImageDraw.Draw(image)
+        fonts = state["fonts"]
+
+        for name, data in state["layout"]["boxes"].items():
+            text = values.get(normalize_header(name))
+            if text:
+                font = fonts.get(data["font_name"], data["font_size"])
+                box = (data["x1"], data["y1"], data["x2"], data["y2"])
+                draw_wrapped_text_justified(draw, str(text), font, box)
+
+        for name, data in state["layout"]["labels"].items():
+            text = values.get(normalize_header(name))
+            if text:
+                font = fonts.get(data["font_name"], data["font_size"])
+                draw.text((data["x"], data["y"]), str(text), font=font, fill=data.get("fill", (0, 0, 0)))
+
+        path = os.path.join(state["output_dir"], f"{out_name}.{state['fmt']}")
+        image.save(path)
+        return RowResult(index, path, None)
+    except Exception as e:
+        return RowResult(index, None, f"{type(e).__name__}: {e}")
+
+
+def _output_names(rows, name_column, prefix):
+    """
+    Genera nombres de salida únicos y deterministas para cada fila.
+    """
+    names = []
+    used = set()
+    width = max(5, len(str(len(rows))))
+    for i, row in enumerate(rows):
+        name = f"{prefix}_{i + 1:0{width}d}"
+        if name_column:
+            value = str(row.get(name_column, "")).strip()
+            if value:
+                name = "".join(c if c.isalnum() or c in "-_." else "_" for c in value)
+        base, suffix = name, 1
+        while name in used:
+            name = f"{base}_{suffix}"
+            suffix += 1
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def render_batch(layout, template_path, rows, output_dir, jobs=None,
+                 name_column=None, fmt="png", chunksize=None):
+    """
+    Renderiza una imagen por fila repartiendo el trabajo entre varios procesos.
+
+    El orden de los resultados coincide con el de `rows`, y los errores se
+    informan por fila sin detener el lote.
+
+    Args:
+        layout (dict): Layout normalizado (ver core.layout_loader.layout_from_config).
+        template_path (str): Ruta a la imagen de plantilla.
+        rows (list): Filas {cabecera_normalizada: texto}.
+        output_dir (str): Carpeta de salida (se crea si no existe).
+        jobs (int, optional): Número de procesos (por defecto, uno por CPU).
+        name_column (str, optional): Columna cuyo valor da nombre a cada archivo.
+        fmt (str): Extensión/formato de salida ('png', 'jpg'...).
+        chunksize (int, optional): Filas enviadas a cada proceso por tarea.
+
+    Returns:
+        list: Lista de RowResult en el mismo orden que `rows`.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = jobs or os.cpu_count() or 1
+    prefix = os.path.splitext(os.path.basename(template_path))[0]
+    names = _output_names(rows, name_column and normalize_header(name_column), prefix)
+    work = [(i, row, names[i]) for i, row in enumerate(rows)]
+
+    if jobs == 1:
+        _init_worker(template_path, layout, output_dir, fmt)
+        return [_render_row(job) for job in work]
+
+    chunksize = chunksize or max(1, min(64, len(work) // (jobs * 4) or 1))
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(template_path, layout, output_dir, fmt),
+    ) as executor:
+        return list(executor.map(_render_row, work, chunksize=chunksize))
+
+
+def main(argv=None):
+    """
+    Punto de entrada de línea de comandos del renderizador por lotes.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m core.renderer",
+        description="Genera una imagen por fila de Excel a partir de un layout exportado.",
+    )
+    parser.add_argument("layout", help="Archivo *_Coordenadas.py exportado")
+    parser.add_argument("data", help="Archivo Excel con una fila por imagen")
+    parser.add_argument("-t", "--template", required=True, help="Imagen de plantilla")
+    parser.add_argument("-o", "--output", default="render", help="Carpeta de salida")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Número de procesos")
+    parser.add_argument("--name-column", default=None, help="Columna para nombrar los archivos")
+    parser.add_argument("--format", default="png", help="Formato de salida (png, jpg...)")
+    parser.add_argument("--limit", type=int, default=None, help="Procesar solo las N primeras filas")
+    parser.add_argument("--no-cache", action="store_true", help="Leer el Excel sin usar la caché de datos")
+    args = parser.parse_args(argv)
+
+    layout = load_layout(args.layout)
+    rows = read_rows(args.data, use_cache=not args.no_cache)
+    if args.limit is not None:
+        rows = rows[:args.limit]
+
+    start = time.perf_counter()
+    results = render_batch(layout, args.template, rows, args.output, jobs=args.jobs,
+                           name_column=args.name_column, fmt=args.format)
+    elapsed = time.perf_counter() - start
+
+    errors = [r for r in results if r.error]
+    for r in errors:
+        print(f"Fila {r.index + 2}: {r.error}", file=sys.stderr)
+    ok = len(results) - len(errors)
+    rate = ok / elapsed if elapsed > 0 else 0
+    print(f"{ok}/{len(results)} imágenes en {elapsed:.2f} s ({rate:.0f} img/s) -> {args.output}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
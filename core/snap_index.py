@@ -0,0 +1,323 @@
+"""
+core/snap_index.py
+
+Índice de anclas de alineación (snapping) sobre arrays de NumPy.
+
+Cada eje guarda sus anclas en tres arrays paralelos ordenados por coordenada:
+valor, propietario (un entero por elemento) y tipo de ancla (borde, centro,
+línea base... ver core.alignment_manager). Una consulta localiza con
+`searchsorted` la ventana [v - umbral, v + umbral] y elige la candidata con
+`argmin` sobre máscaras vectorizadas (tipo permitido, propietario excluido o
+desfasado), sin recorrer las anclas en Python.
+
+Los cambios no reordenan los arrays: el propietario se marca como desfasado y
+sus anclas nuevas quedan en una capa de cambios pendientes (normalmente unos
+pocos elementos, los que se están arrastrando) que se consulta por fuerza
+bruta. Cuando la capa crece, se funde con los arrays base en una sola ordenación.
+"""
+
+import numpy as np
+
+# Filas de la capa de cambios a partir de las cuales se funde con los arrays base
+COMPACT_MIN = 256
+
+
+def _axis_arrays(values, owners, kinds):
+    """
+    Convierte listas paralelas en arrays (valores, propietarios, tipos).
+    """
+    return (np.asarray(values, dtype=np.float64).reshape(-1),
+            np.asarray(owners, dtype=np.int64).reshape(-1),
+            np.asarray(kinds, dtype=np.int8).reshape(-1))
+
+
+def _sorted_arrays(values, owners, kinds):
+    """
+    Ordena por valor tres arrays paralelos.
+    """
+    order = np.argsort(values, kind="stable")
+    return values[order], owners[order], kinds[order]
+
+
+class _Axis:
+    """
+    Anclas de un eje: arrays base ordenados y capa de cambios pendientes.
+
+    La capa es un búfer sin ordenar al que se añaden las anclas nuevas; las que
+    quedan anticuadas se marcan con NaN, que nunca está dentro del umbral.
+    """
+
+    __slots__ = ("values", "owners", "kinds", "ov_values", "ov_owners", "ov_kinds", "ov_size")
+
+    def __init__(self, values=None, owners=None, kinds=None):
+        if values is None:
+            values, owners, kinds = _axis_arrays([], [], [])
+        self.values, self.owners, self.kinds = values, owners, kinds
+        self.ov_values, self.ov_owners, self.ov_kinds = _axis_arrays([np.nan] * 64, [0] * 64, [0] * 64)
+        self.ov_size = 0
+
+    def append(self, anchors, oid):
+        """
+        Añade anclas a la capa de cambios y devuelve su rango de filas.
+        """
+        start, end = self.ov_size, self.ov_size + len(anchors)
+        if end > len(self.ov_values):
+            grow = max(end, 2 * len(self.ov_values)) - len(self.ov_values)
+            self.ov_values = np.concatenate([self.ov_values, np.full(grow, np.nan)])
+            self.ov_owners = np.concatenate([self.ov_owners, np.zeros(grow, dtype=np.int64)])
+            self.ov_kinds = np.concatenate([self.ov_kinds, np.zeros(grow, dtype=np.int8)])
+        for row, (value, kind) in enumerate(anchors, start):
+            self.ov_values[row] = value
+            self.ov_kinds[row] = kind
+        self.ov_owners[start:end] = oid
+        self.ov_size = end
+        return start, end
+
+    def overlay(self):
+        """
+        Devuelve las filas ocupadas de la capa (valores, propietarios, tipos).
+        """
+        n = self.ov_size
+        return self.ov_values[:n], self.ov_owners[:n], self.ov_kinds[:n]
+
+
+class SnapIndex:
+    """
+    Índice persistente de anclas de alineación en los dos ejes.
+
+    Cada elemento aporta anclas (valor, tipo) en X y en Y. Las consultas de
+    'ancla más cercana dentro del umbral' aceptan varias coordenadas a la vez
+    (p. ej. los bordes y el centro de un rectángulo) y filtran por tipo de ancla
+    y por propietarios excluidos.
+    """
+
+    def __init__(self):
+        """
+        Inicializa el índice vacío.
+        """
+        self.clear()
+
+    def __len__(self):
+        return len(self._anchors)
+
+    def __contains__(self, key):
+        return key in self._anchors
+
+    def clear(self):
+        """
+        Vacía el índice.
+        """
+        self._ids = {}          # key -> id de propietario
+        self._anchors = {}      # key -> (xs, ys) tal como se registraron
+        self._pending = {}      # id -> filas (x, y) de sus anclas en la capa de cambios
+        self._stale = np.zeros(64, dtype=bool)  # id -> sus anclas de los arrays base no cuentan
+        self._next_id = 0
+        self._x = _Axis()
+        self._y = _Axis()
+
+    def _allocate(self, key):
+        oid = self._ids[key] = self._next_id
+        self._next_id += 1
+        if oid >= len(self._stale):
+            self._stale = np.concatenate([self._stale, np.zeros(len(self._stale), dtype=bool)])
+        return oid
+
+    def _drop_pending(self, oid):
+        rows = self._pending.pop(oid, None)
+        if rows is not None:
+            (x0, x1), (y0, y1) = rows
+            self._x.ov_values[x0:x1] = np.nan
+            self._y.ov_values[y0:y1] = np.nan
+
+    def update(self, key, xs, ys):
+        """
+        Registra o actualiza las anclas de un elemento.
+
+        Args:
+            key: Identificador del elemento (normalmente el propio item).
+            xs (iterable): Pares (coordenada X, tipo de ancla).
+            ys (iterable): Pares (coordenada Y, tipo de ancla).
+        """
+        xs, ys = tuple(xs), tuple(ys)
+        if self._anchors.get(key) == (xs, ys):
+            return
+        oid = self._ids.get(key)
+        if oid is None:
+            oid = self._allocate(key)
+        else:
+            self._stale[oid] = True
+            self._drop_pending(oid)
+        self._anchors[key] = (xs, ys)
+        self._pending[oid] = (self._x.append(xs, oid), self._y.append(ys, oid))
+        if max(self._x.ov_size, self._y.ov_size) > max(COMPACT_MIN, 4 * int(len(self._x.values) ** 0.5)):
+            self._compact()
+
+    def remove(self, key):
+        """
+        Elimina del índice todas las anclas de un elemento.
+
+        Args:
+            key: Identificador del elemento.
+        """
+        if self._anchors.pop(key, None) is None:
+            return
+        oid = self._ids.pop(key)
+        self._stale[oid] = True
+        self._drop_pending(oid)
+
+    def load(self, entries):
+        """
+        Sustituye el contenido del índice por un conjunto completo de elementos.
+
+        Equivale a llamar a `update` por cada elemento, pero construye y ordena
+        cada eje una sola vez.
+
+        Args:
+            entries (iterable): Tuplas (key, xs, ys).
+        """
+        self.clear()
+        columns = ([], [], []), ([], [], [])
+        for key, xs, ys in entries:
+            xs, ys = tuple(xs), tuple(ys)
+            if key in self._anchors:
+                continue
+            oid = self._allocate(key)
+            self._anchors[key] = (xs, ys)
+            for anchors, (values, owners, kinds) in zip((xs, ys), columns):
+                for value, kind in anchors:
+                    values.append(value)
+                    owners.append(oid)
+                    kinds.append(kind)
+        self._x = _Axis(*_sorted_arrays(*_axis_arrays(*columns[0])))
+        self._y = _Axis(*_sorted_arrays(*_axis_arrays(*columns[1])))
+
+    def _live(self, axis):
+        """
+        Devuelve las anclas vigentes de un eje (base no desfasada + capa), sin ordenar.
+        """
+        live = ~self._stale[axis.owners]
+        values, owners, kinds = axis.overlay()
+        alive = ~np.isnan(values)
+        return (np.concatenate([axis.values[live], values[alive]]),
+                np.concatenate([axis.owners[live], owners[alive]]),
+                np.concatenate([axis.kinds[live], kinds[alive]]))
+
+    def _compact(self):
+        """
+        Funde la capa de cambios pendientes con los arrays base.
+        """
+        self._x = _Axis(*_sorted_arrays(*self._live(self._x)))
+        self._y = _Axis(*_sorted_arrays(*self._live(self._y)))
+        self._pending.clear()
+        self._stale[:] = False
+
+    def _excluded_ids(self, exclude):
+        """
+        Convierte un propietario (o conjunto de propietarios) en un array de ids.
+        """
+        if exclude is None:
+            return None
+        keys = exclude if isinstance(exclude, (set, frozenset)) else (exclude,)
+        ids = [self._ids[key] for key in keys if key in self._ids]
+        return np.asarray(ids, dtype=np.int64) if ids else None
+
+    def _nearest(self, axis, values, threshold, exclude, kinds):
+        """
+        Busca el ancla más cercana a cualquiera de las coordenadas dentro del umbral.
+
+        Las máscaras (propietario desfasado o excluido, tipo de ancla) solo se
+        evalúan sobre las candidatas de cada ventana, nunca sobre todo el índice.
+
+        Returns:
+            tuple: (ancla, distancia, índice de la coordenada) o (None, None, None).
+        """
+        probes = np.asarray(values, dtype=np.float64).reshape(-1)
+        excluded = self._excluded_ids(exclude)
+        best_dist, best_value, best_probe = np.inf, None, None
+
+        base = axis.values
+        if len(base):
+            lo = np.searchsorted(base, probes - threshold, side="left")
+            hi = np.searchsorted(base, probes + threshold, side="right")
+            # Una ventana por coordenada consultada (dos bordes y un centro como mucho)
+            for i in np.flatnonzero(hi > lo):
+                a, b = lo[i], hi[i]
+                owners = axis.owners[a:b]
+                mask = ~self._stale[owners]
+                if excluded is not None:
+                    mask &= ~np.isin(owners, excluded)
+                if kinds is not None:
+                    mask &= kinds[axis.kinds[a:b]]
+                if not mask.any():
+                    continue
+                dist = np.where(mask, np.abs(base[a:b] - probes[i]), np.inf)
+                j = int(dist.argmin())
+                if dist[j] < best_dist:
+                    best_dist, best_value, best_probe = dist[j], base[a + j], int(i)
+
+        values, owners, anchor_kinds = axis.overlay()
+        if len(values):
+            # Primero la distancia (las filas anticuadas son NaN y no pasan); las
+            # máscaras solo se evalúan sobre las pocas candidatas que quedan
+            dist = np.abs(values[None, :] - probes[:, None]).ravel()
+            near = np.flatnonzero(dist <= threshold)
+            if len(near):
+                rows = near % len(values)
+                mask = np.ones(len(near), dtype=bool)
+                if kinds is not None:
+                    mask &= kinds[anchor_kinds[rows]]
+                if excluded is not None:
+                    mask &= ~np.isin(owners[rows], excluded)
+                if mask.any():
+                    near = near[mask]
+                    k = near[int(dist[near].argmin())]
+                    if dist[k] < best_dist:
+                        best_dist, best_value, best_probe = dist[k], values[k % len(values)], int(k // len(values))
+
+        if best_value is None:
+            return None, None, None
+        return float(best_value), float(best_dist), best_probe
+
+    def nearest_x(self, values, threshold, exclude=None, kinds=None):
+        """
+        Busca la coordenada X de ancla más cercana a alguna de `values` dentro del umbral.
+
+        Args:
+            values (float | sequence): Coordenada(s) de referencia.
+            threshold (float): Distancia máxima.
+            exclude: Propietario (o conjunto de propietarios, p. ej. un grupo que se
+                está moviendo) cuyas anclas no cuentan.
+            kinds (numpy.ndarray, optional): Máscara booleana indexada por tipo de
+                ancla; solo cuentan los tipos a True.
+
+        Returns:
+            tuple: (x, distancia, índice en `values`) o (None, None, None).
+        """
+        return self._nearest(self._x, values, threshold, exclude, kinds)
+
+    def nearest_y(self, values, threshold, exclude=None, kinds=None):
+        """
+        Busca la coordenada Y de ancla más cercana a alguna de `values` (ver nearest_x).
+        """
+        return self._nearest(self._y, values, threshold, exclude, kinds)
+
+    def _values(self, axis, kinds):
+        values, _, anchor_kinds = self._live(axis)
+        if kinds is not None:
+            values = values[kinds[anchor_kinds]]
+        return np.unique(values).tolist()
+
+    def x_values(self, kinds=None):
+        """
+        Devuelve la lista ordenada de coordenadas X de ancla (sin repetir).
+
+        Args:
+            kinds (numpy.ndarray, optional): Máscara de tipos de ancla (ver nearest_x).
+        """
+        return self._values(self._x, kinds)
+
+    def y_values(self, kinds=None):
+        """
+        Devuelve la lista ordenada de coordenadas Y de ancla (sin repetir).
+        """
+        return self._values(self._y, kinds)
@@ -0,0 +1,220 @@
+"""
+core/spatial_index.py
+
+Índice espacial de rejilla uniforme para consultas geométricas sobre los elementos
+(solapamientos, elementos dentro de un rectángulo, elementos fuera de la plantilla).
+
+Es Python puro y no depende de Qt: los rectángulos son tuplas (x1, y1, x2, y2) y
+las claves pueden ser cualquier objeto hashable (items, nombres...).
+"""
+
+from math import floor
+
+DEFAULT_CELL_SIZE = 128
+
+
+def rects_overlap(a, b):
+    """
+    Indica si dos rectángulos se solapan (compartir solo un borde no cuenta).
+
+    Args:
+        a (tuple): (x1, y1, x2, y2).
+        b (tuple): (x1, y1, x2, y2).
+
+    Returns:
+        bool: True si sus interiores se intersecan.
+    """
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def rect_intersects(a, b):
+    """
+    Indica si dos rectángulos se tocan o intersecan (bordes incluidos).
+    """
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def rect_contains(outer, inner):
+    """
+    Indica si `inner` está completamente dentro de `outer`.
+    """
+    return (outer[0] <= inner[0] and outer[1] <= inner[1] and
+            inner[2] <= outer[2] and inner[3] <= outer[3])
+
+
+class SpatialIndex:
+    """
+    Rejilla uniforme que asocia cada celda con las claves cuyos rectángulos la tocan.
+
+    Las altas, bajas y actualizaciones solo modifican las celdas afectadas, y las
+    consultas recorren únicamente las celdas que cubre el rectángulo consultado.
+    """
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        """
+        Inicializa el índice vacío.
+
+        Args:
+            cell_size (int): Lado de cada celda en píxeles de escena.
+        """
+        self.cell_size = cell_size
+        self._cells = {}
+        self._rects = {}
+
+    def __len__(self):
+        return len(self._rects)
+
+    def __contains__(self, key):
+        return key in self._rects
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (floor(rect[0] / size), floor(rect[1] / size),
+                floor(rect[2] / size), floor(rect[3] / size))
+
+    def insert(self, key, rect):
+        """
+        Registra o actualiza el rectángulo de una clave.
+
+        Args:
+            key: Identificador del elemento.
+            rect (tuple): (x1, y1, x2, y2) en coordenadas de escena.
+        """
+        rect = (min(rect[0], rect[2]), min(rect[1], rect[3]),
+                max(rect[0], rect[2]), max(rect[1], rect[3]))
+        old = self._rects.get(key)
+        if old == rect:
+            return
+        if old is not None:
+            if self._cell_range(old) == self._cell_range(rect):
+                self._rects[key] = rect
+                return
+            self.remove(key)
+
+        self._rects[key] = rect
+        cx1, cy1, cx2, cy2 = self._cell_range(rect)
+        cells = self._cells
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = cells[(cx, cy)] = set()
+                bucket.add(key)
+
+    update = insert
+
+    def remove(self, key):
+        """
+        Elimina una clave del índice.
+
+        Args:
+            key: Identificador del elemento.
+        """
+        rect = self._rects.pop(key, None)
+        if rect is None:
+            return
+        cx1, cy1, cx2, cy2 = self._cell_range(rect)
+        cells = self._cells
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del cells[(cx, cy)]
+
+    def clear(self):
+        """
+        Vacía el índice.
+        """
+        self._cells.clear()
+        self._rects.clear()
+
+    def rect(self, key):
+        """
+        Devuelve el rectángulo registrado para una clave (o None).
+        """
+        return self._rects.get(key)
+
+    def _candidates(self, rect):
+        cx1, cy1, cx2, cy2 = self._cell_range(rect)
+        cells = self._cells
+        found = set()
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(cells):
+            # Rectángulo enorme: es más barato recorrer solo las celdas ocupadas
+            for (cx, cy), bucket in cells.items():
+                if cx1 <= cx <= cx2 and cy1 <= cy <= cy2:
+                    found.update(bucket)
+            return found
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return found
+
+    def query_rect(self, rect, exclude=None):
+        """
+        Devuelve las claves cuyos rectángulos tocan un área (bordes incluidos).
+
+        Args:
+            rect (tuple): (x1, y1, x2, y2) del área consultada.
+            exclude (optional): Clave a ignorar.
+
+        Returns:
+            list: Claves encontradas.
+        """
+        rects = self._rects
+        return [key for key in self._candidates(rect)
+                if key != exclude and rect_intersects(rects[key], rect)]
+
+    def query_inside(self, rect):
+        """
+        Devuelve las claves cuyos rectángulos están completamente dentro de un área.
+
+        Útil para la selección por rectángulo (rubber-band).
+        """
+        rects = self._rects
+        return [key for key in self._candidates(rect) if rect_contains(rect, rects[key])]
+
+    def overlapping(self, key, keys=None):
+        """
+        Devuelve las claves cuyo rectángulo se solapa con el de `key`.
+
+        Args:
+            key: Clave de referencia (debe estar registrada).
+            keys (container, optional): Si se indica, solo se consideran estas claves.
+
+        Returns:
+            list: Claves que se solapan (compartir un borde no cuenta).
+        """
+        rect = self._rects.get(key)
+        if rect is None:
+            return []
+        rects = self._rects
+        return [other for other in self._candidates(rect)
+                if other != key and (keys is None or other in keys)
+                and rects_overlap(rects[other], rect)]
+
+    def outside(self, bounds):
+        """
+        Devuelve las claves cuyos rectángulos sobresalen de unos límites.
+
+        Solo se examinan las celdas que no quedan completamente dentro de `bounds`.
+
+        Args:
+            bounds (tuple): (x1, y1, x2, y2) de la plantilla.
+
+        Returns:
+            list: Claves que se salen total o parcialmente.
+        """
+        size = self.cell_size
+        # Rango de celdas completamente interiores a los límites
+        ix1, iy1 = -floor(-bounds[0] / size), -floor(-bounds[1] / size)
+        ix2, iy2 = floor(bounds[2] / size) - 1, floor(bounds[3] / size) - 1
+        rects = self._rects
+        found = set()
+        for (cx, cy), bucket in self._cells.items():
+            if not (ix1 <= cx <= ix2 and iy1 <= cy <= iy2):
+                found.update(bucket)
+        return [key for key in found if not rect_contains(bounds, rects[key])]
@@ -0,0 +1,224 @@
+"""
+core/text_layout.py
+
+Motor de ajuste y justificación de texto para fuentes de PIL.
+
+Reproduce la maquetación que BoxItem muestra en el lienzo (sync_text_layout +
+TextItem.set_justified): texto justificado al ancho de la caja, cortes por palabra
+(o por carácter si una palabra no cabe), última línea de cada párrafo alineada a
+la izquierda y bloque centrado verticalmente.
+
+Los anchos de palabra se memorizan por (fuente, tamaño, palabra) y los cortes de
+línea se calculan con sumas prefijas, sin volver a medir líneas completas.
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+
+MAX_CACHED_WIDTHS = 200_000
+
+
+def font_key(font):
+    """
+    Identificador estable de una fuente de PIL: (archivo, tamaño).
+    """
+    return (getattr(font, "path", None) or id(font), getattr(font, "size", None))
+
+
+class TextMeasurer:
+    """
+    Memoriza los anchos de palabras y caracteres por fuente.
+
+    Attributes:
+        measure_calls (int): Mediciones reales realizadas con PIL.
+        hits (int): Mediciones resueltas desde la caché.
+    """
+
+    def __init__(self, max_entries=MAX_CACHED_WIDTHS):
+        """
+        Inicializa el medidor.
+
+        Args:
+            max_entries (int): Tamaño máximo de la caché antes de vaciarla.
+        """
+        self.max_entries = max_entries
+        self.measure_calls = 0
+        self.hits = 0
+        self._widths = {}
+
+    def width(self, font, text, key=None):
+        """
+        Devuelve el ancho en píxeles de un texto con una fuente.
+
+        Args:
+            font (ImageFont.FreeTypeFont): Fuente.
+            text (str): Palabra o fragmento a medir.
+            key (tuple, optional): font_key(font) ya calculado.
+        """
+        cache_key = (key or font_key(font), text)
+        width = self._widths.get(cache_key)
+        if width is not None:
+            self.hits += 1
+            return width
+        if len(self._widths) >= self.max_entries:
+            self._widths.clear()
+        self.measure_calls += 1
+        width = self._widths[cache_key] = font.getlength(text)
+        return width
+
+    def stats(self):
+        """
+        Devuelve los contadores del medidor.
+        """
+        return {"entries": len(self._widths), "measure_calls": self.measure_calls, "hits": self.hits}
+
+
+_default_measurer = None
+
+
+def get_measurer():
+    """
+    Devuelve el medidor compartido del proceso actual.
+    """
+    global _default_measurer
+    if _default_measurer is None:
+        _default_measurer = TextMeasurer()
+    return _default_measurer
+
+
+def _split_long_word(word, font, width, measurer, key):
+    """
+    Parte una palabra más ancha que la caja en fragmentos que caben (corte por carácter).
+    """
+    pieces = []
+    current, current_w = "", 0.0
+    for char in word:
+        char_w = measurer.width(font, char, key)
+        if current and current_w + char_w > width:
+            pieces.append(current)
+            current, current_w = "", 0.0
+        current += char
+        current_w += char_w
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def wrap_text(text, font, width, measurer=None):
+    """
+    Reparte el texto en líneas de un ancho máximo.
+
+    Args:
+        text (str): Texto (los saltos de línea separan párrafos).
+        font (ImageFont.FreeTypeFont): Fuente.
+        width (float): Ancho disponible en píxeles.
+        measurer (TextMeasurer, optional): Medidor a usar (por defecto, el compartido).
+
+    Returns:
+        list: Líneas como tuplas (palabras, anchos, es_ultima_del_párrafo).
+    """
+    measurer = measurer or get_measurer()
+    key = font_key(font)
+    space = measurer.width(font, " ", key)
+    lines = []
+
+    for paragraph in text.split("\n"):
+        words, widths = [], []
+        for word in paragraph.split():
+            w = measurer.width(font, word, key)
+            if w > width:
+                for piece in _split_long_word(word, font, width, measurer, key):
+                    words.append(piece)
+                    widths.append(measurer.width(font, piece, key))
+            else:
+                words.append(word)
+                widths.append(w)
+
+        if not words:
+            lines.append(((), (), True))
+            continue
+
+        # q[k] = ancho de las k primeras palabras + k espacios, de modo que la línea
+        # words[i:j] mide q[j] - q[i] - space.
+        q = [0.0]
+        q.extend(total + space * (k + 1) for k, total in enumerate(accumulate(widths)))
+
+        n = len(words)
+        i = 0
+        while i < n:
+            j = bisect_right(q, width + space + q[i], i + 1) - 1
+            j = max(j, i + 1)
+            lines.append((tuple(words[i:j]), tuple(widths[i:j]), j == n))
+            i = j
+    return lines
+
+
+def line_height_for(font, line_spacing=None):
+    """
+    Altura de línea en píxeles: `line_spacing` si se indica, o ascent + descent.
+    """
+    if line_spacing:
+        return line_spacing
+    ascent, descent = font.getmetrics()
+    return ascent + descent
+
+
+def layout_justified(text, font, box, line_spacing=None, measurer=None):
+    """
+    Calcula la posición de cada fragmento de texto dentro de una caja.
+
+    Las líneas se justifican (salvo la última de cada párrafo), el bloque se
+    centra verticalmente y se descartan las líneas que no caben en la altura.
+
+    Args:
+        text (str): Texto a maquetar.
+        font (ImageFont.FreeTypeFont): Fuente.
+        box (tuple): (x1, y1, x2, y2).
+        line_spacing (int, optional): Altura de línea en píxeles.
+        measurer (TextMeasurer, optional): Medidor a usar.
+
+    Returns:
+        list: Fragmentos (x, y, texto) listos para `draw.text`.
+    """
+    x1, y1, x2, y2 = box
+    width, height = x2 - x1, y2 - y1
+    line_h = line_height_for(font, line_spacing)
+    lines = wrap_text(text, font, width, measurer)
+
+    max_lines = max(1, int(height // line_h)) if height > 0 else len(lines)
+    lines = lines[:max_lines]
+    y = y1 + max(0, (height - line_h * len(lines)) / 2)
+
+    runs = []
+    for words, widths, last in lines:
+        if words:
+            if last or len(words) == 1:
+                runs.append((x1, y, " ".join(words)))
+            else:
+                gap = (width - sum(widths)) / (len(words) - 1)
+                x = x1
+                for word, w in zip(words, widths):
+                    runs.append((x, y, word))
+                    x += w + gap
+        y += line_h
+    return runs
+
+
+def draw_wrapped_text_justified(draw, text, font, text_box, line_spacing=None, fill=(0, 0, 0),
+                                measurer=None):
+    """
+    Dibuja texto justificado y centrado verticalmente dentro de una caja.
+
+    Es la función a la que hacen referencia los fragmentos del archivo .txt exportado.
+
+    Args:
+        draw (ImageDraw.ImageDraw): Contexto de dibujo.
+        text (str): Texto a dibujar.
+        font (ImageFont.FreeTypeFont): Fuente.
+        text_box (tuple): (x1, y1, x2, y2).
+        line_spacing (int, optional): Altura de línea en píxeles.
+        fill (tuple): Color RGB.
+        measurer (TextMeasurer, optional): Medidor a usar.
+    """
+    for x, y, run in layout_justified(text, font, text_box, line_spacing, measurer):
+        draw.text((x, y), run, font=font, fill=fill)
@@ -0,0 +1,246 @@
+"""
+core/tile_pyramid.py
+
+Pirámide de teselas multirresolución para plantillas de gran tamaño.
+
+Una plantilla A0 a 300 DPI ocupa cientos de MB decodificada. En lugar de
+mantenerla entera en memoria, se corta una sola vez en teselas de
+`TILE_SIZE` px para varios niveles de detalle (nivel 0 = resolución completa,
+cada nivel siguiente a la mitad) y se guarda en disco junto a la plantilla:
+
+    plantilla.png
+    plantilla.png.tiles/
+        manifest.json     Tamaño, niveles y firma (mtime, tamaño) de la plantilla.
+        0/<col>_<row>.png
+        1/<col>_<row>.png
+        ...
+
+El manifiesto se escribe el último, así que una pirámide a medio generar nunca
+se toma por válida. Si la plantilla cambia, la firma deja de coincidir y la
+pirámide se regenera. Si la carpeta de la plantilla no admite escritura, la
+pirámide se guarda en `.cache/tiles/`.
+"""
+
+import hashlib
+import json
+import math
+import os
+import shutil
+from collections import namedtuple
+from core.fileio import atomic_write
+from core.image_loader import open_image
+
+TILE_SIZE = 512
+TILE_EXTENSION = ".png"
+PYRAMID_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+PYRAMID_SUFFIX = ".tiles"
+CACHE_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", ".cache", "tiles"))
+
+# A partir de este número de píxeles la plantilla se muestra con teselas
+TILED_MIN_PIXELS = 4096 * 4096
+
+# Un nivel de la pirámide: tamaño en píxeles y número de teselas por eje
+PyramidLevel = namedtuple("PyramidLevel", ["width", "height", "cols", "rows"])
+
+
+def _source_signature(source_path):
+    st = os.stat(source_path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _level_sizes(width, height, tile_size):
+    """
+    Calcula los niveles: cada uno a la mitad del anterior hasta caber en una tesela.
+    """
+    levels = []
+    w, h = width, height
+    while True:
+        levels.append(PyramidLevel(w, h, math.ceil(w / tile_size), math.ceil(h / tile_size)))
+        if w <= tile_size and h <= tile_size:
+            return levels
+        w, h = math.ceil(w / 2), math.ceil(h / 2)
+
+
+def pyramid_dir(source_path):
+    """
+    Devuelve la carpeta de teselas de una plantilla (junto a ella).
+    """
+    return os.path.abspath(source_path) + PYRAMID_SUFFIX
+
+
+def _fallback_dir(source_path):
+    path_hash = hashlib.sha1(os.path.abspath(source_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, path_hash + PYRAMID_SUFFIX)
+
+
+class TilePyramid:
+    """
+    Pirámide de teselas ya generada en disco.
+
+    Attributes:
+        directory (str): Carpeta de la pirámide.
+        width (int): Ancho de la plantilla a resolución completa.
+        height (int): Alto de la plantilla a resolución completa.
+        tile_size (int): Lado de las teselas en píxeles.
+        levels (list): PyramidLevel de cada nivel, del 0 (completo) al más reducido.
+    """
+
+    def __init__(self, directory, width, height, tile_size, levels):
+        self.directory = directory
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.levels = levels
+
+    def tile_path(self, level, col, row):
+        """
+        Devuelve la ruta del archivo de una tesela.
+        """
+        return os.path.join(self.directory, str(level), f"{col}_{row}{TILE_EXTENSION}")
+
+    def level_scale(self, level):
+        """
+        Devuelve (sx, sy): píxeles de la plantilla completa por píxel del nivel.
+        """
+        lv = self.levels[level]
+        return self.width / lv.width, self.height / lv.height
+
+    def level_for_scale(self, scale):
+        """
+        Elige el nivel adecuado para una escala de visualización.
+
+        Se usa el nivel más reducido cuya resolución sigue siendo igual o mayor
+        que la de la pantalla, de modo que nunca se amplían teselas de un nivel
+        inferior.
+
+        Args:
+            scale (float): Píxeles de pantalla por píxel de la plantilla.
+
+        Returns:
+            int: Índice del nivel.
+        """
+        if scale >= 1 or scale <= 0:
+            return 0
+        level = int(math.floor(math.log2(1 / scale)))
+        return min(level, len(self.levels) - 1)
+
+    def tiles_in_rect(self, level, x1, y1, x2, y2):
+        """
+        Enumera las teselas de un nivel que cubren un rectángulo de la plantilla.
+
+        Args:
+            level (int): Índice del nivel.
+            x1, y1, x2, y2 (float): Rectángulo en coordenadas de la plantilla completa.
+
+        Returns:
+            list: Tuplas (col, row).
+        """
+        lv = self.levels[level]
+        sx, sy = self.level_scale(level)
+        step_x, step_y = self.tile_size * sx, self.tile_size * sy
+        c1 = max(0, int(x1 // step_x))
+        r1 = max(0, int(y1 // step_y))
+        c2 = min(lv.cols - 1, int(math.ceil(x2 / step_x)) - 1)
+        r2 = min(lv.rows - 1, int(math.ceil(y2 / step_y)) - 1)
+        return [(c, r) for r in range(r1, r2 + 1) for c in range(c1, c2 + 1)]
+
+    @classmethod
+    def open(cls, source_path, tile_size=TILE_SIZE):
+        """
+        Abre la pirámide existente de una plantilla si sigue siendo válida.
+
+        Returns:
+            TilePyramid: La pirámide, o None si no existe o está desactualizada.
+        """
+        signature = _source_signature(source_path)
+        for directory in (pyramid_dir(source_path), _fallback_dir(source_path)):
+            try:
+                with open(os.path.join(directory, MANIFEST_NAME), "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if (manifest.get("version") != PYRAMID_FORMAT_VERSION
+                    or manifest.get("source") != signature
+                    or manifest.get("tile_size") != tile_size):
+                continue
+            levels = [PyramidLevel(*lv) for lv in manifest["levels"]]
+            return cls(directory, manifest["width"], manifest["height"], tile_size, levels)
+        return None
+
+
+def _prepare_dir(directory):
+    if os.path.isdir(directory):
+        shutil.rmtree(directory)
+    os.makedirs(directory)
+
+
+def build_pyramid(source_path, tile_size=TILE_SIZE, on_progress=None):
+    """
+    Genera (o regenera) la pirámide de teselas de una plantilla.
+
+    Args:
+        source_path (str): Ruta de la imagen de la plantilla.
+        tile_size (int): Lado de las teselas en píxeles.
+        on_progress (callable, optional): Función `on_progress(hechas, total)`
+            que se llama tras guardar cada tesela.
+
+    Returns:
+        TilePyramid: La pirámide generada.
+    """
+    signature = _source_signature(source_path)
+    directory = pyramid_dir(source_path)
+    try:
+        _prepare_dir(directory)
+    except OSError:
+        # Carpeta de la plantilla de solo lectura
+        directory = _fallback_dir(source_path)
+        _prepare_dir(directory)
+
+    image = open_image(source_path)
+    levels = _level_sizes(image.width, image.height, tile_size)
+    total = sum(lv.cols * lv.rows for lv in levels)
+    done = 0
+    for index, lv in enumerate(levels):
+        if index:
+            image = image.reduce(2)
+        level_dir = os.path.join(directory, str(index))
+        os.makedirs(level_dir)
+        for row in range(lv.rows):
+            for col in range(lv.cols):
+                box = (col * tile_size, row * tile_size,
+                       min((col + 1) * tile_size, lv.width), min((row + 1) * tile_size, lv.height))
+                image.crop(box).save(os.path.join(level_dir, f"{col}_{row}{TILE_EXTENSION}"),
+                                     compress_level=1)
+                done += 1
+                if on_progress:
+                    on_progress(done, total)
+
+    manifest = {
+        "version": PYRAMID_FORMAT_VERSION,
+        "source": signature,
+        "width": levels[0].width,
+        "height": levels[0].height,
+        "tile_size": tile_size,
+        "levels": [list(lv) for lv in levels],
+    }
+    atomic_write(os.path.join(directory, MANIFEST_NAME), json.dumps(manifest) + "\n")
+    return TilePyramid(directory, levels[0].width, levels[0].height, tile_size, levels)
+
+
+def get_pyramid(source_path, tile_size=TILE_SIZE, on_progress=None):
+    """
+    Devuelve la pirámide de una plantilla, generándola solo si no existe o está desactualizada.
+
+    Args:
+        source_path (str): Ruta de la imagen de la plantilla.
+        tile_size (int): Lado de las teselas en píxeles.
+        on_progress (callable, optional): Ver `build_pyramid`.
+
+    Returns:
+        TilePyramid: La pirámide lista para usar.
+    """
+    pyramid = TilePyramid.open(source_path, tile_size)
+    if pyramid is None:
+        pyramid = build_pyramid(source_path, tile_size, on_progress)
+    return pyramid
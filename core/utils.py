@@ -1,3 +1,8 @@
+# Fuente y tamaño de los elementos que no indican otros (layouts, proyectos y modelo)
+DEFAULT_FONT_NAME = "Arial"
+DEFAULT_FONT_SIZE = 10
+
+
 def snap_to_5(value: float) -> int:
     """
     Redondea un valor al múltiplo de 5 más cercano.
@@ -17,6 +22,23 @@ def snap_to_5(value: float) -> int:
     return round(value / 5) * 5
 
 
+def normalize_header(header) -> str:
+    """
+    Normaliza el nombre de una columna de Excel al formato de nombre de elemento.
+
+    Args:
+        header: Cabecera original (cualquier tipo convertible a texto).
+
+    Returns:
+        str: Cabecera sin espacios exteriores, en minúsculas y con '_' en lugar de espacios.
+
+    Ejemplo:
+        >>> normalize_header(" Tipo Asesor ")
+        'tipo_asesor'
+    """
+    return str(header).strip().lower().replace(" ", "_")
+
+
 def sync_text_layout(container_rect, text_item):
     """
     Sincroniza la posición y tamaño de un item de texto dentro de un rectángulo contenedor.
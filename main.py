@@ -7,11 +7,79 @@ Este módulo se encarga de:
 - Inicializar la aplicación Qt.
 - Crear la ventana principal.
 - Ejecutar el ciclo de eventos de la interfaz gráfica.
+
+Uso:
+    python main.py                      # Arranque normal
+    python main.py --startup-profile    # Muestra el tiempo de cada fase del arranque
 """
 
+import time
+
+_START = time.perf_counter()
+
+import argparse
 import sys
+from PyQt6.QtCore import QObject, QEvent, QTimer
 from PyQt6.QtWidgets import QApplication
-from ui.main_window import MainWindow
+
+
+class StartupProfile:
+    """
+    Cronómetro de las fases del arranque (desde la carga de main.py hasta el primer pintado).
+    """
+
+    def __init__(self, enabled=True):
+        """
+        Args:
+            enabled (bool): Si es False, `mark` y `report` no hacen nada.
+        """
+        self.enabled = enabled
+        self.phases = []
+        self._last = _START
+
+    def mark(self, phase):
+        """
+        Cierra la fase actual con el nombre indicado.
+
+        Args:
+            phase (str): Nombre de la fase que acaba de terminar.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def report(self, stream=None):
+        """
+        Imprime la tabla de fases con su duración en milisegundos.
+        """
+        if not self.enabled:
+            return
+        stream = stream or sys.stderr
+        width = max(len(name) for name, _ in self.phases)
+        print("Arranque (ms):", file=stream)
+        for name, elapsed in self.phases:
+            print(f"  {name:<{width}}  {elapsed * 1000:8.1f}", file=stream)
+        total = sum(elapsed for _, elapsed in self.phases)
+        print(f"  {'total':<{width}}  {total * 1000:8.1f}", file=stream)
+
+
+class _FirstPaintWatcher(QObject):
+    """
+    Filtro de eventos que detecta el primer pintado de un widget.
+    """
+
+    def __init__(self, callback):
+        super().__init__()
+        self._callback = callback
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and self._callback:
+            callback, self._callback = self._callback, None
+            # Después de que termine este pintado
+            QTimer.singleShot(0, callback)
+        return False
 
 
 def main() -> None:
@@ -24,15 +92,40 @@ def main() -> None:
     Raises:
         SystemExit: Se produce al cerrar la aplicación.
     """
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(prog="main.py", description="Layout Builder")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Imprime el tiempo de cada fase del arranque hasta el primer pintado")
+    args, qt_args = parser.parse_known_args()
+
+    profile = StartupProfile(enabled=args.startup_profile)
+    profile.mark("imports (Python + PyQt6)")
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    profile.mark("QApplication")
+
+    # La ventana se importa aquí para poder medir su coste de carga por separado
+    from ui.main_window import MainWindow
+    profile.mark("import ui.main_window")
 
     # Crear y mostrar la ventana principal
-    window = MainWindow()
+    window = MainWindow(on_phase=lambda name: profile.mark(f"MainWindow: {name}"))
+    profile.mark("MainWindow: resto")
+
+    if args.startup_profile:
+        def on_first_paint():
+            profile.mark("primer pintado")
+            profile.report()
+            window.view.viewport().removeEventFilter(watcher)
+
+        watcher = _FirstPaintWatcher(on_first_paint)
+        window.view.viewport().installEventFilter(watcher)
+
     window.showMaximized()
+    profile.mark("showMaximized")
 
     # Iniciar el ciclo de eventos
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,6 @@
+"""
+tests/
+
+Pruebas de la lógica de core/ y de las funciones puras de ui/ (sin ventanas).
+Uso: python -m pytest -q
+"""
@@ -0,0 +1,42 @@
+"""
+Pruebas del redimensionado de cajas por tiradores (resized_rect).
+"""
+
+import pytest
+from PyQt6.QtCore import QRectF
+
+from ui.items.box_item import MIN_SIZE, resized_rect
+
+RECT = QRectF(100, 100, 50, 40)
+
+
+def _tuple(rect):
+    return (rect.x(), rect.y(), rect.width(), rect.height())
+
+
+@pytest.mark.parametrize("handle, dx, dy, expected", [
+    ("right", 12, 0, (100, 100, 60, 40)),
+    ("bottom", 0, 23, (100, 100, 50, 65)),
+    ("left", -7, 0, (95, 100, 55, 40)),
+    ("top_left", 11, 9, (110, 110, 40, 30)),
+    ("bottom_right", 2, -2, (100, 100, 50, 40)),
+])
+def test_moved_edges_snap_to_grid(handle, dx, dy, expected):
+    assert _tuple(resized_rect(RECT, handle, dx, dy)) == expected
+
+
+def test_crossing_edges_normalizes_rect():
+    # El borde derecho pasa por encima del izquierdo
+    assert _tuple(resized_rect(RECT, "right", -80, 0)) == (70, 100, 30, 40)
+
+
+def test_too_small_rect_is_rejected():
+    # 5 px de ancho o de alto, por debajo de MIN_SIZE
+    assert resized_rect(RECT, "right", -45, 0) is None
+    assert resized_rect(RECT, "bottom", 0, -35) is None
+    assert resized_rect(RECT, "bottom", 0, -(40 - MIN_SIZE)).height() == MIN_SIZE + 2
+
+
+def test_original_rect_is_not_modified():
+    resized_rect(RECT, "top_left", 20, 20)
+    assert _tuple(RECT) == (100, 100, 50, 40)
@@ -0,0 +1,55 @@
+"""
+Pruebas de la exportación y de su lectura con core.layout_loader.
+"""
+
+import json
+import os
+
+import pytest
+
+from core.exporter import EXPORT_FORMATS, export_layout
+from core.font_cache import list_font_files
+from core.layout_loader import load_layout_file, parse_layout_config
+from core.layout_model import LayoutModel
+
+
+def _model():
+    font = (list_font_files() or ["Arial"])[0]
+    model = LayoutModel()
+    model.add_box("Nombre", 10, 20, 200, 30, font, 14)
+    model.add_box("Fecha", 12, 61, 98, 40, "Arial", 10)
+    model.add_label("Total", 300, 400, font, 9)
+    model.add_label("Firma", 5, 7)
+    return model
+
+
+def test_py_export_round_trip(tmp_path):
+    model = _model()
+    (py_path,) = export_layout(model, "plantilla.png", str(tmp_path), formats=("py",))
+    assert os.path.basename(py_path) == "plantilla_Coordenadas.py"
+    assert LayoutModel.from_layout(load_layout_file(py_path)).layout() == model.layout()
+
+
+def test_all_formats_are_written(tmp_path):
+    paths = export_layout(_model(), "plantilla.png", str(tmp_path), formats=EXPORT_FORMATS)
+    assert [os.path.splitext(p)[1] for p in paths] == [".py", ".txt", ".json", ".csv"]
+    with open(paths[2], encoding="utf-8") as f:
+        data = json.load(f)
+    assert set(data["boxes"]) == {"Nombre", "Fecha"}
+    assert set(data["labels"]) == {"Total", "Firma"}
+
+
+def test_unknown_format_writes_nothing(tmp_path):
+    with pytest.raises(ValueError):
+        export_layout(_model(), "plantilla.png", str(tmp_path), formats=("py", "xml"))
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("source", [
+    "import os\nos.system('true')",
+    "LAYOUT_CONFIG = {'boxes': __import__('os')}",
+    "LAYOUT_CONFIG = [",
+])
+def test_loader_rejects_non_layout_code(source):
+    with pytest.raises(ValueError):
+        parse_layout_config(source)
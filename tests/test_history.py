@@ -0,0 +1,138 @@
+"""
+Pruebas del historial de deshacer/rehacer (core/history.py) con un objetivo
+en memoria en lugar de la escena.
+"""
+
+import contextlib
+
+from core.history import History
+
+
+class FakeTarget:
+    """
+    Objetivo mínimo del historial: un diccionario por (tipo, nombre).
+    """
+
+    def __init__(self):
+        self.elements = {}
+
+    def batch(self, count):
+        return contextlib.nullcontext()
+
+    def set_geometry(self, kind, name, values):
+        self.elements[(kind, name)]["geometry"] = values
+
+    def text(self, kind, name):
+        return self.elements[(kind, name)]["text"]
+
+    def set_text(self, kind, name, text):
+        self.elements[(kind, name)]["text"] = text
+
+    def set_font(self, kind, name, font_name, font_size):
+        self.elements[(kind, name)]["font"] = (font_name, font_size)
+
+    def rename(self, kind, old_name, new_name):
+        self.elements[(kind, new_name)] = self.elements.pop((kind, old_name))
+
+    def create(self, record):
+        self.elements[record[:2]] = {"geometry": record[2:8], "font": record[8:10], "text": record[10]}
+
+    def remove(self, kind, name):
+        del self.elements[(kind, name)]
+
+
+def _record(name, x=0.0):
+    return ("box", name, 0.0, 0.0, x, 0.0, 50.0, 20.0, "Arial", 10, "")
+
+
+def _geometry(x):
+    return (0.0, 0.0, x, 0.0, 50.0, 20.0)
+
+
+def _setup():
+    target, history = FakeTarget(), History(merge_window=0)
+    target.create(_record("A"))
+    history.record_structure(added=[_record("A")])
+    return target, history
+
+
+def test_undo_redo_geometry_text_font_and_rename():
+    target, history = _setup()
+    history.record_geometry([("box", "A", _geometry(0.0), _geometry(15.0))])
+    target.set_geometry("box", "A", _geometry(15.0))
+    history.record_text("box", "A", "", "hola mundo")
+    target.set_text("box", "A", "hola mundo")
+    history.record_fonts([("box", "A", "Arial", 10, "Roboto.ttf", 12)])
+    target.set_font("box", "A", "Roboto.ttf", 12)
+    history.record_rename("box", "A", "B")
+    target.rename("box", "A", "B")
+    final = dict(target.elements[("box", "B")])
+
+    while history.undo(target):
+        pass
+    assert target.elements == {}
+    assert not history.can_undo()
+
+    history.redo(target)
+    assert target.elements[("box", "A")]["geometry"] == _geometry(0.0)
+    while history.redo(target):
+        pass
+    assert target.elements == {("box", "B"): final}
+
+
+def test_new_entry_clears_redo():
+    target, history = _setup()
+    history.record_text("box", "A", "", "x")
+    target.set_text("box", "A", "x")
+    history.undo(target)
+    assert history.can_redo()
+    history.record_text("box", "A", "", "y")
+    assert not history.can_redo()
+
+
+def test_merge_key_folds_consecutive_changes():
+    target, history = FakeTarget(), History(merge_window=60)
+    for step in range(5):
+        history.record_fonts([("box", "A", "Arial", 10 + step, "Arial", 11 + step)], merge=True)
+    assert len(history) == 1
+    target.create(_record("A"))
+    history.undo(target)
+    assert target.elements[("box", "A")]["font"] == ("Arial", 10)
+
+
+def test_entry_cap_drops_oldest_and_their_keys():
+    history = History(max_entries=10, merge_window=0)
+    for i in range(100):
+        history.record_geometry([("box", f"B{i}", _geometry(0.0), _geometry(5.0))])
+    stats = history.stats()
+    assert stats["undo"] == 10
+    assert stats["keys"] == 10
+
+
+def test_byte_cap_keeps_newest_entry():
+    history = History(max_bytes=2000, merge_window=0)
+    for i in range(50):
+        history.record_text("box", "A", "", "x" * (100 + i))
+    stats = history.stats()
+    assert stats["bytes"] <= 2000
+    assert stats["undo"] >= 1
+    assert stats["keys"] == 1
+
+    history.record_text("box", "A", "", "x" * 10000)
+    assert history.stats()["undo"] == 1
+
+
+def test_discarded_redo_releases_keys():
+    target = FakeTarget()
+    history = History(merge_window=0)
+    for name in ("A", "B", "C"):
+        target.create(_record(name))
+        history.record_geometry([("box", name, _geometry(0.0), _geometry(5.0))])
+    history.undo(target)
+    history.undo(target)
+    history.record_geometry([("box", "A", _geometry(5.0), _geometry(10.0))])
+    assert history.stats()["keys"] == 1
+
+    history.clear()
+    assert history.stats() == {"undo": 0, "redo": 0, "bytes": 0,
+                               "max_bytes": history.max_bytes, "keys": 0}
@@ -0,0 +1,78 @@
+"""
+Pruebas del modelo del layout: tablas internadas, renombrado y validación.
+"""
+
+from core.layout_model import KIND_BOX, KIND_LABEL, MIN_BOX_SIZE, Issue, LayoutModel
+
+
+def test_fonts_and_texts_are_interned_and_released():
+    model = LayoutModel()
+    for i in range(100):
+        model.add_box(f"B{i}", i, 0, 20, 20, "Roboto.ttf", 10, "igual")
+    assert len(model.fonts) == 1
+    assert len(model.texts) == 1
+
+    model.set_font(KIND_BOX, "B0", "Otra.ttf", 12)
+    model.set_text(KIND_BOX, "B0", "distinto")
+    assert len(model.fonts) == 2
+    assert len(model.texts) == 2
+
+    model.remove(KIND_BOX, "B0")
+    assert len(model.fonts) == 1
+    assert len(model.texts) == 1
+    model.clear()
+    assert len(model) == 0
+    assert len(model.fonts) == 0
+    assert len(model.texts) == 0
+
+
+def test_rename_keeps_creation_order():
+    model = LayoutModel()
+    for name in ("A", "B", "C"):
+        model.add_box(name, 0, 0, 20, 20)
+    assert model.rename(KIND_BOX, "B", "X")
+    assert list(model.boxes) == ["A", "X", "C"]
+    assert not model.rename(KIND_BOX, "A", "C")
+    assert not model.rename(KIND_BOX, "Z", "Y")
+
+
+def test_boxes_data_snaps_to_grid():
+    model = LayoutModel()
+    model.add_box("A", 12, 18, 51, 29)
+    data = model.boxes_data()["A"]
+    assert (data["x1"], data["y1"], data["x2"], data["y2"]) == (10, 20, 65, 45)
+
+
+def test_valid_layout_has_no_issues():
+    model = LayoutModel()
+    model.add_box("A", 0, 0, 100, 50, "Roboto.ttf", 12)
+    model.add_label("L", 10, 10)
+    assert model.validate(bounds=(100, 50), font_files=["Roboto.ttf"]) == []
+
+
+def test_validate_reports_each_problem():
+    model = LayoutModel()
+    model.add_box("Pequeña", 0, 0, MIN_BOX_SIZE - 1, 20)
+    model.add_box("Fuera", 90, 40, 20, 20)
+    model.add_box("Fuente", 0, 0, 20, 20, "NoExiste.ttf")
+    model.add_label("Fuera", -5, 10)
+    model.add_label("Tamaño", 10, 10)
+    model.set_font(KIND_LABEL, "Tamaño", "Arial", 0)
+
+    issues = model.validate(bounds=(100, 50), font_files=[])
+    assert [(i.kind, i.name) for i in issues] == [
+        (KIND_BOX, "Pequeña"),
+        (KIND_BOX, "Fuera"),
+        (KIND_BOX, "Fuente"),
+        (KIND_LABEL, "Fuera"),
+        (KIND_LABEL, "Fuera"),
+        (KIND_LABEL, "Tamaño"),
+    ]
+    assert all(isinstance(i, Issue) and i.message for i in issues)
+    assert "mismo nombre" in issues[3].message
+
+
+def test_validate_without_bounds_or_fonts_skips_those_checks():
+    model = LayoutModel()
+    model.add_box("A", -50, -50, 20, 20, "NoExiste.ttf")
+    assert model.validate() == []
@@ -0,0 +1,65 @@
+"""
+Pruebas del formato de proyecto nativo (.lbproj).
+"""
+
+import json
+import os
+import stat
+
+import pytest
+
+from core.layout_model import LayoutModel
+from core.project import PROJECT_FORMAT, build_project, load_project, save_project
+
+
+def _model():
+    model = LayoutModel()
+    model.add_box("Box1", 10.5, 20, 100, 50, "Roboto.ttf", 12, "hola\nmundo")
+    model.add_label("Label1", 30, 40, "Arial", 9, "ñandú")
+    return model
+
+
+def test_save_load_round_trip(tmp_path):
+    template = tmp_path / "plantilla.png"
+    path = tmp_path / "diseño.lbproj"
+    save_project(str(path), build_project(_model(), str(template)))
+
+    project = load_project(str(path))
+    assert project["template"] == str(template)
+    assert project["boxes"] == [{"name": "Box1", "x": 10.5, "y": 20, "w": 100, "h": 50,
+                                 "font_name": "Roboto.ttf", "font_size": 12, "text": "hola\nmundo"}]
+    assert project["labels"] == [{"name": "Label1", "x": 30, "y": 40,
+                                  "font_name": "Arial", "font_size": 9, "text": "ñandú"}]
+    assert LayoutModel.from_project(project).layout() == _model().layout()
+
+
+def test_template_path_is_stored_relative(tmp_path):
+    path = tmp_path / "p.lbproj"
+    save_project(str(path), build_project(_model(), str(tmp_path / "img" / "t.png")))
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["template"] == os.path.join("img", "t.png")
+
+
+@pytest.mark.skipif(os.name != "posix", reason="permisos POSIX")
+def test_saved_project_keeps_normal_file_mode(tmp_path):
+    path = tmp_path / "p.lbproj"
+    save_project(str(path), build_project(_model()))
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+
+    os.chmod(path, 0o640)
+    save_project(str(path), build_project(_model()))
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+
+@pytest.mark.parametrize("data", [
+    {"format": "otro", "version": 1},
+    {"format": PROJECT_FORMAT, "version": 0},
+    {"format": PROJECT_FORMAT, "version": 99},
+])
+def test_invalid_projects_are_rejected(tmp_path, data):
+    path = tmp_path / "p.lbproj"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_project(str(path))
@@ -0,0 +1,95 @@
+"""
+Pruebas del índice de anclas de alineación (SnapIndex), contrastadas con una
+búsqueda por fuerza bruta antes y después de fundir la capa de cambios.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from core import snap_index
+from core.snap_index import SnapIndex
+
+THRESHOLD = 6
+KINDS = 4
+
+
+def _anchors(rng):
+    xs = tuple((float(rng.randrange(0, 1000)), rng.randrange(KINDS)) for _ in range(3))
+    ys = tuple((float(rng.randrange(0, 1000)), rng.randrange(KINDS)) for _ in range(2))
+    return xs, ys
+
+
+def _brute(anchors, axis, probes, exclude, kinds):
+    """
+    Distancia mínima (o None) recorriendo todas las anclas.
+    """
+    best = None
+    for key, pair in anchors.items():
+        if key in exclude:
+            continue
+        for value, kind in pair[axis]:
+            if kinds is not None and not kinds[kind]:
+                continue
+            for probe in probes:
+                dist = abs(value - probe)
+                if dist <= THRESHOLD and (best is None or dist < best):
+                    best = dist
+    return best
+
+
+def _check(index, anchors, rng):
+    for _ in range(50):
+        probes = [float(rng.randrange(-10, 1010)) for _ in range(rng.randrange(1, 4))]
+        exclude = set(rng.sample(sorted(anchors), min(3, len(anchors)))) if anchors and rng.random() < 0.5 else set()
+        kinds = np.array([rng.random() < 0.6 for _ in range(KINDS)]) if rng.random() < 0.5 else None
+        for axis, nearest in ((0, index.nearest_x), (1, index.nearest_y)):
+            value, dist, probe = nearest(probes, THRESHOLD, exclude or None, kinds)
+            expected = _brute(anchors, axis, probes, exclude, kinds)
+            assert dist == expected
+            if value is not None:
+                assert abs(value - probes[probe]) == dist
+
+
+@pytest.mark.parametrize("compact_min", [4, 256])
+def test_nearest_matches_brute_force_across_compaction(monkeypatch, compact_min):
+    monkeypatch.setattr(snap_index, "COMPACT_MIN", compact_min)
+    rng = random.Random(compact_min)
+    index = SnapIndex()
+    anchors = {key: _anchors(rng) for key in range(200)}
+    index.load((key, xs, ys) for key, (xs, ys) in anchors.items())
+    _check(index, anchors, rng)
+
+    for step in range(300):
+        key = rng.randrange(260)
+        if key in anchors and rng.random() < 0.2:
+            index.remove(key)
+            del anchors[key]
+        else:
+            anchors[key] = _anchors(rng)
+            index.update(key, *anchors[key])
+        if step % 50 == 0:
+            _check(index, anchors, rng)
+    _check(index, anchors, rng)
+    assert len(index) == len(anchors)
+
+
+def test_values_filter_by_kind():
+    index = SnapIndex()
+    index.load([("a", ((10.0, 0), (20.0, 1)), ((5.0, 0),)),
+                ("b", ((10.0, 2),), ((7.0, 3),))])
+    index.update("c", ((30.0, 1),), ())
+    assert index.x_values() == [10.0, 20.0, 30.0]
+    assert index.x_values(np.array([False, True, False, False])) == [20.0, 30.0]
+    assert index.y_values(np.array([False, False, False, True])) == [7.0]
+    index.remove("a")
+    assert index.x_values() == [10.0, 30.0]
+
+
+def test_excluded_owner_is_ignored():
+    index = SnapIndex()
+    index.load([("a", ((100.0, 0),), ()), ("b", ((103.0, 0),), ())])
+    assert index.nearest_x([101.0], THRESHOLD) == (100.0, 1.0, 0)
+    assert index.nearest_x([101.0], THRESHOLD, exclude="a") == (103.0, 2.0, 0)
+    assert index.nearest_x([101.0], THRESHOLD, exclude={"a", "b"}) == (None, None, None)
@@ -7,13 +7,50 @@ así como el scroll automático (auto-panning) y el zoom.
 """
 
 from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsItem, QMessageBox
-from PyQt6.QtGui import QWheelEvent, QMouseEvent, QPen, QColor
+from PyQt6.QtGui import QWheelEvent, QMouseEvent, QPen, QColor, QPixmapCache
 from PyQt6.QtCore import Qt, QRectF, QPointF, QTimer
-from ui.items.box_item import BoxItem
+from ui.items.box_item import BoxItem, resized_rect
 from core.modes import Mode
 from ui.items.label_item import LabelItem
 from core.alignment_manager import AlignmentManager
+from core.change_bus import ChangeBus
+from core.spatial_index import SpatialIndex
 from core.utils import snap_to_5
+from ui.history_target import element_geometry, element_kind, element_record
+from contextlib import contextmanager
+
+# Límite de la caché de pixmaps de Qt, donde se guardan los textos ya rasterizados
+# (DeviceCoordinateCache de TextItem); el valor por defecto de Qt (10 MB) no llega
+# para una vista llena de cajas
+PIXMAP_CACHE_LIMIT_KB = 64 * 1024
+
+PEN_RUBBER_BAND = QPen(QColor(253, 158, 46), 1, Qt.PenStyle.DashLine)
+PEN_RUBBER_BAND.setCosmetic(True)
+
+
+class GroupTransform:
+    """
+    Estado de un arrastre que mueve o redimensiona a la vez varios elementos seleccionados.
+    """
+
+    def __init__(self, items, handle, origin, bounds):
+        """
+        Args:
+            items (list): Elementos del grupo.
+            handle (str): "center" para mover; un tirador de BoxItem para redimensionar.
+            origin (QPointF): Posición del ratón al empezar, en la escena.
+            bounds (tuple): Contorno del grupo (x1, y1, x2, y2) al empezar.
+        """
+        self.items = frozenset(items)
+        self.handle = handle
+        self.origin = QPointF(origin)
+        self.bounds = bounds
+        self.start = [(item, QPointF(item.pos()), QRectF(item.rect())) for item in items]
+        types = {type(item) for item in items}
+        # Un grupo homogéneo se alinea con su propio tipo, como un elemento suelto
+        self.target_type = types.pop() if len(types) == 1 else None
+        self.offset = None  # Último desplazamiento aplicado
+
 
 class GraphicsView(QGraphicsView):
     """
@@ -23,18 +60,20 @@ class GraphicsView(QGraphicsView):
     - Zoom con la rueda del ratón.
     - Paneo manual (arrastrar con el mouse en modo SELECT).
     - Creación de cajas y etiquetas.
+    - Selección múltiple (Ctrl+clic, Mayús+arrastrar) y movimiento/redimensionado en grupo.
     - Alineación automática mediante AlignmentManager.
+    - Publicación de cambios de los elementos en un ChangeBus (un aviso por fotograma).
     - Auto-panning cuando se arrastra cerca de los bordes.
     """
     
-    def __init__(self, box_manager, label_manager, list_widget, main_window=None, parent=None):
+    def __init__(self, box_manager, label_manager, list_view, main_window=None, parent=None):
         """
         Inicializa la vista y sus gestores.
         
         Args:
             box_manager (BoxManager): Referencia al gestor de cajas.
             label_manager (LabelManager): Referencia al gestor de etiquetas.
-            list_widget (QListWidget): Widget de la lista de elementos (histórico).
+            list_view (QListView): Vista de la lista de elementos.
             main_window (MainWindow, optional): Referencia a la ventana principal.
             parent (QWidget, optional): Widget padre.
         """
@@ -44,10 +83,11 @@ class GraphicsView(QGraphicsView):
         self.setResizeAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
         self.setMouseTracking(True)
         self._zoom = 0
+        QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), PIXMAP_CACHE_LIMIT_KB))
 
         self.box_manager = box_manager
         self.label_manager = label_manager
-        self.list_widget = list_widget
+        self.list_view = list_view
         self.main_window = main_window
 
         self.drawing = False
@@ -55,6 +95,14 @@ class GraphicsView(QGraphicsView):
         self.temp_rect = None
         self.mode = Mode.SELECT
         self.alignment_manager = AlignmentManager(self.scene())
+        self.change_bus = ChangeBus()
+        self._highlighted = []
+
+        # Registros tipados de elementos presentes en la escena
+        self.box_items = set()
+        self.label_items = set()
+        self.spatial_index = SpatialIndex()
+        self._bulk = False  # True durante una carga masiva (ver bulk_update)
 
         # Auto-panning
         self.pan_timer = QTimer()
@@ -68,6 +116,15 @@ class GraphicsView(QGraphicsView):
         self._panning = False
         self._pan_start_pos = None
 
+        # Geometría de los elementos al empezar un arrastre (ver _begin_gesture)
+        self._gesture = None
+
+        # Transformación en grupo y selección por área
+        self._group = None
+        self._geometry_batch = None  # Items anotados dentro de batch_geometry
+        self._rubber_band = None
+        self._rubber_origin = None
+
     def set_mode(self, mode):
         """
         Cambia el modo de operación actual y actualiza el cursor y estado de los items.
@@ -80,20 +137,377 @@ class GraphicsView(QGraphicsView):
         self.mode = mode
         self.setDragMode(QGraphicsView.DragMode.NoDrag)
 
-        for item in self.scene().items():
-            if isinstance(item, BoxItem):
-                item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
-            elif isinstance(item, LabelItem):
-                item.setFlag(
-                    QGraphicsItem.GraphicsItemFlag.ItemIsMovable,
-                    mode in (Mode.SELECT, Mode.TRANSFORM)
-                )
+        for item in self.box_items:
+            item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
+        labels_movable = mode in (Mode.SELECT, Mode.TRANSFORM)
+        for item in self.label_items:
+            item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, labels_movable)
 
         if mode in (Mode.SELECT, Mode.TRANSFORM):
             self.viewport().setCursor(Qt.CursorShape.OpenHandCursor)
         else:
             self.viewport().setCursor(Qt.CursorShape.CrossCursor)
 
+    def register_element(self, item):
+        """
+        Registra un Box o Label que acaba de entrar en la escena.
+
+        Lo añade al registro tipado, al índice de alineación y le aplica el
+        estado de movilidad del modo actual. Lo invocan los propios items.
+
+        Args:
+            item (BoxItem | LabelItem): Item añadido.
+        """
+        if isinstance(item, BoxItem):
+            self.box_items.add(item)
+            item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
+        elif isinstance(item, LabelItem):
+            self.label_items.add(item)
+            item.setFlag(
+                QGraphicsItem.GraphicsItemFlag.ItemIsMovable,
+                self.mode in (Mode.SELECT, Mode.TRANSFORM)
+            )
+        else:
+            return
+        if self._bulk:
+            return
+        self.alignment_manager.update_item(item)
+        self.spatial_index.insert(item, self._element_rect(item))
+
+    def unregister_element(self, item):
+        """
+        Retira un Box o Label que va a salir de la escena de todos los registros.
+
+        Args:
+            item (BoxItem | LabelItem): Item retirado.
+        """
+        self.box_items.discard(item)
+        self.label_items.discard(item)
+        if item in self._highlighted:
+            self._highlighted.remove(item)
+        if self._bulk:
+            return
+        self.alignment_manager.remove_item(item)
+        self.spatial_index.remove(item)
+
+    @contextmanager
+    def bulk_update(self):
+        """
+        Agrupa muchas altas/bajas de elementos en una sola actualización.
+
+        Mientras dura el bloque no se mantienen los índices de alineación ni el
+        espacial, el ChangeBus retiene sus avisos y el lienzo no se repinta. Al
+        salir se reconstruyen los índices una vez y se publica un único cambio
+        estructural. Admite anidamiento.
+
+        Ejemplo:
+            with view.bulk_update():
+                for ...:
+                    scene.addItem(item)
+        """
+        if self._bulk:
+            yield
+            return
+
+        self._bulk = True
+        self.change_bus.suspend()
+        self.viewport().setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self._bulk = False
+            self.rebuild_indexes()
+            self.viewport().setUpdatesEnabled(True)
+            self.viewport().update()
+            self.change_bus.notify_structure()
+            self.change_bus.resume()
+
+    def rebuild_indexes(self):
+        """
+        Reconstruye por completo los índices de alineación y espacial desde los registros.
+        """
+        items = self.elements()
+        self.alignment_manager.rebuild_index(items)
+        self.spatial_index.clear()
+        for item in items:
+            self.spatial_index.insert(item, self._element_rect(item))
+
+    @staticmethod
+    def _element_rect(item):
+        """
+        Devuelve el rectángulo (x1, y1, x2, y2) de un elemento en la escena.
+
+        Las etiquetas se representan como un punto (rectángulo de tamaño cero).
+        """
+        if isinstance(item, LabelItem):
+            x, y = item.get_center()
+            return (x, y, x, y)
+        rect = item.mapToScene(item.rect()).boundingRect()
+        return (rect.left(), rect.top(), rect.right(), rect.bottom())
+
+    def _manager(self, item):
+        """
+        Devuelve el gestor (BoxManager o LabelManager) de un elemento.
+        """
+        return self.label_manager if isinstance(item, LabelItem) else self.box_manager
+
+    def element_content_changed(self, item):
+        """
+        Lleva al modelo la fuente, el tamaño o el texto de un elemento (la llama TextItem).
+
+        En las etiquetas, la fuente también mueve la línea base que usa el snapping.
+
+        Args:
+            item (BoxItem | LabelItem): Elemento modificado.
+        """
+        self._manager(item).sync_content(item)
+        if isinstance(item, LabelItem) and not self._bulk and item in self.label_items:
+            self.alignment_manager.update_item(item)
+
+    def element_geometry_changed(self, item):
+        """
+        Propaga un cambio de geometría de un elemento a los índices y al bus de cambios.
+
+        Args:
+            item (BoxItem | LabelItem): Item movido o redimensionado.
+        """
+        # El modelo se actualiza siempre; los índices se reconstruyen al salir de bulk_update
+        record = self._manager(item).sync_geometry(item)
+        if self._bulk or (item not in self.box_items and item not in self.label_items):
+            return
+        if self._geometry_batch is not None:
+            self._geometry_batch.add(item)
+            return
+        self.alignment_manager.update_item(item)
+        self.spatial_index.insert(item, record.bounds() if record is not None else self._element_rect(item))
+        self.change_bus.notify(item.name)
+
+    @contextmanager
+    def batch_geometry(self, update_alignment=True):
+        """
+        Agrupa los cambios de geometría de muchos elementos en una sola actualización.
+
+        Dentro del bloque, element_geometry_changed solo anota los items. Al salir,
+        los índices de cada item se actualizan una vez y el bus recibe todos los
+        nombres en un único aviso.
+
+        Args:
+            update_alignment (bool): Si es False, no se actualiza el índice de
+                alineación (un grupo en movimiento queda excluido del snapping y se
+                reindexa al soltarlo, ver _end_group_transform).
+        """
+        if self._geometry_batch is not None:
+            yield
+            return
+        batch = self._geometry_batch = set()
+        try:
+            yield
+        finally:
+            self._geometry_batch = None
+            names = []
+            for item in batch:
+                record = self._manager(item).sync_geometry(item)
+                if item not in self.box_items and item not in self.label_items:
+                    continue
+                if update_alignment:
+                    self.alignment_manager.update_item(item)
+                self.spatial_index.insert(item, record.bounds() if record is not None else self._element_rect(item))
+                names.append(item.name)
+            self.change_bus.notify_many(names)
+
+    def selected_elements(self):
+        """
+        Devuelve los Box y Label seleccionados.
+        """
+        return [item for item in self.scene().selectedItems()
+                if item in self.box_items or item in self.label_items]
+
+    def _begin_group_transform(self, item, pos):
+        """
+        Empieza a mover o redimensionar la selección si el elemento pulsado forma parte de un grupo.
+
+        Args:
+            item (BoxItem | LabelItem): Elemento pulsado.
+            pos (QPointF): Posición del ratón en la escena.
+
+        Returns:
+            bool: True si la vista se encarga del arrastre.
+        """
+        selected = self.selected_elements()
+        if len(selected) < 2 or item not in selected:
+            return False
+        handle = "center"
+        if isinstance(item, BoxItem):
+            handle = item.get_resize_corner(item.mapFromScene(pos))
+            if handle is None:
+                return False
+            if handle != "center":
+                # Redimensionar: todas las cajas de la selección mueven el mismo borde
+                selected = [i for i in selected if isinstance(i, BoxItem)]
+        rects = [self._element_rect(i) for i in selected]
+        bounds = (min(r[0] for r in rects), min(r[1] for r in rects),
+                  max(r[2] for r in rects), max(r[3] for r in rects))
+        self._group = GroupTransform(selected, handle, pos, bounds)
+        # Las posiciones del grupo ya llegan ajustadas: sin itemChange por item mientras dura el arrastre
+        for i in selected:
+            i.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges, False)
+        return True
+
+    def _update_group_transform(self, pos):
+        """
+        Aplica al grupo el arrastre hasta `pos`.
+
+        El snapping se calcula una sola vez (contorno del grupo al mover, posición
+        del ratón al redimensionar) y las posiciones se aplican en bloque con un
+        único aviso al bus.
+        """
+        group = self._group
+        delta = pos - group.origin
+        if group.handle == "center":
+            x1, y1, x2, y2 = group.bounds
+            ax, ay = self.alignment_manager.snap_rect(
+                (x1 + delta.x(), y1 + delta.y(), x2 + delta.x(), y2 + delta.y()),
+                exclude=group.items, target_type=group.target_type)
+            offset = (snap_to_5(delta.x() + ax), snap_to_5(delta.y() + ay))
+            if offset == group.offset:
+                return
+            group.offset = offset
+            dx, dy = offset
+            with self.batch_geometry(update_alignment=False):
+                for item, start_pos, _ in group.start:
+                    item.setPos(start_pos.x() + dx, start_pos.y() + dy)
+                self._geometry_batch.update(group.items)
+            return
+
+        self.alignment_manager.update_guides(pos, group.items, target_type=BoxItem)
+        snapped = self.alignment_manager.get_snapped_pos(pos)
+        offset = (snapped.x() - group.origin.x(), snapped.y() - group.origin.y())
+        if offset == group.offset:
+            return
+        group.offset = offset
+        with self.batch_geometry(update_alignment=False):
+            for item, _, start_rect in group.start:
+                r = resized_rect(start_rect, group.handle, *offset)
+                if r is not None and r != item.rect():
+                    item.setRect(r)
+                    item.update_text_layout()
+                    self.element_geometry_changed(item)
+
+    def _end_group_transform(self):
+        """
+        Termina el arrastre en grupo y vuelve a indexar sus elementos para el snapping.
+        """
+        group, self._group = self._group, None
+        for item in group.items:
+            item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges, True)
+            if item in self.box_items or item in self.label_items:
+                self.alignment_manager.update_item(item)
+        self.alignment_manager.clear_guides()
+
+    def _history(self):
+        """
+        Devuelve el historial de deshacer/rehacer de la ventana, si existe.
+        """
+        return getattr(self.main_window, "history", None)
+
+    def _begin_gesture(self, item):
+        """
+        Guarda la geometría de los elementos que puede mover o redimensionar un arrastre.
+
+        El arrastre completo se registra en el historial como un solo paso al soltar
+        (ver _end_gesture), por muchos movimientos intermedios que tenga.
+
+        Args:
+            item (BoxItem | LabelItem): Elemento pulsado.
+        """
+        if self._history() is None:
+            return
+        items = {item}
+        items.update(i for i in self.scene().selectedItems()
+                     if i in self.box_items or i in self.label_items)
+        self._gesture = [(i, element_geometry(i)) for i in items]
+
+    def _end_gesture(self):
+        """
+        Registra en el historial los elementos cuya geometría cambió durante el arrastre.
+        """
+        gesture, self._gesture = self._gesture, None
+        if not gesture:
+            return
+        changes = []
+        for item, old in gesture:
+            if item.scene() is not self.scene():
+                continue
+            new = element_geometry(item)
+            if new != old:
+                changes.append((element_kind(item), item.name, old, new))
+        if changes:
+            self._history().record_geometry(changes)
+
+    def _record_created(self, item):
+        """
+        Registra en el historial un elemento recién creado por el usuario.
+        """
+        history = self._history()
+        if history is not None:
+            history.record_structure(added=[element_record(item)])
+
+    def element_text_edited(self, item, old_text, new_text):
+        """
+        Registra una sesión de edición de texto terminada (la llama TextItem).
+
+        Args:
+            item (BoxItem | LabelItem): Elemento editado.
+            old_text (str): Texto antes de la edición.
+            new_text (str): Texto después de la edición.
+        """
+        history = self._history()
+        if history is not None:
+            history.record_text(element_kind(item), item.name, old_text, new_text)
+        self.change_bus.notify(item.name)
+
+    def elements_in_rect(self, rect):
+        """
+        Devuelve los elementos contenidos por completo en un rectángulo de la escena.
+
+        Args:
+            rect (QRectF): Área de selección.
+
+        Returns:
+            list: Items BoxItem/LabelItem dentro del área.
+        """
+        return self.spatial_index.query_inside((rect.left(), rect.top(), rect.right(), rect.bottom()))
+
+    def overlapping_boxes(self, item):
+        """
+        Devuelve las cajas que se solapan con un elemento.
+        """
+        return self.spatial_index.overlapping(item, self.box_items)
+
+    def boxes_outside_template(self):
+        """
+        Devuelve las cajas que sobresalen del área de la escena (la plantilla).
+        """
+        r = self.scene().sceneRect()
+        bounds = (r.left(), r.top(), r.right(), r.bottom())
+        return [item for item in self.spatial_index.outside(bounds) if item in self.box_items]
+
+    def elements(self):
+        """
+        Devuelve todos los Box y Label registrados en la vista.
+
+        Returns:
+            list: Items de tipo BoxItem y LabelItem.
+        """
+        return list(self.box_items) + list(self.label_items)
+
+    def drawForeground(self, painter, rect):
+        """
+        Pinta las guías de alineación sobre la escena sin añadir items a la misma.
+        """
+        super().drawForeground(painter, rect)
+        self.alignment_manager.paint_guides(painter, rect)
+
     def wheelEvent(self, event: QWheelEvent):
         """
         Gestiona el zoom mediante la rueda del ratón, limitando el rango.
@@ -139,7 +553,7 @@ class GraphicsView(QGraphicsView):
 
             if self.mode in [Mode.CREATE, Mode.CREATE_LABEL]:
                 t_type = BoxItem if self.mode == Mode.CREATE else LabelItem
-                self.alignment_manager.update_guides(pos, self.scene().items(), target_type=t_type)
+                self.alignment_manager.update_guides(pos, target_type=t_type)
                 snapped_pos = self.alignment_manager.get_snapped_pos(pos)
                 grid_snapped_pos = QPointF(snap_to_5(snapped_pos.x()), snap_to_5(snapped_pos.y()))
 
@@ -172,17 +586,35 @@ class GraphicsView(QGraphicsView):
                     actual_name = self.main_window.label_manager.add_label(label_item, name=nombre_final)
                     label_item.name = actual_name
                     self.scene().addItem(label_item)
-                    if self.main_window:
-                        self.main_window.elements_panel.update_list()
+                    self.change_bus.notify_structure()
+                    self._record_created(label_item)
                     self.alignment_manager.clear_guides()
                     return
 
             if self.mode in (Mode.SELECT, Mode.TRANSFORM):
+                modifiers = event.modifiers()
                 if item:
                     self.setDragMode(QGraphicsView.DragMode.NoDrag)
+                    if modifiers & Qt.KeyboardModifier.ControlModifier:
+                        item.setSelected(not item.isSelected())
+                        event.accept()
+                        return
+                    if not item.isSelected():
+                        self.scene().clearSelection()
+                        item.setSelected(True)
+                    self._begin_gesture(item)
+                    if self._begin_group_transform(item, pos):
+                        event.accept()
+                        return
                     super().mousePressEvent(event)
                     return
+                elif modifiers & Qt.KeyboardModifier.ShiftModifier:
+                    self._rubber_origin = pos
+                    self._rubber_band = self.scene().addRect(QRectF(pos, pos), pen=PEN_RUBBER_BAND)
+                    event.accept()
+                    return
                 else:
+                    self.scene().clearSelection()
                     self._panning = True
                     self._pan_start_pos = event.position()
                     self.viewport().setCursor(Qt.CursorShape.ClosedHandCursor)
@@ -212,6 +644,17 @@ class GraphicsView(QGraphicsView):
             event.accept()
             return
 
+        if self._rubber_band is not None:
+            self._rubber_band.setRect(QRectF(self._rubber_origin, pos).normalized())
+            event.accept()
+            return
+
+        if self._group is not None:
+            self._update_group_transform(pos)
+            self._handle_auto_pan(event)
+            event.accept()
+            return
+
         self._update_during_movement(pos)
         super().mouseMoveEvent(event)
         self._handle_auto_pan(event)
@@ -232,6 +675,23 @@ class GraphicsView(QGraphicsView):
             self.last_mouse_pos = None
             return
 
+        if self._rubber_band is not None:
+            rect = self._rubber_band.rect()
+            self.scene().removeItem(self._rubber_band)
+            self._rubber_band = None
+            for element in self.elements_in_rect(rect):
+                element.setSelected(True)
+            event.accept()
+            return
+
+        if self._group is not None:
+            self._end_group_transform()
+            self._end_gesture()
+            self.pan_timer.stop()
+            self.last_mouse_pos = None
+            event.accept()
+            return
+
         if self.drawing and event.button() == Qt.MouseButton.LeftButton:
             self.drawing = False
             if self.temp_rect:
@@ -240,7 +700,7 @@ class GraphicsView(QGraphicsView):
             sel_name = self.main_window.header_selector.get_current_name()
             nombre_final = None if sel_name == "AUTO" else sel_name
 
-            self.alignment_manager.update_guides(pos, self.scene().items(), target_type=BoxItem)
+            self.alignment_manager.update_guides(pos, target_type=BoxItem)
             snapped_pos = self.alignment_manager.get_snapped_pos(pos)
 
             final_start = QPointF(snap_to_5(self.start_pos.x()), snap_to_5(self.start_pos.y()))
@@ -252,12 +712,12 @@ class GraphicsView(QGraphicsView):
             actual_name = self.box_manager.add_box(box_item, name=nombre_final)
             box_item.name = actual_name
             self.scene().addItem(box_item)
-
-            if self.main_window:
-                self.main_window.elements_panel.update_list()
+            self.change_bus.notify_structure()
+            self._record_created(box_item)
             self.temp_rect = None
 
         super().mouseReleaseEvent(event)
+        self._end_gesture()
         self.alignment_manager.clear_guides()
         self.pan_timer.stop()
         self.last_mouse_pos = None
@@ -313,7 +773,7 @@ class GraphicsView(QGraphicsView):
         Lógica interna para actualizar guías y rectángulos temporales según el movimiento.
         """
         if self.mode == Mode.CREATE:
-            self.alignment_manager.update_guides(pos, self.scene().items(), target_type=BoxItem)
+            self.alignment_manager.update_guides(pos, target_type=BoxItem)
             if self.drawing and self.temp_rect:
                 snapped_pos = self.alignment_manager.get_snapped_pos(pos)
                 grid_start = QPointF(snap_to_5(self.start_pos.x()), snap_to_5(self.start_pos.y()))
@@ -321,43 +781,63 @@ class GraphicsView(QGraphicsView):
                 self.temp_rect.setRect(QRectF(grid_start, grid_end).normalized())
 
         elif self.mode == Mode.CREATE_LABEL:
-            self.alignment_manager.update_guides(pos, self.scene().items(), target_type=LabelItem)
+            self.alignment_manager.update_guides(pos, target_type=LabelItem)
 
         elif self.mode in (Mode.TRANSFORM, Mode.SELECT):
+            if self._group is not None:
+                self._update_group_transform(pos)
+                return
             moving_items = self.scene().selectedItems()
-            if moving_items:
+            if moving_items and isinstance(moving_items[0], (BoxItem, LabelItem)):
                 self.alignment_manager.update_guides(
-                    pos, self.scene().items(), moving_items[0],
+                    pos, moving_items[0],
                     target_type=type(moving_items[0])
                 )
 
+    def _elements_named(self, name):
+        """
+        Devuelve los items (Box y/o Label) registrados con un nombre dado.
+        """
+        if name is None:
+            return []
+        found = []
+        box = self.box_manager.boxes.get(name)
+        if box is not None:
+            found.append(box)
+        label = self.label_manager.labels.get(name)
+        if label is not None:
+            found.append(label)
+        return found
+
+    @staticmethod
+    def _apply_highlight(item, highlighted):
+        """
+        Aplica (o quita) el estilo de resaltado a un único item.
+        """
+        # Un elemento seleccionado conserva el resaltado aunque deje de ser el activo
+        highlighted = highlighted or item.isSelected()
+        if isinstance(item, BoxItem):
+            # Respetar el estado 'editing' si está activo
+            if item._vis_state != "editing":
+                item.set_state("selected" if highlighted else "default")
+            item.setZValue(8 if highlighted else 1)
+        elif isinstance(item, LabelItem):
+            item.set_highlighted(highlighted)
+
     def highlight_item(self, name):
         """
-        Aplica colores de estado a todos los items para resaltar la selección.
+        Resalta el item seleccionado y restaura el anterior.
+        
+        Solo se actualizan el item previamente resaltado y el nuevo, por lo que el
+        coste no depende del número de elementos de la escena.
         
         Args:
             name (str): Nombre del item a seleccionar (None para deseleccionar todo).
         """
-        COLOR_BORDE_SEL_LABEL   = QColor(0, 0, 0)
-        COLOR_BORDE_LABEL       = QColor(255, 0, 0)
-
-        for item in self.scene().items():
-            if isinstance(item, BoxItem):
-                if item.name == name:
-                    # Solo cambiar a 'selected' si no está en edición
-                    if item._vis_state != "editing":
-                        item.set_state("selected")
-                    item.setZValue(8)
-                else:
-                    # Respetar el estado 'editing' si está activo
-                    if item._vis_state not in ("editing",):
-                        item.set_state("default")
-                    item.setZValue(1)
-
-            elif isinstance(item, LabelItem):
-                if item.name == name:
-                    item.setPen(QPen(COLOR_BORDE_SEL_LABEL, 1.2))
-                    item.setZValue(10)
-                else:
-                    item.setPen(QPen(COLOR_BORDE_LABEL, 0.5))
-                    item.setZValue(1)
+        new_items = self._elements_named(name)
+        for item in self._highlighted:
+            if item not in new_items:
+                self._apply_highlight(item, False)
+        for item in new_items:
+            self._apply_highlight(item, True)
+        self._highlighted = new_items
@@ -0,0 +1,159 @@
+"""
+ui/history_target.py
+
+Puente entre el historial de deshacer/rehacer (core.history) y la escena.
+
+Convierte los items en los valores compactos que guarda el historial
+(geometría, registros de alta/baja) y aplica de vuelta esos valores a los
+items y gestores al deshacer o rehacer.
+"""
+
+from contextlib import contextmanager
+from PyQt6.QtCore import QRectF
+from ui.items.box_item import BoxItem
+
+KIND_BOX = "box"
+KIND_LABEL = "label"
+
+# A partir de cuántos elementos se aplica un paso del historial como carga masiva
+BULK_THRESHOLD = 50
+
+
+def element_kind(item):
+    """
+    Devuelve el tipo de elemento que usa el historial ("box" o "label").
+    """
+    return KIND_BOX if isinstance(item, BoxItem) else KIND_LABEL
+
+
+def element_geometry(item):
+    """
+    Devuelve la geometría de un elemento tal como la guarda el historial.
+
+    Returns:
+        tuple: (px, py, rx, ry, rw, rh) — posición del item y rectángulo local.
+    """
+    pos, rect = item.pos(), item.rect()
+    return (pos.x(), pos.y(), rect.x(), rect.y(), rect.width(), rect.height())
+
+
+def element_record(item):
+    """
+    Devuelve el estado completo de un elemento para recrearlo (ver StructureDelta).
+
+    Returns:
+        tuple: (kind, name, px, py, rx, ry, rw, rh, font_name, font_size, text).
+    """
+    return ((element_kind(item), item.name) + element_geometry(item)
+            + (item.font_name, item.text_item.font().pointSize(), item.get_text()))
+
+
+class SceneHistoryTarget:
+    """
+    Aplica los pasos del historial a la escena y a los gestores de MainWindow.
+    """
+
+    def __init__(self, main_window):
+        """
+        Args:
+            main_window (MainWindow): Ventana con la vista y los gestores.
+        """
+        self.main_window = main_window
+
+    @property
+    def view(self):
+        return self.main_window.view
+
+    def _items(self, kind):
+        if kind == KIND_BOX:
+            return self.main_window.box_manager.boxes
+        return self.main_window.label_manager.labels
+
+    def _item(self, kind, name):
+        return self._items(kind).get(name)
+
+    @contextmanager
+    def batch(self, count):
+        """
+        Agrupa los cambios de un paso del historial en una sola actualización.
+
+        Args:
+            count (int): Elementos afectados; los pasos grandes se aplican como carga masiva.
+        """
+        if count >= BULK_THRESHOLD:
+            with self.view.bulk_update():
+                yield
+            return
+        bus = self.view.change_bus
+        bus.suspend()
+        try:
+            yield
+        finally:
+            bus.resume()
+
+    def set_geometry(self, kind, name, values):
+        item = self._item(kind, name)
+        if item is None:
+            return
+        px, py, rx, ry, rw, rh = values
+        if kind == KIND_BOX:
+            item.setRect(QRectF(rx, ry, rw, rh))
+            item.update_text_layout()
+        item.setPos(px, py)
+        self.view.element_geometry_changed(item)
+
+    def text(self, kind, name):
+        item = self._item(kind, name)
+        return item.get_text() if item is not None else ""
+
+    def set_text(self, kind, name, text):
+        item = self._item(kind, name)
+        if item is None:
+            return
+        item.text_item.setPlainText(text)
+        self.view.change_bus.notify(name)
+
+    def set_font(self, kind, name, font_name, font_size):
+        item = self._item(kind, name)
+        if item is None:
+            return
+        if item.font_name != font_name:
+            item.font_name = font_name
+            item.text_item.update_font_family(font_name)
+        item.text_item.set_font_size(font_size)
+        if kind == KIND_BOX:
+            item.update_text_layout()
+        self.view.change_bus.notify(name)
+
+    def rename(self, kind, old_name, new_name):
+        if kind == KIND_BOX:
+            self.main_window.box_manager.rename_box(old_name, new_name)
+        else:
+            self.main_window.label_manager.rename_label(old_name, new_name)
+        self.view.change_bus.notify_structure()
+
+    def create(self, record):
+        kind, name, px, py, rx, ry, rw, rh, font_name, font_size, text = record
+        window = self.main_window
+        if kind == KIND_BOX:
+            item = window.create_box(rx, ry, rw, rh, name, font_name=font_name,
+                                     text=text, font_size=font_size)
+            item.setPos(px, py)
+            window.box_manager.add_box(item, name)
+        else:
+            item = window.create_label(px, py, name, font_name=font_name,
+                                       text=text, font_size=font_size)
+            window.label_manager.add_label(item, name)
+        self.view.change_bus.notify_structure()
+
+    def remove(self, kind, name):
+        item = self._item(kind, name)
+        if item is None:
+            return
+        if item.scene():
+            item.scene().removeItem(item)
+        if kind == KIND_BOX:
+            self.main_window.box_manager.remove_box(name)
+        else:
+            self.main_window.label_manager.remove_label(name)
+        self.view.change_bus.notify_structure()
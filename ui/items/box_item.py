@@ -49,6 +49,31 @@ def _get_handle(pos, rect, margin=HANDLE_MARGIN):
 
     return None
 
+def resized_rect(rect, handle, dx, dy):
+    """
+    Aplica a un rectángulo el desplazamiento de un tirador de redimensionado.
+
+    Los bordes movidos se ajustan a la rejilla de 5 px.
+
+    Args:
+        rect (QRectF): Rectángulo al empezar el arrastre.
+        handle (str): Tirador ("left", "top_right", ...).
+        dx (float): Desplazamiento horizontal del ratón.
+        dy (float): Desplazamiento vertical del ratón.
+
+    Returns:
+        QRectF: Rectángulo normalizado, o None si queda por debajo del tamaño mínimo.
+    """
+    r = QRectF(rect)
+    if "left"   in handle: r.setLeft  (snap_to_5(rect.left()   + dx))
+    if "right"  in handle: r.setRight (snap_to_5(rect.right()  + dx))
+    if "top"    in handle: r.setTop   (snap_to_5(rect.top()    + dy))
+    if "bottom" in handle: r.setBottom(snap_to_5(rect.bottom() + dy))
+    r = r.normalized()
+    if r.width() >= MIN_SIZE and r.height() >= MIN_SIZE:
+        return r
+    return None
+
 def _cursor_for_handle(handle):
     cursors = {
         "top_left":     Qt.CursorShape.SizeFDiagCursor,
@@ -65,7 +90,7 @@ def _cursor_for_handle(handle):
 
 
 class BoxItem(QGraphicsRectItem):
-    def __init__(self, rect, name, font_name="Arial"):
+    def __init__(self, rect, name, font_name="Arial", text=None, font_size=None):
         super().__init__(rect)
         self.name = name
         self.font_name = font_name
@@ -76,8 +101,10 @@ class BoxItem(QGraphicsRectItem):
         )
         self._apply_state("default")
 
-        self.text_item = TextItem(text_mode="long", parent=self)
-        self.text_item.update_font_family(self.font_name)
+        self._layout_key = None   # Clave de la última maquetación del texto (ver TextItem.layout_key)
+        self._text_offset = 0.0   # Desplazamiento vertical del texto para centrarlo en la caja
+        self.text_item = TextItem(text_mode="long", parent=self, text=text,
+                                  font_name=self.font_name, font_size=font_size)
         self.update_text_layout()
 
         self._handle = None
@@ -108,7 +135,15 @@ class BoxItem(QGraphicsRectItem):
         self._sync_layout()
 
     def _sync_layout(self):
-        sync_text_layout(self.rect(), self.text_item)
+        rect = self.rect()
+        key = self.text_item.layout_key(rect.width(), rect.height())
+        if key == self._layout_key:
+            # Mismo texto, fuente y tamaño: el documento no cambia, solo se recoloca
+            self.text_item.setPos(rect.left(), rect.top() + self._text_offset)
+            return
+        sync_text_layout(rect, self.text_item)
+        self._layout_key = key
+        self._text_offset = self.text_item.pos().y() - rect.top()
 
     # ── Helpers ───────────────────────────────────────────────────────────
     def _view(self):
@@ -116,6 +151,12 @@ class BoxItem(QGraphicsRectItem):
             return self.scene().views()[0]
         return None
 
+    def _notify_geometry_changed(self):
+        """Propaga el cambio de geometría a los índices y al bus de la vista."""
+        v = self._view()
+        if v:
+            v.element_geometry_changed(self)
+
     def _in_interactive_mode(self):
         v = self._view()
         return v and v.mode in (Mode.TRANSFORM, Mode.SELECT)
@@ -126,6 +167,16 @@ class BoxItem(QGraphicsRectItem):
     def get_text(self):
         return self.text_item.toPlainText()
 
+    # ── Modelo (ver core.layout_model) ─────────────────────────────────────
+    def model_geometry(self):
+        """Rectángulo (x, y, w, h) de la caja en la escena."""
+        rect = self.mapRectToScene(self.rect())
+        return rect.x(), rect.y(), rect.width(), rect.height()
+
+    def model_content(self):
+        """Fuente, tamaño y texto (font_name, font_size, text)."""
+        return self.font_name, self.text_item.font().pointSize(), self.get_text()
+
     def set_name(self, new_name):
         self.name = new_name
 
@@ -176,32 +227,29 @@ class BoxItem(QGraphicsRectItem):
             return super().mouseMoveEvent(event)
 
         delta = event.scenePos() - self._drag_start
-        r = QRectF(self._rect_start)
         h = self._handle
 
         if h == "center":
+            # Se prueban los bordes y el centro de la caja, igual que al mover un grupo
             new_pos = self._pos_start + delta
-            self.setPos(snap_to_5(new_pos.x()), snap_to_5(new_pos.y()))
+            r = self._rect_start.translated(new_pos)
+            ax, ay = v.alignment_manager.snap_rect(
+                (r.left(), r.top(), r.right(), r.bottom()), exclude=self, target_type=BoxItem)
+            self.setPos(snap_to_5(new_pos.x() + ax), snap_to_5(new_pos.y() + ay))
         else:
             ref_point = event.scenePos()
-            v.alignment_manager.update_guides(ref_point, self.scene().items(), self, target_type=BoxItem)
+            v.alignment_manager.update_guides(ref_point, self, target_type=BoxItem)
             snapped_pos = v.alignment_manager.get_snapped_pos(ref_point)
 
             sdx = snapped_pos.x() - self._drag_start.x()
             sdy = snapped_pos.y() - self._drag_start.y()
 
-            if "left"   in h: r.setLeft  (snap_to_5(self._rect_start.left()   + sdx))
-            if "right"  in h: r.setRight (snap_to_5(self._rect_start.right()  + sdx))
-            if "top"    in h: r.setTop   (snap_to_5(self._rect_start.top()    + sdy))
-            if "bottom" in h: r.setBottom(snap_to_5(self._rect_start.bottom() + sdy))
-
-            r = r.normalized()
-            if r.width() >= MIN_SIZE and r.height() >= MIN_SIZE:
+            r = resized_rect(self._rect_start, h, sdx, sdy)
+            if r is not None:
                 self.setRect(r)
                 self.update_text_layout()
+                self._notify_geometry_changed()
 
-        if v.main_window:
-            v.main_window.elements_panel.update_list()
         event.accept()
 
     def mouseReleaseEvent(self, event):
@@ -227,9 +275,22 @@ class BoxItem(QGraphicsRectItem):
         if change == QGraphicsItem.GraphicsItemChange.ItemPositionChange:
             return QPointF(snap_to_5(value.x()), snap_to_5(value.y()))
 
+        if change == QGraphicsItem.GraphicsItemChange.ItemSelectedHasChanged:
+            if self._vis_state != "editing":
+                self._apply_state("selected" if value else "default")
+
         if change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged:
-            self.update_text_layout()
+            # El texto es hijo de la caja: una traslación no cambia su maquetación
+            self._notify_geometry_changed()
+
+        if change == QGraphicsItem.GraphicsItemChange.ItemSceneChange:
+            # Se llama antes de salir de la escena anterior: retirar de los registros
+            v = self._view()
+            if v:
+                v.unregister_element(self)
+
+        if change == QGraphicsItem.GraphicsItemChange.ItemSceneHasChanged:
             v = self._view()
-            if v and v.main_window:
-                v.main_window.elements_panel.update_list()
+            if v:
+                v.register_element(self)
         return super().itemChange(change, value)
\ No newline at end of file
@@ -11,6 +11,11 @@ from PyQt6.QtCore import Qt, QPointF
 from core.utils import snap_to_5, sync_text_layout
 from ui.items.text_item import TextItem
 
+# Pinceles compartidos por todas las etiquetas
+PEN_LABEL_DEFAULT  = QPen(QColor(255, 0, 0), 0.5)
+PEN_LABEL_SELECTED = QPen(QColor(0, 0, 0), 1.2)
+BRUSH_LABEL        = QBrush(QColor(255, 0, 0, 150))
+
 class LabelItem(QGraphicsEllipseItem):
     """
     Representa un punto de control con una etiqueta de texto asociada.
@@ -18,7 +23,7 @@ class LabelItem(QGraphicsEllipseItem):
     Es útil para marcar coordenadas específicas en el layout con un nombre descriptivo.
     """
     
-    def __init__(self, position, name, font_name="Arial"):
+    def __init__(self, position, name, font_name="Arial", text=None, font_size=None):
         """
         Inicializa la etiqueta.
         
@@ -26,6 +31,8 @@ class LabelItem(QGraphicsEllipseItem):
             position (QPointF): Posición inicial en la escena.
             name (str): Nombre identificador de la etiqueta.
             font_name (str): Nombre del archivo de fuente a utilizar.
+            text (str, optional): Texto inicial (por defecto, un texto de ejemplo).
+            font_size (int, optional): Tamaño inicial de la fuente en puntos.
         """
         size = 5
         super().__init__(-size/2, -size/2, size, size)
@@ -33,11 +40,11 @@ class LabelItem(QGraphicsEllipseItem):
         self.font_name = font_name
         self.setPos(position.x(), position.y())
 
-        self.setBrush(QBrush(QColor(255, 0, 0, 150)))
-        self.setPen(QPen(QColor(255, 0, 0), 0.5))
+        self.setBrush(BRUSH_LABEL)
+        self.setPen(PEN_LABEL_DEFAULT)
 
-        self.text_item = TextItem(text_mode="short", parent=self)
-        self.text_item.update_font_family(self.font_name)
+        self.text_item = TextItem(text_mode="short", parent=self, text=text,
+                                  font_name=self.font_name, font_size=font_size)
         self.text_item.set_simple()
         self.text_item.setPos(0, 0)
 
@@ -48,6 +55,16 @@ class LabelItem(QGraphicsEllipseItem):
         )
         self.setAcceptHoverEvents(True)
 
+    def set_highlighted(self, highlighted):
+        """
+        Aplica el estilo de etiqueta resaltada o normal.
+
+        Args:
+            highlighted (bool): True para resaltar la etiqueta.
+        """
+        self.setPen(PEN_LABEL_SELECTED if highlighted else PEN_LABEL_DEFAULT)
+        self.setZValue(10 if highlighted else 1)
+
     def mouseDoubleClickEvent(self, event):
         """
         Activa el modo de edición del texto asociado al hacer doble clic.
@@ -75,13 +92,40 @@ class LabelItem(QGraphicsEllipseItem):
             return QPointF(snapped_x, snapped_y)
 
         if change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged:
-            if self.scene() and self.scene().views():
-                view = self.scene().views()[0]
-                if hasattr(view, "main_window") and view.main_window:
-                    view.main_window.elements_panel.update_list()
+            self._notify_geometry_changed()
+
+        if change == QGraphicsItem.GraphicsItemChange.ItemSelectedHasChanged:
+            self.set_highlighted(bool(value))
+
+        if change == QGraphicsItem.GraphicsItemChange.ItemSceneChange:
+            # Antes de abandonar la escena anterior: retirar de los registros de la vista
+            view = self._view()
+            if view and hasattr(view, "unregister_element"):
+                view.unregister_element(self)
+
+        if change == QGraphicsItem.GraphicsItemChange.ItemSceneHasChanged:
+            view = self._view()
+            if view and hasattr(view, "register_element"):
+                view.register_element(self)
                     
         return super().itemChange(change, value)
 
+    def _view(self):
+        """
+        Devuelve la vista principal que muestra la escena del item, si existe.
+        """
+        if self.scene() and self.scene().views():
+            return self.scene().views()[0]
+        return None
+
+    def _notify_geometry_changed(self):
+        """
+        Propaga el cambio de posición a los índices y al bus de la vista.
+        """
+        view = self._view()
+        if view and hasattr(view, "element_geometry_changed"):
+            view.element_geometry_changed(self)
+
     def get_text(self):
         """
         Devuelve el contenido textual de la etiqueta.
@@ -105,3 +149,21 @@ class LabelItem(QGraphicsEllipseItem):
             tuple: (x, y) en coordenadas de la escena.
         """
         return self.pos().x(), self.pos().y()
+
+    def model_geometry(self):
+        """
+        Devuelve la posición de la etiqueta tal como la guarda LayoutModel.
+
+        Returns:
+            tuple: (x, y) en coordenadas de la escena.
+        """
+        return self.get_center()
+
+    def model_content(self):
+        """
+        Devuelve la fuente, el tamaño y el texto tal como los guarda LayoutModel.
+
+        Returns:
+            tuple: (font_name, font_size, text).
+        """
+        return self.font_name, self.text_item.font().pointSize(), self.get_text()
@@ -5,10 +5,21 @@ Componente de texto editable basado en QGraphicsTextItem.
 Gestiona la carga de fuentes personalizadas y la interacción con el usuario.
 """
 
-import os
-from PyQt6.QtWidgets import QGraphicsTextItem
-from PyQt6.QtGui import QTextOption, QPen, QColor, QFont, QFontDatabase
-from PyQt6.QtCore import Qt, QRectF
+import math
+from PyQt6.QtWidgets import QGraphicsTextItem, QGraphicsItem
+from PyQt6.QtGui import QTextOption, QPen, QColor, QFont, QFontMetricsF
+from PyQt6.QtCore import Qt, QRectF, QTimer
+from core.font_registry import get_font_registry
+
+PEN_TEXT_BORDER = QPen(QColor(154, 199, 200, 60), 0.8, Qt.PenStyle.DashLine)
+COLOR_LOD_BAR = QColor(62, 135, 171, 90)
+
+
+def _qt_weight(weight):
+    """
+    Convierte un peso OpenType (1-1000) al QFont.Weight más cercano (100-900).
+    """
+    return QFont.Weight(min(900, max(100, int(round(weight / 100.0)) * 100)))
 
 class TextItem(QGraphicsTextItem):
     """
@@ -18,35 +29,59 @@ class TextItem(QGraphicsTextItem):
     TTF/OTF y modo de edición activable por el padre.
     """
     
-    _loaded_fonts = {}  # Cache de {path: family_name} para evitar recargas constantes
+    # Por debajo de esta altura de línea en pantalla (px) el texto se pinta como barras grises
+    lod_min_pixel_size = 4.0
 
-    def __init__(self, text_mode="short", parent=None):
+    def __init__(self, text_mode="short", parent=None, text=None, font_name=None, font_size=None):
         """
         Inicializa el item de texto.
         
+        La fuente se configura antes de asignar el contenido para que el documento
+        se maquete una sola vez.
+
         Args:
             text_mode (str): "short" para labels, "long" para bloques de texto.
             parent (QGraphicsItem): Item contenedor (BoxItem o LabelItem).
+            text (str, optional): Contenido inicial (por defecto, un texto de ejemplo).
+            font_name (str, optional): Archivo de fuente de /fonts a aplicar.
+            font_size (int, optional): Tamaño inicial en puntos (por defecto 10).
         """
-        content = "Lorem" if text_mode == "short" else "Lorem ipsum dolor sit amet, consectetur adipiscing elit. Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat."
-        super().__init__(content, parent)
+        if text is None:
+            text = "Lorem" if text_mode == "short" else "Lorem ipsum dolor sit amet, consectetur adipiscing elit. Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat."
+        super().__init__(parent)
+
+        self._show_border = True
+        self._max_height = 1000
+        self._editing = False
+        self._text_before_edit = None  # Texto al empezar la edición (para el historial)
+        self._justified = False
+        # Revisiones del texto y de la fuente para la clave de maquetación (ver layout_key)
+        self._text_rev = 0
+        self._font_rev = 0
+        self._content_change_pending = False
+        self._bounding_rect = None  # boundingRect() memorizado; Qt lo consulta varias veces por fotograma
         
         self.setDefaultTextColor(QColor("#3e87ab"))
+        # El texto se rasteriza una vez por escala de zoom y se reutiliza al desplazar la vista;
+        # Qt descarta la caché en cada update() (edición, cambio de fuente o de ancho)
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
         # Edición desactivada por defecto — se activa solo con doble clic
         self.setTextInteractionFlags(Qt.TextInteractionFlag.NoTextInteraction)
         self.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
         self.document().setDocumentMargin(0)
-        
-        # Conectar cambio de texto para notificar al padre si es necesario
-        self.document().contentsChanged.connect(self._on_content_changed)
+        # Se conecta después que el de QGraphicsTextItem, que aún necesita el rectángulo anterior
+        self.document().documentLayout().documentSizeChanged.connect(self._invalidate_bounding_rect)
         
         # Fuente por defecto suave
-        font = QFont("Segoe UI", 10)
+        font = QFont("Segoe UI", max(4, int(font_size)) if font_size else 10)
         self.setFont(font)
-        
-        self._show_border = True
-        self._max_height = 1000
-        self._editing = False
+        if font_name:
+            self.update_font_family(font_name)
+
+        self.setPlainText(text)
+
+        # Conectar cambio de texto para notificar al padre si es necesario
+        self.document().contentsChanged.connect(self._on_content_changed)
 
     def start_editing(self):
         """
@@ -55,6 +90,9 @@ class TextItem(QGraphicsTextItem):
         if self._editing:
             return
         self._editing = True
+        self._text_before_edit = self.toPlainText()
+        # El cursor parpadeante invalidaría la caché en cada ciclo
+        self.setCacheMode(QGraphicsItem.CacheMode.NoCache)
         self.setTextInteractionFlags(Qt.TextInteractionFlag.TextEditorInteraction)
         self.setAcceptedMouseButtons(Qt.MouseButton.AllButtons)
         self.setFocus(Qt.FocusReason.MouseFocusReason)
@@ -72,11 +110,21 @@ class TextItem(QGraphicsTextItem):
         cursor.clearSelection()
         self.setTextCursor(cursor)
         self.clearFocus()
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
         # Notificar al padre (BoxItem) para que restaure su color
         parent = self.parentItem()
         if parent and hasattr(parent, 'on_text_editing_stopped'):
             parent.on_text_editing_stopped()
 
+        # Toda la sesión de edición se registra en el historial como un único cambio
+        before, self._text_before_edit = self._text_before_edit, None
+        text = self.toPlainText()
+        scene = self.scene()
+        if parent and scene and scene.views() and before is not None and before != text:
+            view = scene.views()[0]
+            if hasattr(view, "element_text_edited"):
+                view.element_text_edited(parent, before, text)
+
     def update_font_family(self, font_name):
         """
         Carga una fuente desde la carpeta /fonts y la aplica al item.
@@ -91,32 +139,19 @@ class TextItem(QGraphicsTextItem):
             font = self.font()
             font.setFamily("Arial")
             font.setBold(False)
+            font.setItalic(False)
             self.setFont(font)
             return True
 
-        fonts_dir = os.path.join(os.path.dirname(__file__), "..", "..", "fonts")
-        font_path = os.path.normpath(os.path.join(fonts_dir, font_name))
-
-        family = None
-        if font_path in TextItem._loaded_fonts:
-            family = TextItem._loaded_fonts[font_path]
-        else:
-            if os.path.exists(font_path):
-                font_id = QFontDatabase.addApplicationFont(font_path)
-                if font_id != -1:
-                    families = QFontDatabase.applicationFontFamilies(font_id)
-                    if families:
-                        family = families[0]
-                        TextItem._loaded_fonts[font_path] = family
-
+        registry = get_font_registry()
+        family = registry.qt_family(font_name)
         if family:
+            info = registry.info(font_name)
             font = self.font()
             font.setFamily(family)
-            
-            # Intentar detectar si es negrita por el nombre del archivo
-            is_bold = "bold" in font_name.lower()
-            font.setBold(is_bold)
-            
+            # Peso y estilo reales del archivo (tabla OS/2), para elegir la variante correcta de la familia
+            font.setWeight(_qt_weight(info.weight))
+            font.setItalic(info.italic)
             self.setFont(font)
             return True
         
@@ -124,6 +159,7 @@ class TextItem(QGraphicsTextItem):
         font = self.font()
         font.setFamily("Arial")
         font.setBold(False)
+        font.setItalic(False)
         self.setFont(font)
         return False
 
@@ -132,25 +168,39 @@ class TextItem(QGraphicsTextItem):
         Define el área rectangular del item, limitando la altura al contenedor padre.
         
         Esto evita que el texto 'robe' eventos de mouse fuera de su contenedor.
+        El resultado se memoriza hasta que cambia el tamaño del documento o la altura máxima.
         """
-        br = super().boundingRect()
-        w = br.width() if br.width() > 0 else (self.textWidth() if self.textWidth() > 0 else 200)
-        constrained_h = min(br.height(), self._max_height)
-        return QRectF(br.x(), br.y(), w, constrained_h)
+        if self._bounding_rect is None:
+            br = super().boundingRect()
+            w = br.width() if br.width() > 0 else (self.textWidth() if self.textWidth() > 0 else 200)
+            constrained_h = min(br.height(), self._max_height)
+            self._bounding_rect = QRectF(br.x(), br.y(), w, constrained_h)
+        return self._bounding_rect
+
+    def _invalidate_bounding_rect(self, *args):
+        self._bounding_rect = None
 
     def paint(self, painter, option, widget):
         """
         Dibuja el texto y opcionalmente un borde punteado de guía.
         
         Implementa recorte (clipping) para asegurar que el texto no se salga del box.
+        Con poco zoom, cuando las líneas serían ilegibles, se pintan barras grises
+        en su lugar (ver `lod_min_pixel_size`).
         """
         clip_w = self.textWidth() if self.textWidth() > 0 else 2000
         clip_rect = QRectF(0, 0, clip_w, self._max_height)
 
         if self._show_border:
-            painter.setPen(QPen(QColor(154, 199, 200, 60), 0.8, Qt.PenStyle.DashLine))
+            painter.setPen(PEN_TEXT_BORDER)
             painter.drawRect(clip_rect)
 
+        line_height = QFontMetricsF(self.font()).lineSpacing()
+        scale = option.levelOfDetailFromTransform(painter.worldTransform())
+        if line_height * scale < self.lod_min_pixel_size:
+            self._paint_lod_bars(painter, clip_rect, line_height)
+            return
+
         painter.save()
         painter.setClipRect(clip_rect)
 
@@ -163,6 +213,23 @@ class TextItem(QGraphicsTextItem):
 
         painter.restore()
 
+    def _paint_lod_bars(self, painter, clip_rect, line_height):
+        """
+        Pinta una barra por línea de texto en lugar de los glifos.
+        """
+        doc_size = self.document().size()
+        width = min(doc_size.width(), clip_rect.width())
+        lines = math.ceil(min(doc_size.height(), clip_rect.height()) / line_height)
+        if lines <= 0 or width <= 0:
+            return
+        bar_h = line_height * 0.6
+        bars = [QRectF(0, i * line_height + (line_height - bar_h) / 2, width, bar_h) for i in range(lines)]
+        if lines > 1:
+            # La última línea de un párrafo justificado suele ser más corta
+            bars[-1].setWidth(width * 0.6)
+        for bar in bars:
+            painter.fillRect(bar, COLOR_LOD_BAR)
+
     def set_simple(self):
         """
         Configura el item para texto simple (alineado a la izquierda, sin ancho fijo).
@@ -171,28 +238,90 @@ class TextItem(QGraphicsTextItem):
         option = QTextOption()
         option.setAlignment(Qt.AlignmentFlag.AlignLeft)
         self.document().setDefaultTextOption(option)
+        self._justified = False
 
     def set_justified(self, width, height=None):
         """
         Configura el item para texto justificado con un ancho específico.
-        
+
+        Cambiar el ancho o las opciones de texto obliga a maquetar de nuevo todo el
+        documento, así que solo se aplica lo que realmente ha cambiado.
+
         Args:
             width (float): Ancho del bloque de texto.
             height (float, optional): Altura máxima para limitar el recorte visual.
         """
-        self.setTextWidth(width)
-        if height:
+        if self.textWidth() != width:
+            self.setTextWidth(width)
+        if height and height != self._max_height:
+            # Cambia el recorte y el boundingRect: invalida la geometría y la caché
+            self.prepareGeometryChange()
             self._max_height = height
-        option = QTextOption()
-        option.setAlignment(Qt.AlignmentFlag.AlignJustify)
-        option.setWrapMode(QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere)
-        self.document().setDefaultTextOption(option)
+            self._bounding_rect = None
+        if not self._justified:
+            option = QTextOption()
+            option.setAlignment(Qt.AlignmentFlag.AlignJustify)
+            option.setWrapMode(QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere)
+            self.document().setDefaultTextOption(option)
+            self._justified = True
+
+    def layout_key(self, width, height):
+        """
+        Clave de la maquetación del texto dentro de un contenedor.
+
+        Dos llamadas con la misma clave producen el mismo documento maquetado, por lo
+        que el contenedor puede reutilizar el resultado anterior.
+
+        Args:
+            width (float): Ancho del contenedor.
+            height (float): Altura máxima del contenedor.
+
+        Returns:
+            tuple: (revisión del texto, revisión de la fuente, ancho, altura).
+        """
+        return self._text_rev, self._font_rev, width, height
+
+    def setFont(self, font):
+        """
+        Aplica la fuente y registra el cambio en la clave de maquetación.
+        """
+        super().setFont(font)
+        self._font_rev += 1
+        self._notify_model()
 
     def _on_content_changed(self):
         """
-        Notifica al item padre cuando el texto interno ha sido modificado.
+        Registra la modificación del texto y avisa al padre una sola vez por ciclo de eventos.
+
+        Una edición puede emitir varios `contentsChanged` seguidos (pegar, deshacer,
+        reemplazar la selección); el padre solo necesita recolocar el texto al final.
+        """
+        self._text_rev += 1
+        self._notify_model()
+        if not self._content_change_pending:
+            self._content_change_pending = True
+            QTimer.singleShot(0, self._flush_content_changed)
+
+    def _notify_model(self):
+        """
+        Pide a la vista que lleve la fuente y el texto del padre al modelo del layout.
+
+        Mientras el padre no está en una escena (construcción) no hay nada que sincronizar.
         """
         parent = self.parentItem()
+        scene = self.scene()
+        if parent is None or scene is None or not scene.views():
+            return
+        view = scene.views()[0]
+        if hasattr(view, "element_content_changed"):
+            view.element_content_changed(parent)
+
+    def _flush_content_changed(self):
+        """
+        Notifica al item padre que el texto interno ha sido modificado.
+        """
+        self._content_change_pending = False
+        parent = self.parentItem()
         if parent and hasattr(parent, "update_text_layout"):
             parent.update_text_layout()
 
@@ -213,9 +342,23 @@ class TextItem(QGraphicsTextItem):
         Returns:
             int: El nuevo tamaño de fuente resultante.
         """
-        self.prepareGeometryChange()
+        return self.set_font_size(self.font().pointSize() + delta)
+
+    def set_font_size(self, size):
+        """
+        Aplica un tamaño de fuente concreto (mínimo 4 puntos).
+
+        Args:
+            size (int): Tamaño en puntos.
+
+        Returns:
+            int: El tamaño de fuente aplicado.
+        """
         font = self.font()
-        new_size = max(4, font.pointSize() + delta)
-        font.setPointSize(new_size)
-        self.setFont(font)
-        return new_size
+        size = max(4, int(size))
+        if font.pointSize() != size:
+            self.prepareGeometryChange()
+            font.setPointSize(size)
+            self.setFont(font)
+        return size
+
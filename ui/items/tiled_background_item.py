@@ -0,0 +1,117 @@
+"""
+ui/items/tiled_background_item.py
+
+Fondo de plantilla pintado por teselas con nivel de detalle.
+
+Sustituye a QGraphicsPixmapItem para plantillas muy grandes: en cada pintado
+solo se cargan las teselas visibles del nivel de la pirámide que corresponde
+al zoom actual (ver core.tile_pyramid). Las teselas cargadas se guardan en una
+caché LRU limitada por memoria.
+"""
+
+from collections import OrderedDict
+from PyQt6.QtWidgets import QGraphicsItem
+from PyQt6.QtGui import QPixmap, QPainter
+from PyQt6.QtCore import QRectF
+
+# Memoria máxima de teselas decodificadas por fondo
+DEFAULT_TILE_MEMORY = 256 * 1024 * 1024
+
+
+class TiledBackgroundItem(QGraphicsItem):
+    """
+    Item de fondo que pinta una TilePyramid.
+
+    Su rectángulo es el de la plantilla a resolución completa, así que la escena
+    y las coordenadas de los elementos no cambian respecto a un QGraphicsPixmapItem.
+    """
+
+    def __init__(self, pyramid, max_bytes=DEFAULT_TILE_MEMORY, parent=None):
+        """
+        Inicializa el fondo.
+
+        Args:
+            pyramid (TilePyramid): Pirámide de teselas de la plantilla.
+            max_bytes (int): Memoria máxima de teselas cargadas.
+            parent (QGraphicsItem, optional): Item padre.
+        """
+        super().__init__(parent)
+        self.pyramid = pyramid
+        self.max_bytes = max_bytes
+        self._tiles = OrderedDict()  # (nivel, col, fila) -> QPixmap
+        self._bytes = 0
+        self._rect = QRectF(0, 0, pyramid.width, pyramid.height)
+        # Necesario para recibir exposedRect en paint()
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+
+    def boundingRect(self):
+        return self._rect
+
+    def _tile(self, level, col, row):
+        """
+        Devuelve una tesela, cargándola de disco si no está en caché.
+        """
+        key = (level, col, row)
+        pixmap = self._tiles.get(key)
+        if pixmap is not None:
+            self._tiles.move_to_end(key)
+            return pixmap
+
+        pixmap = QPixmap(self.pyramid.tile_path(level, col, row))
+        if pixmap.isNull():
+            return None
+        self._tiles[key] = pixmap
+        self._bytes += pixmap.width() * pixmap.height() * 4
+        self._evict()
+        return pixmap
+
+    def _evict(self):
+        """
+        Descarta las teselas usadas hace más tiempo hasta respetar el límite de memoria.
+
+        Siempre se conserva la última tesela cargada.
+        """
+        while self._bytes > self.max_bytes and len(self._tiles) > 1:
+            _, pixmap = self._tiles.popitem(last=False)
+            self._bytes -= pixmap.width() * pixmap.height() * 4
+
+    def clear_cache(self):
+        """
+        Libera todas las teselas cargadas.
+        """
+        self._tiles.clear()
+        self._bytes = 0
+
+    def cache_stats(self):
+        """
+        Devuelve la ocupación de la caché de teselas.
+
+        Returns:
+            dict: {'tiles', 'bytes'}.
+        """
+        return {"tiles": len(self._tiles), "bytes": self._bytes}
+
+    def paint(self, painter, option, widget=None):
+        """
+        Pinta las teselas visibles del nivel que corresponde al zoom actual.
+        """
+        pyramid = self.pyramid
+        scale = option.levelOfDetailFromTransform(painter.worldTransform())
+        level = pyramid.level_for_scale(scale)
+        exposed = option.exposedRect.intersected(self._rect)
+        if exposed.isEmpty():
+            return
+
+        sx, sy = pyramid.level_scale(level)
+        step_x, step_y = pyramid.tile_size * sx, pyramid.tile_size * sy
+        painter.save()
+        # Al alejar se suaviza el reescalado; al acercar se ven los píxeles, como con QGraphicsPixmapItem
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, scale < 1)
+        for col, row in pyramid.tiles_in_rect(level, exposed.left(), exposed.top(),
+                                              exposed.right(), exposed.bottom()):
+            pixmap = self._tile(level, col, row)
+            if pixmap is None:
+                continue
+            target = QRectF(col * step_x, row * step_y, pixmap.width() * sx, pixmap.height() * sy)
+            painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+        painter.restore()
@@ -5,19 +5,25 @@ Ventana principal de la aplicación Layout Builder.
 Orquesta la comunicación entre los paneles, la vista (Canvas) y los gestores de datos.
 """
 
-from PyQt6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QGraphicsPixmapItem, QLabel, QGraphicsTextItem, QMessageBox
-from PyQt6.QtGui import QPixmap, QFont, QColor, QPen, QBrush
+from PyQt6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QGraphicsPixmapItem, QLabel, QGraphicsTextItem, QMessageBox, QProgressDialog
+from PyQt6.QtGui import QPixmap, QImage, QTransform, QFont, QColor, QPen, QBrush, QKeySequence
 from PyQt6.QtCore import QRectF, QPointF, Qt
 from ui.graphics_view import GraphicsView
 from core.box_manager import BoxManager
 from core.label_manager import LabelManager
+from core.layout_model import LayoutModel
+from core.history import History
 from core.modes import Mode
-from core.exporter import export_layout
+from ui.history_target import SceneHistoryTarget, element_kind, element_record
 from ui.panels.elements_panel import ElementsPanel
 from ui.panels.tools_panel import ToolsPanel
 from ui.panels.header_selector import HeaderSelector
 import os
 
+# Cargas masivas: a partir de cuántos elementos se muestra progreso y cada cuántos se actualiza
+BULK_PROGRESS_THRESHOLD = 500
+BULK_PROGRESS_STEP = 100
+
 class MainWindow(QMainWindow):
     """
     Clase principal que define la interfaz de usuario y el flujo de trabajo.
@@ -26,11 +32,16 @@ class MainWindow(QMainWindow):
     el panel de elementos (ElementsPanel) y el selector de cabecera.
     """
     
-    def __init__(self):
+    def __init__(self, on_phase=None):
         """
         Configura la interfaz, inicializa los gestores y establece el diseño base.
+
+        Args:
+            on_phase (callable, optional): Función `on_phase(nombre)` que se invoca al
+                terminar cada fase de construcción (la usa `main.py --startup-profile`).
         """
         super().__init__()
+        phase = on_phase or (lambda name: None)
 
         self.setWindowTitle("Layout Builder")
         self.setGeometry(100, 100, 1400, 800)
@@ -48,10 +59,17 @@ class MainWindow(QMainWindow):
             }
         """)
 
-        self.box_manager = BoxManager()
-        self.label_manager = LabelManager()
+        # Fuente de verdad de los elementos; los items de la escena son vistas de él
+        self.layout_model = LayoutModel()
+        self.box_manager = BoxManager(self.layout_model)
+        self.label_manager = LabelManager(self.layout_model)
+        # Deshacer/rehacer con deltas compactos y límite de memoria (ver core.history)
+        self.history = History()
+        self.history_target = SceneHistoryTarget(self)
         self.current_mode = Mode.SELECT
         self.background_path = None  # Ruta de la plantilla activa
+        self.background_item = None
+        self._template_loader = None  # Carga de plantilla en curso (ver load_background)
 
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -60,6 +78,7 @@ class MainWindow(QMainWindow):
 
         self.tools_panel = ToolsPanel(self)
         main_layout.addWidget(self.tools_panel)
+        phase("panel de herramientas")
 
         self.canvas_container = QWidget()
         canvas_layout = QVBoxLayout()
@@ -68,16 +87,22 @@ class MainWindow(QMainWindow):
 
         self.elements_panel = ElementsPanel(self, self.box_manager, self.label_manager)
         main_layout.addWidget(self.elements_panel)
+        phase("panel de elementos")
 
         self.view = GraphicsView(
             box_manager=self.box_manager,
             label_manager=self.label_manager,
-            list_widget=self.elements_panel.list_widget,
+            list_view=self.elements_panel.list_view,
             main_window=self
         )
         self.view.set_mode(self.current_mode)
         canvas_layout.addWidget(self.view)
 
+        # Observadores de cambios (un aviso agrupado por fotograma)
+        self.view.change_bus.subscribe(self.elements_panel.on_elements_changed)
+        self.view.change_bus.subscribe(self._on_elements_changed)
+        phase("lienzo")
+
         # BARRA DE ESTADO
         self.coord_label = QLabel("X: 0, Y: 0")
         self.coord_label.setFont(QFont("Segoe UI", 12))
@@ -92,15 +117,27 @@ class MainWindow(QMainWindow):
         """)
         self.statusBar().addWidget(self.coord_label)
 
+        self.count_label = QLabel("Boxes: 0 · Labels: 0")
+        self.count_label.setFont(QFont("Segoe UI", 11))
+        self.count_label.setStyleSheet("QLabel { color: #9AC7C8; padding: 4px 10px; }")
+        self.statusBar().addWidget(self.count_label)
+
+        self.warning_label = QLabel("")
+        self.warning_label.setFont(QFont("Segoe UI", 11))
+        self.warning_label.setStyleSheet("QLabel { color: #FD9E2E; padding: 4px 10px; }")
+        self.statusBar().addWidget(self.warning_label)
+
         # Agregamos el selector directamente a la barra de estado
         self.header_selector = HeaderSelector()
         self.statusBar().addWidget(self.header_selector)
 
         # Conectar cambio de fuente para actualizar items seleccionados
         self.header_selector.combo_font.currentTextChanged.connect(self._on_font_changed)
+        phase("barra de estado")
 
         # Siempre arrancar con el placeholder; el usuario carga la plantilla manualmente
         self._show_placeholder()
+        phase("placeholder")
 
     def _on_font_changed(self, font_name):
         """
@@ -110,10 +147,72 @@ class MainWindow(QMainWindow):
             font_name (str): Nuevo nombre de fuente seleccionado.
         """
         selected_items = self.view.scene().selectedItems()
+        changes = []
         for item in selected_items:
-            if hasattr(item, "text_item"):
+            if hasattr(item, "text_item") and item.font_name != font_name:
+                size = item.text_item.font().pointSize()
+                changes.append((element_kind(item), item.name, item.font_name, size, font_name, size))
                 item.font_name = font_name
                 item.text_item.update_font_family(font_name)
+        self.history.record_fonts(changes)
+
+    def undo(self):
+        """
+        Deshace el último cambio del diseño.
+
+        Returns:
+            bool: True si había algo que deshacer.
+        """
+        return self.history.undo(self.history_target)
+
+    def redo(self):
+        """
+        Rehace el último cambio deshecho.
+
+        Returns:
+            bool: True si había algo que rehacer.
+        """
+        return self.history.redo(self.history_target)
+
+    def _on_elements_changed(self, names, structural):
+        """
+        Actualiza el contador de elementos de la barra de estado tras un cambio estructural.
+
+        Args:
+            names (frozenset): Elementos modificados.
+            structural (bool): True si hubo altas, bajas o renombrados.
+        """
+        if structural:
+            self.count_label.setText(
+                f"Boxes: {len(self.box_manager.boxes)} · Labels: {len(self.label_manager.labels)}"
+            )
+        self._update_overlap_warning(names)
+
+    def _update_overlap_warning(self, names):
+        """
+        Muestra un aviso si alguna caja modificada se solapa con otra o sale de la plantilla.
+
+        Args:
+            names (frozenset): Elementos modificados en el último fotograma.
+        """
+        warnings = []
+        outside = None
+        for name in sorted(n for n in names if n in self.box_manager.boxes):
+            if len(warnings) >= 2:
+                # Solo se muestran dos avisos: al mover un grupo grande no hace falta revisar el resto
+                break
+            box = self.box_manager.boxes[name]
+            others = sorted(o.name for o in self.view.overlapping_boxes(box))
+            if others:
+                warnings.append(f"{name} se solapa con {', '.join(others[:3])}"
+                                + ("…" if len(others) > 3 else ""))
+            if self.background_path:
+                if outside is None:
+                    outside = set(self.view.boxes_outside_template())
+                if box in outside:
+                    warnings.append(f"{name} sale de la plantilla")
+        if warnings or names:
+            self.warning_label.setText(("⚠ " + " · ".join(warnings[:2])) if warnings else "")
 
     def _show_placeholder(self):
         """
@@ -157,44 +256,132 @@ class MainWindow(QMainWindow):
 
     def load_background(self, path):
         """
-        Carga una imagen como fondo del lienzo.
-        
+        Carga una imagen como fondo del lienzo sin bloquear la interfaz.
+
+        La plantilla se decodifica en un TemplateLoader: primero se muestra una
+        vista previa reducida y después la imagen a resolución completa. Mientras
+        tanto, un diálogo de progreso permite cancelar la carga; si se cancela o
+        falla antes de la vista previa, se conserva la plantilla anterior.
+
         Args:
             path (str): Ruta absoluta al archivo de imagen.
+
+        Returns:
+            TemplateLoader: Hilo de carga ya iniciado.
+        """
+        from ui.template_loader import TemplateLoader
+
+        self.cancel_background_load()
+        loader = TemplateLoader(path, self)
+        progress = QProgressDialog("Cargando plantilla...", "Cancelar", 0, 0, self)
+        progress.setWindowTitle("Layout Builder")
+        progress.setMinimumDuration(300)
+        progress.canceled.connect(loader.requestInterruption)
+
+        def on_progress(done, total):
+            progress.setMaximum(total)
+            progress.setValue(done)
+
+        def on_finished():
+            progress.close()
+            progress.deleteLater()
+            if self._template_loader is loader:
+                self._template_loader = None
+            loader.deleteLater()
+
+        loader.preview_ready.connect(lambda image, w, h: self._on_template_preview(loader, image, w, h))
+        loader.progress.connect(on_progress)
+        loader.loaded.connect(lambda result: self._on_template_loaded(loader, result))
+        loader.failed.connect(lambda message: self._on_template_failed(loader, message))
+        loader.finished.connect(on_finished)
+
+        self._template_loader = loader
+        loader.start()
+        return loader
+
+    def cancel_background_load(self, wait=False):
+        """
+        Cancela la carga de plantilla en curso, si la hay.
+
+        Args:
+            wait (bool): Si es True, espera a que el hilo termine su etapa actual.
+        """
+        loader, self._template_loader = self._template_loader, None
+        if loader is None:
+            return
+        loader.requestInterruption()
+        if wait:
+            loader.wait()
+
+    def _commit_background(self, path):
+        """
+        Hace efectiva una plantilla nueva: quita el placeholder y actualiza la ruta y el título.
         """
-        # Quitar el placeholder si existe
         if hasattr(self, '_placeholder_items'):
             for item in self._placeholder_items:
                 if item.scene():
                     self.view.scene().removeItem(item)
             del self._placeholder_items
         self.background_path = path
-        self.load_image(path)
         # Mostrar el nombre de la plantilla en el título de la ventana
         basename = os.path.basename(path)
         self.setWindowTitle(f"Layout Builder  |  {basename}")
 
-    def load_image(self, path):
+    def _set_background_item(self, item, rect):
         """
-        Muestra la imagen en el canvas y ajusta el área de la escena.
-        
+        Sustituye el item de fondo y ajusta el área de la escena.
+
         Args:
-            path (str): Ruta de la imagen.
+            item (QGraphicsItem): Nuevo fondo.
+            rect (QRectF): Área de la plantilla en coordenadas de escena.
         """
-        pixmap = QPixmap(path)
-        if hasattr(self, "background_item") and getattr(self, "background_item"):
-            self.background_item.setPixmap(pixmap)
+        scene = self.view.scene()
+        if self.background_item is not None:
+            scene.removeItem(self.background_item)
+        self.background_item = item
+        item.setZValue(-1)
+        scene.addItem(item)
+        scene.setSceneRect(rect)
+
+    def _on_template_preview(self, loader, image, width, height):
+        """
+        Muestra la vista previa reducida estirada al tamaño real de la plantilla.
+        """
+        if loader is not self._template_loader:
+            return
+        self._commit_background(loader.path)
+        preview = QGraphicsPixmapItem(QPixmap.fromImage(image))
+        preview.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+        preview.setTransform(QTransform.fromScale(width / image.width(), height / image.height()))
+        self._set_background_item(preview, QRectF(0, 0, width, height))
+
+    def _on_template_loaded(self, loader, result):
+        """
+        Sustituye la vista previa por la plantilla completa (imagen o pirámide de teselas).
+        """
+        if loader is not self._template_loader:
+            return
+        self._commit_background(loader.path)
+        if isinstance(result, QImage):
+            item = QGraphicsPixmapItem(QPixmap.fromImage(result))
         else:
-            self.background_item = QGraphicsPixmapItem(pixmap)
-            self.background_item.setZValue(-1)
-            self.view.scene().addItem(self.background_item)
+            from ui.items.tiled_background_item import TiledBackgroundItem
+            item = TiledBackgroundItem(result)
+        self._set_background_item(item, item.boundingRect())
 
-        rect = pixmap.rect()
-        self.view.scene().setSceneRect(QRectF(rect))
+    def _on_template_failed(self, loader, message):
+        """
+        Informa de un error de carga de la plantilla.
+        """
+        if loader is not self._template_loader:
+            return
+        QMessageBox.critical(self, "Error de Plantilla",
+                             f"No se pudo cargar la plantilla:\n{loader.path}\n\n{message}")
 
     def keyPressEvent(self, event):
         """
-        Captura atajos de teclado (1, 2, 3, Esc) para cambiar de modo rápidamente.
+        Captura atajos de teclado (1, 2, 3, Esc) para cambiar de modo rápidamente,
+        y Ctrl+Z / Ctrl+Y (o Ctrl+Shift+Z) para deshacer y rehacer.
         """
         # No capturar si hay un TextItem activo o cualquier widget con foco de texto
         from PyQt6.QtWidgets import QApplication
@@ -203,6 +390,14 @@ class MainWindow(QMainWindow):
             super().keyPressEvent(event)
             return
 
+        if event.matches(QKeySequence.StandardKey.Undo):
+            self.undo()
+            return
+        if (event.matches(QKeySequence.StandardKey.Redo)
+                or (event.key() == Qt.Key.Key_Y and event.modifiers() == Qt.KeyboardModifier.ControlModifier)):
+            self.redo()
+            return
+
         key = event.key()
         if key == Qt.Key.Key_1:
             self.change_mode(Mode.SELECT)
@@ -226,39 +421,152 @@ class MainWindow(QMainWindow):
         self.view.set_mode(mode)
         self.tools_panel.change_mode(mode)
 
-    def export_elements(self, export_dir=None):
+    def export_elements(self, export_dir=None, formats=None):
         """
         Inicia el proceso de exportación de los elementos actuales.
         
         Args:
             export_dir (str, optional): Carpeta destino personalizada.
+            formats (tuple, optional): Extensiones a generar (por defecto .py, .txt, .json y .csv).
             
         Returns:
-            tuple: (py_path, txt_path) con las rutas de los archivos generados.
+            tuple: Rutas de los archivos generados, en el orden de `formats`.
         """
-        py_path, txt_path = export_layout(self.box_manager, self.label_manager, self.background_path, export_dir)
-        print(f"Configuración exportada en: {py_path}")
-        return py_path, txt_path
+        from core.exporter import export_layout, EXPORT_FORMATS
+        formats = formats or EXPORT_FORMATS
+        paths = export_layout(self.layout_model, self.background_path, export_dir, formats)
+        print(f"Configuración exportada en: {paths[0]}")
+        return paths
 
-    def create_box(self, x, y, w, h, name=None, font_name="Arial"):
+    def create_box(self, x, y, w, h, name=None, font_name="Arial", text=None, font_size=None):
         """
         Crea programáticamente una caja y la añade a la escena.
+
+        El texto y el tamaño de fuente se aplican al construir la caja, de modo
+        que entra en la escena ya maquetada.
         """
         from ui.items.box_item import BoxItem
         rect = QRectF(x, y, w, h)
-        box_item = BoxItem(rect, name, font_name=font_name)
+        box_item = BoxItem(rect, name, font_name=font_name, text=text, font_size=font_size)
         self.view.scene().addItem(box_item)
         return box_item
 
-    def create_label(self, x, y, name=None, font_name="Arial"):
+    def create_label(self, x, y, name=None, font_name="Arial", text=None, font_size=None):
         """
         Crea programáticamente una etiqueta y la añade a la escena.
         """
         from ui.items.label_item import LabelItem
-        label_item = LabelItem(QPointF(x, y), name, font_name=font_name)
+        label_item = LabelItem(QPointF(x, y), name, font_name=font_name, text=text, font_size=font_size)
         self.view.scene().addItem(label_item)
         return label_item
 
+    def clear_elements(self):
+        """
+        Elimina todas las cajas y etiquetas de la escena y de los gestores.
+        """
+        scene = self.view.scene()
+        for item in self.view.elements():
+            scene.removeItem(item)
+        self.box_manager.clear()
+        self.label_manager.clear()
+        self.view.change_bus.notify_structure()
+
+    def populate_elements(self, boxes=(), labels=(), clear=True, record=True):
+        """
+        Crea en bloque cajas y etiquetas con las actualizaciones suspendidas.
+
+        Los índices, el panel de elementos y el lienzo se actualizan una sola vez
+        al final (ver GraphicsView.bulk_update). En cargas grandes se muestra un
+        diálogo de progreso.
+
+        Args:
+            boxes (list): Diccionarios con name, x, y, w, h y opcionalmente
+                font_name, font_size y text.
+            labels (list): Diccionarios con name, x, y y opcionalmente
+                font_name, font_size y text.
+            clear (bool): Si es True, elimina antes los elementos existentes.
+            record (bool): Si es True, la carga se registra en el historial como un
+                solo paso que se puede deshacer.
+
+        Returns:
+            tuple: (cajas creadas, etiquetas creadas).
+        """
+        total = len(boxes) + len(labels)
+        progress = None
+        if total >= BULK_PROGRESS_THRESHOLD:
+            progress = QProgressDialog("Cargando elementos...", "", 0, total, self)
+            progress.setCancelButton(None)
+            progress.setWindowTitle("Layout Builder")
+            progress.setWindowModality(Qt.WindowModality.WindowModal)
+            progress.setMinimumDuration(300)
+
+        removed = []
+        if record and clear:
+            removed = [element_record(item) for item in self.view.elements()]
+
+        created_boxes, created_labels = [], []
+        with self.view.bulk_update():
+            if clear:
+                self.clear_elements()
+            for b in boxes:
+                box = self.create_box(b["x"], b["y"], b["w"], b["h"], b["name"],
+                                      font_name=b.get("font_name", "Arial"),
+                                      text=b.get("text"), font_size=b.get("font_size"))
+                self.box_manager.add_box(box, b["name"])
+                created_boxes.append(box)
+                if progress and len(created_boxes) % BULK_PROGRESS_STEP == 0:
+                    progress.setValue(len(created_boxes))
+            for lb in labels:
+                label = self.create_label(lb["x"], lb["y"], lb["name"],
+                                          font_name=lb.get("font_name", "Arial"),
+                                          text=lb.get("text"), font_size=lb.get("font_size"))
+                self.label_manager.add_label(label, lb["name"])
+                created_labels.append(label)
+                if progress and len(created_labels) % BULK_PROGRESS_STEP == 0:
+                    progress.setValue(len(created_boxes) + len(created_labels))
+
+        if record:
+            self.history.record_structure(
+                removed, [element_record(item) for item in created_boxes + created_labels])
+        if progress:
+            progress.setValue(total)
+        return created_boxes, created_labels
+
+    def save_project(self, path):
+        """
+        Guarda el estado completo del diseño en un archivo de proyecto (.lbproj).
+
+        Args:
+            path (str): Ruta de destino.
+        """
+        from core.project import build_project, save_project
+        project = build_project(self.layout_model, self.background_path)
+        save_project(path, project)
+
+    def open_project(self, path):
+        """
+        Abre un archivo de proyecto: carga la plantilla (en segundo plano) y recrea todos los elementos en bloque.
+
+        El historial de deshacer se vacía.
+
+        Args:
+            path (str): Ruta del archivo .lbproj.
+
+        Returns:
+            dict: Proyecto leído (ver core.project.load_project).
+        """
+        from core.project import load_project
+        project = load_project(path)
+
+        template = project["template"]
+        if template and os.path.exists(template):
+            self.load_background(template)
+
+        # Un proyecto abierto empieza con el historial vacío
+        self.populate_elements(project["boxes"], project["labels"], record=False)
+        self.history.clear()
+        return project
+
     def add_box_to_list(self, box):
         """Registra una caja en el panel lateral."""
         self.elements_panel.add_box(box)
@@ -276,6 +584,7 @@ class MainWindow(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
+            self.cancel_background_load(wait=True)
             event.accept()
         else:
             event.ignore()
@@ -0,0 +1,293 @@
+"""
+ui/panels/elements_model.py
+
+Modelo y delegado de la lista de elementos (Boxes y Labels).
+
+El modelo solo guarda referencias a los items y un índice nombre -> filas; el texto
+de cada fila se calcula bajo demanda, de modo que la vista solo consulta y pinta
+las filas visibles. El delegado dibuja los controles de cada fila (tamaño de
+fuente y borrado) sin crear widgets.
+"""
+
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt6.QtGui import QColor, QFont, QPen
+from PyQt6.QtCore import (Qt, QAbstractListModel, QModelIndex, QRect, QSize,
+                          QEvent, pyqtSignal)
+from ui.items.label_item import LabelItem
+from ui.items.box_item import BoxItem
+from core.utils import snap_to_5
+
+MAX_NAME_CHARS = 28
+
+ElementRole = Qt.ItemDataRole.UserRole
+FontSizeRole = Qt.ItemDataRole.UserRole + 1
+
+ROW_HEIGHT = 48
+ROW_MARGIN = 5
+ROW_SPACING = 6
+SIZE_BTN = 24
+SIZE_LABEL_W = 24
+DELETE_BTN = 28
+
+COLOR_TEXT        = QColor("#d0e0e8")
+COLOR_ROW_SEL     = QColor("#24445B")
+COLOR_ROW_BORDER  = QColor("#24445B")
+COLOR_BTN         = QColor("#24445B")
+COLOR_BTN_TEXT    = QColor("#9AC7C8")
+COLOR_SIZE_TEXT   = QColor("#FD9E2E")
+COLOR_DELETE_TEXT = QColor("#e05050")
+
+
+def _truncate(text, max_chars=MAX_NAME_CHARS):
+    """Trunca el texto si excede el límite de caracteres."""
+    return text if len(text) <= max_chars else text[:max_chars - 3] + "..."
+
+
+def element_text(element, model):
+    """
+    Construye el texto de dos líneas que describe un elemento en la lista.
+
+    Las coordenadas salen del registro del elemento en el LayoutModel, las mismas
+    que se exportan y se guardan en el proyecto.
+
+    Args:
+        element (BoxItem | LabelItem): Elemento a describir.
+        model (LayoutModel): Modelo del layout.
+
+    Returns:
+        str: Nombre y coordenadas (ajustadas a múltiplos de 5).
+    """
+    if isinstance(element, LabelItem):
+        record = model.labels.get(element.name)
+        x, y = (record.x, record.y) if record is not None else element.model_geometry()
+        return f"Label: {element.name}\nPos: ({snap_to_5(x)}, {snap_to_5(y)})"
+    record = model.boxes.get(element.name)
+    x1, y1, x2, y2 = record.bounds() if record is not None else _box_bounds(element)
+    return (f"Box: {element.name}\n({snap_to_5(x1)}, {snap_to_5(y1)}) -> "
+            f"({snap_to_5(x2)}, {snap_to_5(y2)})")
+
+
+def _box_bounds(box):
+    """Rectángulo (x1, y1, x2, y2) de una caja aún no registrada en el modelo."""
+    x, y, w, h = box.model_geometry()
+    return x, y, x + w, y + h
+
+
+class ElementsModel(QAbstractListModel):
+    """
+    Modelo de lista con una fila por elemento, indexado por nombre.
+
+    Las cajas se listan primero y después las etiquetas, igual que en los gestores.
+    """
+
+    def __init__(self, box_manager, label_manager, parent=None):
+        """
+        Inicializa el modelo.
+
+        Args:
+            box_manager (BoxManager): Gestor de cajas.
+            label_manager (LabelManager): Gestor de etiquetas.
+            parent (QObject, optional): Objeto padre.
+        """
+        super().__init__(parent)
+        self.box_manager = box_manager
+        self.label_manager = label_manager
+        self._elements = []
+        self._rows_by_name = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._elements)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._elements):
+            return None
+        element = self._elements[index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            text = element_text(element, self.box_manager.model)
+            lines = text.split("\n")
+            return "\n".join([_truncate(lines[0])] + lines[1:])
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return element_text(element, self.box_manager.model)
+        if role == ElementRole:
+            return element
+        if role == FontSizeRole:
+            return element.text_item.font().pointSize()
+        return None
+
+    def rebuild(self):
+        """
+        Reconstruye las filas a partir de los gestores (cambios estructurales).
+        """
+        self.beginResetModel()
+        self._elements = list(self.box_manager.boxes.values())
+        self._elements.extend(self.label_manager.labels.values())
+        self._reindex()
+        self.endResetModel()
+
+    def append_element(self, element):
+        """
+        Añade una fila al final para un elemento nuevo.
+
+        Args:
+            element (BoxItem | LabelItem): Elemento a añadir.
+        """
+        row = len(self._elements)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._elements.append(element)
+        self._rows_by_name.setdefault(element.name, []).append(row)
+        self.endInsertRows()
+
+    def _reindex(self):
+        self._rows_by_name = {}
+        for row, element in enumerate(self._elements):
+            self._rows_by_name.setdefault(element.name, []).append(row)
+
+    def row_for_name(self, name):
+        """
+        Devuelve la primera fila asociada a un nombre, o -1 si no existe.
+        """
+        rows = self._rows_by_name.get(name)
+        return rows[0] if rows else -1
+
+    def element_changed(self, name):
+        """
+        Notifica a la vista que los datos de un elemento cambiaron (solo repinta su fila).
+
+        Args:
+            name (str): Nombre del elemento modificado.
+        """
+        for row in self._rows_by_name.get(name, ()):
+            idx = self.index(row)
+            self.dataChanged.emit(idx, idx)
+
+    def elements_changed(self, names):
+        """
+        Notifica el cambio de varios elementos con una sola señal para el rango de filas afectado.
+
+        Args:
+            names (iterable): Nombres de los elementos modificados.
+        """
+        rows = [row for name in names for row in self._rows_by_name.get(name, ())]
+        if rows:
+            self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)))
+
+
+class ElementsDelegate(QStyledItemDelegate):
+    """
+    Delegado que pinta cada fila (texto + botones) y resuelve los clics sobre los botones.
+
+    Signals:
+        font_size_requested(object, int): Elemento y delta de tamaño de fuente.
+        delete_requested(object): Elemento a eliminar.
+    """
+
+    font_size_requested = pyqtSignal(object, int)
+    delete_requested = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._text_font = QFont()
+        self._text_font.setPixelSize(13)
+        self._text_font.setWeight(QFont.Weight.Medium)
+        self._bold_font = QFont()
+        self._bold_font.setPixelSize(13)
+        self._bold_font.setBold(True)
+        self._delete_font = QFont()
+        self._delete_font.setPixelSize(18)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    @staticmethod
+    def _button_rects(rect, with_size_controls):
+        """
+        Calcula los rectángulos de los controles de una fila, de derecha a izquierda.
+
+        Returns:
+            dict: {'delete', 'plus', 'size', 'minus', 'text'} -> QRect (o None).
+        """
+        cy = rect.center().y()
+        right = rect.right() - ROW_MARGIN
+        rects = {}
+
+        rects["delete"] = QRect(right - DELETE_BTN + 1, cy - DELETE_BTN // 2, DELETE_BTN, DELETE_BTN)
+        right = rects["delete"].left() - ROW_SPACING
+
+        if with_size_controls:
+            rects["plus"] = QRect(right - SIZE_BTN + 1, cy - SIZE_BTN // 2, SIZE_BTN, SIZE_BTN)
+            right = rects["plus"].left() - ROW_SPACING
+            rects["size"] = QRect(right - SIZE_LABEL_W + 1, cy - SIZE_BTN // 2, SIZE_LABEL_W, SIZE_BTN)
+            right = rects["size"].left() - ROW_SPACING
+            rects["minus"] = QRect(right - SIZE_BTN + 1, cy - SIZE_BTN // 2, SIZE_BTN, SIZE_BTN)
+            right = rects["minus"].left() - ROW_SPACING
+        else:
+            rects["plus"] = rects["size"] = rects["minus"] = None
+
+        left = rect.left() + ROW_MARGIN
+        rects["text"] = QRect(left, rect.top() + 6, max(0, right - left), rect.height() - 12)
+        return rects
+
+    def paint(self, painter, option, index):
+        element = index.data(ElementRole)
+        rect = option.rect
+        rects = self._button_rects(rect, isinstance(element, (LabelItem, BoxItem)))
+
+        painter.save()
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(COLOR_ROW_SEL)
+            painter.drawRoundedRect(rect.adjusted(1, 1, -1, -1), 3, 3)
+        painter.setPen(QPen(COLOR_ROW_BORDER, 1))
+        painter.drawLine(rect.bottomLeft(), rect.bottomRight())
+
+        painter.setFont(self._text_font)
+        painter.setPen(COLOR_TEXT)
+        metrics = painter.fontMetrics()
+        text_rect = rects["text"]
+        lines = [
+            metrics.elidedText(line, Qt.TextElideMode.ElideRight, text_rect.width())
+            for line in (index.data(Qt.ItemDataRole.DisplayRole) or "").split("\n")
+        ]
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                         "\n".join(lines))
+
+        if rects["minus"] is not None:
+            painter.setFont(self._bold_font)
+            for key, label in (("minus", "-"), ("plus", "+")):
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(COLOR_BTN)
+                painter.drawRoundedRect(rects[key], 4, 4)
+                painter.setPen(COLOR_BTN_TEXT)
+                painter.drawText(rects[key], Qt.AlignmentFlag.AlignCenter, label)
+            painter.setPen(COLOR_SIZE_TEXT)
+            painter.drawText(rects["size"], Qt.AlignmentFlag.AlignCenter, str(index.data(FontSizeRole)))
+
+        painter.setFont(self._delete_font)
+        painter.setPen(COLOR_DELETE_TEXT)
+        painter.drawText(rects["delete"], Qt.AlignmentFlag.AlignCenter, "🗑")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        """
+        Traduce los clics sobre los botones pintados en señales del delegado.
+        """
+        if event.type() != QEvent.Type.MouseButtonRelease or event.button() != Qt.MouseButton.LeftButton:
+            return super().editorEvent(event, model, option, index)
+
+        element = index.data(ElementRole)
+        rects = self._button_rects(option.rect, isinstance(element, (LabelItem, BoxItem)))
+        pos = event.position().toPoint()
+
+        if rects["delete"].contains(pos):
+            self.delete_requested.emit(element)
+            return True
+        if rects["minus"] is not None and rects["minus"].contains(pos):
+            self.font_size_requested.emit(element, -1)
+            return True
+        if rects["plus"] is not None and rects["plus"].contains(pos):
+            self.font_size_requested.emit(element, 1)
+            return True
+        return super().editorEvent(event, model, option, index)
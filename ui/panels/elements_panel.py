@@ -5,19 +5,20 @@ Panel lateral derecho que lista todos los elementos (Boxes y Labels) presentes e
 Permite renombrar, eliminar y ajustar el tamaño de fuente de los items.
 """
 
-from PyQt6.QtWidgets import (QFrame, QVBoxLayout, QHBoxLayout, QLabel, QListWidget,
-                             QListWidgetItem, QInputDialog, QFileDialog, QWidget,
-                             QPushButton, QMessageBox)
+from PyQt6.QtWidgets import (QFrame, QVBoxLayout, QLabel, QListView,
+                             QAbstractItemView, QInputDialog, QMessageBox)
 from PyQt6.QtCore import Qt
 from ui.items.label_item import LabelItem
 from ui.items.box_item import BoxItem
-from core.utils import snap_to_5
-
-MAX_NAME_CHARS = 28 
+from ui.panels.elements_model import ElementsModel, ElementsDelegate, ElementRole
+from ui.history_target import element_kind, element_record
 
 class ElementsPanel(QFrame):
     """
     Componente visual que muestra una lista interactiva de los objetos creados.
+
+    Usa un modelo (ElementsModel) y un delegado (ElementsDelegate): solo se pintan
+    las filas visibles y un cambio de geometría repinta únicamente su fila.
     """
     
     def __init__(self, main_window, box_manager, label_manager):
@@ -56,130 +57,52 @@ class ElementsPanel(QFrame):
         """)
         layout.addWidget(label)
 
-        self.list_widget = QListWidget()
-        self.list_widget.setStyleSheet("""
-            QListWidget {
+        self.model = ElementsModel(box_manager, label_manager, self)
+        self.delegate = ElementsDelegate(self)
+
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(self.delegate)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.list_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.list_view.setStyleSheet("""
+            QListView {
                 background-color: #1a2530;
                 border: 1px solid #24445B;
                 border-radius: 4px;
                 color: #d0e0e8;
             }
-            QListWidget::item {
-                border-bottom: 1px solid #24445B;
-            }
-            QListWidget::item:selected {
-                background-color: #24445B;
-                color: #FD9E2E;
-            }
-        """)
-        layout.addWidget(self.list_widget)
-
-        self.list_widget.itemDoubleClicked.connect(self.rename_box_or_label)
-        self.list_widget.itemClicked.connect(self.on_item_clicked)
-
-    def _truncate(self, text, max_chars=MAX_NAME_CHARS):
-        """Trunca el texto si excede el límite de caracteres."""
-        return text if len(text) <= max_chars else text[:max_chars - 3] + "..."
-
-    def _create_item_layout(self, element, text):
-        """
-        Crea un widget personalizado para una fila de la lista.
-        
-        Incluye el nombre del item, controles de tamaño de fuente y botón de borrado.
-        """
-        item = QListWidgetItem(self.list_widget)
-        item.setData(Qt.ItemDataRole.UserRole, element)
-
-        container = QWidget()
-        container.setStyleSheet("background: transparent;")
-        row_layout = QHBoxLayout(container)
-        row_layout.setContentsMargins(5, 6, 5, 6)
-        row_layout.setSpacing(6)
-
-        lines = text.split("\n")
-        truncated_lines = [self._truncate(lines[0])] + lines[1:]
-        truncated_text = "\n".join(truncated_lines)
-
-        lbl = QLabel(truncated_text)
-        lbl.setToolTip(text)  
-        lbl.setStyleSheet("font-size: 13px; color: #d0e0e8; background: transparent; font-weight: 500;")
-        row_layout.addWidget(lbl, 1) 
-
-        if isinstance(element, (LabelItem, BoxItem)):
-            btn_style = """
-                QPushButton {
-                    background-color: #24445B;
-                    color: #9AC7C8;
-                    border: none;
-                    border-radius: 4px;
-                    font-weight: bold;
-                    font-size: 13px;
-                }
-                QPushButton:hover {
-                    background-color: #355f7d;
-                }
-            """
-            current_sz = element.text_item.font().pointSize()
-            size_label = QLabel(str(current_sz))
-            size_label.setStyleSheet("color: #FD9E2E; font-weight: bold; min-width: 24px; font-size: 13px;")
-            size_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-            def update_ui(delta, el=element, sl=size_label):
-                new_size = el.text_item.update_font_size(delta)
-                sl.setText(str(new_size))
-                if isinstance(el, BoxItem):
-                    el.update_text_layout()
-
-            btn_min = QPushButton("-")
-            btn_min.setFixedSize(24, 24)
-            btn_min.setStyleSheet(btn_style)
-            btn_min.clicked.connect(lambda: update_ui(-1))
-            
-            btn_max = QPushButton("+")
-            btn_max.setFixedSize(24, 24)
-            btn_max.setStyleSheet(btn_style)
-            btn_max.clicked.connect(lambda: update_ui(1))
-
-            row_layout.addWidget(btn_min)
-            row_layout.addWidget(size_label) 
-            row_layout.addWidget(btn_max)
-
-        btn_del = QPushButton("🗑")
-        btn_del.setFixedSize(28, 28)
-        btn_del.setCursor(Qt.CursorShape.PointingHandCursor)
-        btn_del.setToolTip("Eliminar este elemento")
-        btn_del.setStyleSheet("""
-            QPushButton {
-                background: none;
-                border: none;
-                color: #e05050;
-                font-size: 18px;
-            }
-            QPushButton:hover {
-                background-color: #4a2020;
-                border-radius: 4px;
-            }
         """)
-        btn_del.clicked.connect(lambda: self.delete_element(element))
-        row_layout.addWidget(btn_del)
+        layout.addWidget(self.list_view)
 
-        item.setSizeHint(container.sizeHint())
-        self.list_widget.addItem(item)
-        self.list_widget.setItemWidget(item, container)
+        self.list_view.doubleClicked.connect(self.rename_box_or_label)
+        self.list_view.clicked.connect(self.on_item_clicked)
+        # Diferidas: el borrado abre un diálogo y reinicia el modelo
+        self.delegate.delete_requested.connect(
+            self.delete_element, Qt.ConnectionType.QueuedConnection
+        )
+        self.delegate.font_size_requested.connect(self.change_font_size)
 
     def add_box(self, box):
         """Añade una representación de BoxItem a la lista."""
-        rect = box.sceneBoundingRect()
-        x1, y1 = snap_to_5(rect.left()), snap_to_5(rect.top())
-        x2, y2 = snap_to_5(rect.right()), snap_to_5(rect.bottom())
-        item_text = f"Box: {box.name}\n({x1}, {y1}) -> ({x2}, {y2})"
-        self._create_item_layout(box, item_text)
+        self.model.append_element(box)
 
     def add_label(self, label: LabelItem):
         """Añade una representación de LabelItem a la lista."""
-        x, y = label.get_center()
-        item_text = f"Label: {label.name}\nPos: ({snap_to_5(x)}, {snap_to_5(y)})"
-        self._create_item_layout(label, item_text)
+        self.model.append_element(label)
+
+    def change_font_size(self, element, delta):
+        """Cambia el tamaño de fuente de un elemento y repinta su fila."""
+        old_size = element.text_item.font().pointSize()
+        new_size = element.text_item.update_font_size(delta)
+        if isinstance(element, BoxItem):
+            element.update_text_layout()
+        self.main_window.view.change_bus.notify(element.name)
+        # Los clics seguidos sobre el mismo elemento se funden en un solo paso
+        self.main_window.history.record_fonts(
+            [(element_kind(element), element.name, element.font_name, old_size,
+              element.font_name, new_size)], merge=True)
 
     def delete_element(self, element):
         """Elimina un elemento tanto de la escena como de los gestores y la lista."""
@@ -190,6 +113,7 @@ class ElementsPanel(QFrame):
         )
         
         if confirm == QMessageBox.StandardButton.Yes:
+            record = element_record(element)
             if element.scene():
                 element.scene().removeItem(element)
             
@@ -198,19 +122,41 @@ class ElementsPanel(QFrame):
             else:
                 self.box_manager.remove_box(element.name)
             
-            self.update_list()
+            self.main_window.view.change_bus.notify_structure()
+            self.main_window.history.record_structure(removed=[record])
 
     def update_list(self):
-        """Refresca completamente la lista basándose en los datos de los gestores."""
-        self.list_widget.clear()
-        for box in self.box_manager.boxes.values():
-            self.add_box(box)
-        for label in self.label_manager.labels.values():
-            self.add_label(label)
+        """Reconstruye la lista tras un cambio estructural (alta, baja o renombrado)."""
+        self.model.rebuild()
+
+    def on_elements_changed(self, names, structural):
+        """
+        Suscriptor del ChangeBus: aplica en un único paso los cambios de un fotograma.
 
-    def rename_box_or_label(self, item: QListWidgetItem):
+        Args:
+            names (frozenset): Elementos modificados.
+            structural (bool): True si hubo altas, bajas o renombrados.
+        """
+        if structural:
+            self.update_list()
+            return
+        if len(names) == 1:
+            self.refresh_element(next(iter(names)))
+        else:
+            self.model.elements_changed(names)
+
+    def refresh_element(self, name):
+        """
+        Repinta solo la fila de un elemento cuya geometría o fuente ha cambiado.
+
+        Args:
+            name (str): Nombre del elemento.
+        """
+        self.model.element_changed(name)
+
+    def rename_box_or_label(self, index):
         """Muestra un diálogo para cambiar el nombre al ítem seleccionado."""
-        element = item.data(Qt.ItemDataRole.UserRole)
+        element = index.data(ElementRole)
         old_name = element.name
         new_name, ok = QInputDialog.getText(
             self, f"Renombrar {type(element).__name__}", 
@@ -220,15 +166,17 @@ class ElementsPanel(QFrame):
         if ok and new_name.strip():
             new_name = new_name.strip()
             if isinstance(element, LabelItem):
-                self.main_window.label_manager.rename_label(old_name, new_name)
+                renamed = self.main_window.label_manager.rename_label(old_name, new_name)
             else:
-                self.main_window.box_manager.rename_box(old_name, new_name)
+                renamed = self.main_window.box_manager.rename_box(old_name, new_name)
+            if renamed:
+                self.main_window.history.record_rename(element_kind(element), old_name, new_name)
             
-            self.update_list()
+            self.main_window.view.change_bus.notify_structure()
 
-    def on_item_clicked(self, item):
+    def on_item_clicked(self, index):
         """Resalta en el canvas el item correspondiente al hacer clic en la lista."""
-        element = item.data(Qt.ItemDataRole.UserRole)
+        element = index.data(ElementRole)
         if element:
             self.main_window.view.highlight_item(element.name)
 
@@ -239,18 +187,14 @@ class ElementsPanel(QFrame):
         Args:
             name (str): Nombre del item a seleccionar (None para deseleccionar).
         """
-        self.list_widget.blockSignals(True)
-        self.list_widget.clearSelection()
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            element = item.data(Qt.ItemDataRole.UserRole)
-            widget = self.list_widget.itemWidget(item)
-            if name and element and element.name == name:
-                item.setSelected(True)
-                self.list_widget.scrollToItem(item)
-                if widget:
-                    widget.setStyleSheet("background-color: #24445B; border-radius: 3px;")
-            else:
-                if widget:
-                    widget.setStyleSheet("background: transparent;")
-        self.list_widget.blockSignals(False)
+        selection = self.list_view.selectionModel()
+        selection.blockSignals(True)
+        row = self.model.row_for_name(name) if name else -1
+        if row >= 0:
+            index = self.model.index(row)
+            selection.setCurrentIndex(index, selection.SelectionFlag.ClearAndSelect)
+            self.list_view.scrollTo(index)
+        else:
+            selection.clearSelection()
+        selection.blockSignals(False)
+        self.list_view.viewport().update()
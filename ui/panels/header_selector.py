@@ -6,15 +6,18 @@ y el tipo de fuente global que se aplicará a los nuevos items o a los seleccion
 """
 
 import os
-import pandas as pd
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QComboBox, QCompleter, QPushButton, QFileDialog, QMessageBox
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
+from core.font_registry import get_font_registry
 
 
 class HeaderSelector(QWidget):
     """
     Componente de la barra de estado para la configuración rápida de nombres y fuentes.
     """
+
+    # Emitida (desde el hilo del registro de fuentes) cuando el índice de fuentes está listo
+    fonts_indexed = pyqtSignal()
     
     def __init__(self, parent=None):
         """
@@ -203,22 +206,35 @@ class HeaderSelector(QWidget):
         # Inicializar combo con solo AUTO
         self.combo.clear()
         self.combo.addItem("AUTO")
+        # La señal lleva el aviso del hilo del registro de fuentes al hilo de la interfaz
+        self.fonts_indexed.connect(self._show_font_details)
+        get_font_registry().add_listener(self.fonts_indexed.emit)
         self.load_fonts()
 
     def load_fonts(self):
-        """Busca archivos TTF/OTF en la carpeta /fonts y los lista en el combo."""
+        """
+        Lista en el combo los archivos TTF/OTF de la carpeta /fonts.
+
+        Los metadatos (familia y estilo) se indexan en segundo plano y se muestran
+        como tooltip de cada opción cuando están listos.
+        """
+        registry = get_font_registry()
         self.combo_font.clear()
-        fonts_dir = os.path.join(os.path.dirname(__file__), "..", "..", "fonts")
-        font_files = []
-        if os.path.exists(fonts_dir):
-            for f in os.listdir(fonts_dir):
-                if f.lower().endswith(('.ttf', '.otf')):
-                    font_files.append(f)
+        font_files = registry.files()
         
         if not font_files:
             font_files = ["Arial"]
         
         self.combo_font.addItems(font_files)
+        registry.start()
+
+    def _show_font_details(self):
+        """Añade la familia y el estilo reales de cada fuente como tooltip del combo."""
+        registry = get_font_registry()
+        for i in range(self.combo_font.count()):
+            info = registry.info(self.combo_font.itemText(i))
+            if info:
+                self.combo_font.setItemData(i, f"{info.family} · {info.style}", Qt.ItemDataRole.ToolTipRole)
 
     def get_current_font(self):
         """Devuelve el nombre del archivo de fuente seleccionado actualmente."""
@@ -245,9 +261,10 @@ class HeaderSelector(QWidget):
         items = ["AUTO"]
         try:
             if os.path.exists(excel_path):
-                # Usar pandas para leer solo las cabeceras
-                df = pd.read_excel(excel_path, nrows=0)
-                headers = [str(h).strip().lower().replace(" ", "_") for h in df.columns]
+                # Cabeceras desde la caché de datos (solo se lee el Excel si cambió).
+                # Se importa aquí para no cargar la caché ni pandas al arrancar.
+                from core.data_cache import get_data_cache
+                headers = get_data_cache().headers(excel_path)
                 
                 if not headers:
                     QMessageBox.warning(self, "Excel Vacío", "El archivo seleccionado no tiene columnas.")
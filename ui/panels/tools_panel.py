@@ -5,10 +5,10 @@ Panel lateral izquierdo que contiene las herramientas principales.
 Permite cambiar de modo (Selección, Box, Label) y gestionar la importación/exportación.
 """
 
-from PyQt6.QtWidgets import QFrame, QVBoxLayout, QLabel, QPushButton, QFileDialog, QMessageBox, QGraphicsPixmapItem
+from PyQt6.QtWidgets import QFrame, QVBoxLayout, QLabel, QPushButton, QFileDialog, QMessageBox
 from PyQt6.QtCore import Qt, QRectF
 from core.modes import Mode
-import importlib.util
+import os
 
 NORMAL_BTN_STYLE = """
     QPushButton {
@@ -176,8 +176,8 @@ class ToolsPanel(QFrame):
         for btn in mode_buttons:
             btn.setMinimumHeight(40)
             btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            btn.setStyleSheet(NORMAL_BTN_STYLE)
             layout.addWidget(btn)
+        # El estilo de los botones de modo lo aplica change_mode (set_default_mode, más abajo)
 
         # Nota de atajos de teclado
         lbl_hint = QLabel("  Atajos:  1 · 2 · 3")
@@ -201,8 +201,10 @@ class ToolsPanel(QFrame):
 
         self.btn_exportar = QPushButton("📤   Exportar Coordenadas")
         self.btn_importar = QPushButton("📥   Importar Coordenadas")
+        self.btn_guardar_proyecto = QPushButton("💾   Guardar Proyecto")
+        self.btn_abrir_proyecto = QPushButton("📂   Abrir Proyecto")
 
-        for btn in [self.btn_exportar, self.btn_importar]:
+        for btn in [self.btn_exportar, self.btn_importar, self.btn_guardar_proyecto, self.btn_abrir_proyecto]:
             btn.setMinimumHeight(40)
             btn.setCursor(Qt.CursorShape.PointingHandCursor)
             btn.setStyleSheet(ACTION_BTN_STYLE)
@@ -217,6 +219,8 @@ class ToolsPanel(QFrame):
         self.btn_crear_label.clicked.connect(lambda: self.change_mode(Mode.CREATE_LABEL))
         self.btn_exportar.clicked.connect(self.export_action)
         self.btn_importar.clicked.connect(self.import_action)
+        self.btn_guardar_proyecto.clicked.connect(self.save_project_action)
+        self.btn_abrir_proyecto.clicked.connect(self.open_project_action)
 
         self.set_default_mode()
 
@@ -242,11 +246,13 @@ class ToolsPanel(QFrame):
             Mode.CREATE_LABEL: self.btn_crear_label,
         }
 
-        for m, btn in btn_map.items():
-            btn.setStyleSheet(ACTIVE_BTN_STYLE if m == mode else NORMAL_BTN_STYLE)
-        # Aseguramos que btn_moverse quede activo tanto en SELECT como TRANSFORM
-        if mode in (Mode.SELECT, Mode.TRANSFORM):
-            self.btn_moverse.setStyleSheet(ACTIVE_BTN_STYLE)
+        # Solo se re-estilan los botones que cambian: cada setStyleSheet obliga a Qt
+        # a analizar la hoja de estilos y re-pulir el widget
+        active = btn_map.get(mode)
+        for btn in (self.btn_moverse, self.btn_crear_box, self.btn_crear_label):
+            style = ACTIVE_BTN_STYLE if btn is active else NORMAL_BTN_STYLE
+            if btn.styleSheet() != style:
+                btn.setStyleSheet(style)
 
     def import_background_action(self):
         """
@@ -273,17 +279,16 @@ class ToolsPanel(QFrame):
         )
         if not export_dir:
             return
-        py_path, txt_path = self.main_window.export_elements(export_dir)
+        paths = self.main_window.export_elements(export_dir)
+        files = "\n".join(f"📄 {os.path.basename(p)}" for p in paths)
         QMessageBox.information(
             self, "Exportar",
-            f"Archivos guardados en:\n{export_dir}\n\n"
-            f"📄 {py_path.split(chr(92))[-1]}\n"
-            f"📄 {txt_path.split(chr(92))[-1]}"
+            f"Archivos guardados en:\n{export_dir}\n\n{files}"
         )
 
     def import_action(self):
         """
-        Importa un layout previo desde un archivo generado (.py).
+        Importa un layout previo desde un archivo generado (.py) sin ejecutarlo.
         """
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Importar Layout (.py)", "", "Python Files (*.py)"
@@ -291,35 +296,69 @@ class ToolsPanel(QFrame):
         if not file_path:
             return
 
-        try:
-            spec = importlib.util.spec_from_file_location("imported_layout", file_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+        from core.layout_loader import load_layout_file
 
-            if not hasattr(module, "LAYOUT_CONFIG"):
-                raise Exception("El archivo no contiene LAYOUT_CONFIG")
+        try:
+            layout = load_layout_file(file_path)
+            boxes = [
+                {"name": name, "x": c["x1"], "y": c["y1"], "w": c["x2"] - c["x1"], "h": c["y2"] - c["y1"],
+                 "font_name": c["font_name"], "font_size": c["font_size"]}
+                for name, c in layout["boxes"].items()
+            ]
+            labels = [
+                {"name": name, "x": c["x"], "y": c["y"],
+                 "font_name": c["font_name"], "font_size": c["font_size"]}
+                for name, c in layout["labels"].items()
+            ]
+            self.main_window.populate_elements(boxes, labels)
+            QMessageBox.information(self, "Éxito", "Layout cargado correctamente.")
 
-            config = module.LAYOUT_CONFIG
-            boxes_data = config.get('boxes', {})
-            labels_data = config.get('labels', {})
+        except Exception as e:
+            QMessageBox.critical(self, "Error de Importación", f"No se pudo cargar el archivo:\n{str(e)}")
 
-            for item in list(self.main_window.view.scene().items()):
-                if not isinstance(item, QGraphicsPixmapItem):
-                    self.main_window.view.scene().removeItem(item)
+    def save_project_action(self):
+        """
+        Guarda el diseño completo (texto, fuentes, tamaños y plantilla) en un archivo de proyecto.
+        """
+        from core.project import PROJECT_EXTENSION
 
-            self.main_window.box_manager.clear()
-            self.main_window.label_manager.clear()
+        default_name = ""
+        if self.main_window.background_path:
+            default_name = os.path.splitext(self.main_window.background_path)[0] + PROJECT_EXTENSION
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Guardar Proyecto", default_name, f"Proyecto Layout Builder (*{PROJECT_EXTENSION})"
+        )
+        if not file_path:
+            return
+        if not file_path.endswith(PROJECT_EXTENSION):
+            file_path += PROJECT_EXTENSION
 
-            for name, c in boxes_data.items():
-                box = self.main_window.create_box(c['x1'], c['y1'], c['x2']-c['x1'], c['y2']-c['y1'], name)
-                self.main_window.box_manager.add_box(box, name)
+        try:
+            self.main_window.save_project(file_path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error al Guardar", f"No se pudo guardar el proyecto:\n{str(e)}")
 
-            for name, c in labels_data.items():
-                label = self.main_window.create_label(c['x'], c['y'], name)
-                self.main_window.label_manager.add_label(label, name)
+    def open_project_action(self):
+        """
+        Abre un archivo de proyecto y recrea el diseño tal como se guardó.
+        """
+        from core.project import PROJECT_EXTENSION
 
-            self.main_window.elements_panel.update_list()
-            QMessageBox.information(self, "Éxito", "Layout cargado correctamente.")
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Abrir Proyecto", "", f"Proyecto Layout Builder (*{PROJECT_EXTENSION})"
+        )
+        if not file_path:
+            return
 
+        try:
+            project = self.main_window.open_project(file_path)
         except Exception as e:
-            QMessageBox.critical(self, "Error de Importación", f"No se pudo cargar el archivo:\n{str(e)}")
+            QMessageBox.critical(self, "Error al Abrir", f"No se pudo abrir el proyecto:\n{str(e)}")
+            return
+
+        template = project["template"]
+        if template and not os.path.exists(template):
+            QMessageBox.warning(
+                self, "Plantilla no encontrada",
+                f"No se encontró la plantilla del proyecto:\n{template}\n\nCarga la plantilla manualmente."
+            )
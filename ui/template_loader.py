@@ -0,0 +1,94 @@
+"""
+ui/template_loader.py
+
+Carga de plantillas de fondo en un hilo de trabajo.
+
+La decodificación (Pillow, ver core.image_loader) y la generación de la
+pirámide de teselas (core.tile_pyramid) se hacen fuera del hilo de la
+interfaz. El hilo publica primero una vista previa reducida y después el
+resultado a resolución completa, y puede cancelarse entre etapas.
+"""
+
+from PyQt6.QtCore import QThread, pyqtSignal
+from core.image_loader import image_size, draft_preview, make_preview, open_image, to_qimage
+from core.tile_pyramid import TILED_MIN_PIXELS, TilePyramid, build_pyramid
+
+
+class _Cancelled(Exception):
+    """Se lanza dentro del hilo cuando se ha pedido la cancelación."""
+
+
+class TemplateLoader(QThread):
+    """
+    Hilo que decodifica una plantilla.
+
+    Señales:
+        preview_ready(QImage, ancho, alto): Vista previa reducida y tamaño real de la plantilla.
+        progress(hechas, total): Avance de la generación de teselas.
+        loaded(QImage | TilePyramid): Plantilla completa; una pirámide si es muy grande.
+        failed(str): Mensaje de error.
+        cancelled(): La carga se canceló antes de terminar.
+
+    Las imágenes se emiten como `object` para que llegue el mismo QImage creado
+    por `to_qimage`, que mantiene vivo el búfer de Pillow.
+    """
+
+    preview_ready = pyqtSignal(object, int, int)
+    progress = pyqtSignal(int, int)
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, path, parent=None):
+        """
+        Args:
+            path (str): Ruta de la plantilla.
+            parent (QObject, optional): Objeto padre.
+        """
+        super().__init__(parent)
+        self.path = path
+
+    def _check_cancelled(self):
+        if self.isInterruptionRequested():
+            raise _Cancelled()
+
+    def _on_tile(self, done, total):
+        self.progress.emit(done, total)
+        self._check_cancelled()
+
+    def run(self):
+        try:
+            width, height = image_size(self.path)
+            has_preview = False
+
+            preview = draft_preview(self.path)
+            if preview is not None:
+                self._check_cancelled()
+                self.preview_ready.emit(to_qimage(preview), width, height)
+                has_preview = True
+
+            if width * height >= TILED_MIN_PIXELS:
+                pyramid = TilePyramid.open(self.path)
+                if pyramid is None:
+                    pyramid = build_pyramid(self.path, on_progress=self._on_tile)
+                if not has_preview:
+                    # El nivel más reducido de la pirámide es una sola tesela
+                    top = len(pyramid.levels) - 1
+                    preview = open_image(pyramid.tile_path(top, 0, 0))
+                    self.preview_ready.emit(to_qimage(preview), width, height)
+                self._check_cancelled()
+                self.loaded.emit(pyramid)
+                return
+
+            image = open_image(self.path)
+            self._check_cancelled()
+            if not has_preview:
+                self.preview_ready.emit(to_qimage(make_preview(image)), width, height)
+            qimage = to_qimage(image)
+            self._check_cancelled()
+            self.loaded.emit(qimage)
+        except _Cancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            # Cualquier error de decodificación se notifica a la interfaz en lugar de perderse en el hilo
+            self.failed.emit(str(e) or type(e).__name__)